@@ -1,5 +1,6 @@
 """Shared inference model for Hansa Teutonica."""
 
+import copy
 from pathlib import Path
 import tempfile
 
@@ -16,6 +17,7 @@ from game.action_schema import (
     action_schema_metadata,
     validate_action_schema_metadata,
 )
+from game.game_config import AI_INFERENCE_PRECISIONS
 
 
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
@@ -36,6 +38,8 @@ class HansaNN(nn.Module):
             self.layer3 = nn.Linear(1024, ACTION_SPACE_SIZE).to(device)
         self.relu = nn.ReLU()
         self.migrated_observation_schema = False
+        self.precision = "float32"
+        self.input_dtype = torch.float32
 
         if model_file and Path(model_file).is_file():
             self.load_model(model_file)
@@ -47,10 +51,10 @@ class HansaNN(nn.Module):
                 f"HansaNN expected {OBSERVATION_SIZE} observation values, "
                 f"received {observation.shape[-1]}"
             )
-        observation = observation.to(device)
+        observation = observation.to(device=device, dtype=self.input_dtype)
         observation = self.relu(self.layer1(observation))
         observation = self.relu(self.layer2(observation))
-        return self.layer3(observation)
+        return self.layer3(observation).float()
 
     def load_model(self, model_file) -> None:
         checkpoint = torch.load(model_file, map_location=device)
@@ -63,6 +67,8 @@ class HansaNN(nn.Module):
         self.load_state_dict(checkpoint["state_dict"])
 
     def save_model(self, model_file=SHARED_MODEL_FILE) -> Path:
+        if self.precision != "float32":
+            raise ValueError(f"Only float32 models can be saved, not a {self.precision} copy")
         model_path = Path(model_file)
         model_path.parent.mkdir(parents=True, exist_ok=True)
         temporary = None
@@ -82,3 +88,31 @@ class HansaNN(nn.Module):
             if temporary is not None and temporary.exists():
                 temporary.unlink()
         return model_path
+
+
+def inference_model(model, precision="float32"):
+    """Return ``model`` prepared for CPU inference at ``precision``.
+
+    ``int8`` dynamically quantizes the linear layers and ``bfloat16`` halves
+    their storage; both are new evaluation-only copies that score observations
+    with the same interface and return float32 scores. ``float32`` returns
+    ``model`` itself.
+    """
+    if precision not in AI_INFERENCE_PRECISIONS:
+        raise ValueError(f"Unknown inference precision: {precision}")
+    if precision == "float32":
+        return model
+    if device.type != "cpu":
+        raise ValueError(f"{precision} inference is only available on CPU")
+    if precision == "int8":
+        converted = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+    else:
+        converted = copy.deepcopy(model).to(torch.bfloat16)
+        converted.input_dtype = torch.bfloat16
+    converted.precision = precision
+    return converted.eval()
+
+
+def load_inference_model(model_file=SHARED_MODEL_FILE, precision="float32"):
+    """Load a saved model, checking its schemas, for inference at ``precision``."""
+    return inference_model(HansaNN(model_file=model_file), precision)
@@ -0,0 +1,274 @@
+"""Local inference service that scores observations from many games in batches.
+
+Every process that plays games would otherwise load its own ``HansaNN`` and run
+one forward pass per decision. ``InferenceServer`` loads the model once in a
+separate process and listens on a local socket (a named pipe on Windows).
+Game workers connect with ``InferenceClient``, which is called like the model
+itself. The server collects observation rows until ``max_batch_size`` rows are
+waiting or the oldest has waited ``max_latency`` seconds, scores them in one
+forward pass and replies to each client with its own rows.
+
+The server checks the model file every ``reload_interval`` seconds and swaps
+in the new weights when the file has been replaced, so a learner saving the
+playable model updates every connected game. A file that fails to load keeps
+the previous weights in service.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from multiprocessing.connection import Client, Listener, wait
+import os
+from pathlib import Path
+import queue
+import struct
+import threading
+from time import monotonic
+
+import numpy as np
+import torch
+
+from ai.ai_model import SHARED_MODEL_FILE, load_inference_model
+from ai.observation_schema import OBSERVATION_SIZE
+from game.action_schema import ACTION_SPACE_SIZE
+
+
+# Replies carry the model version that scored them and the rows in that batch.
+_REPLY_HEADER = struct.Struct("<II")
+_ROW_DTYPE = np.dtype("<f4")
+_STOP = b""
+
+
+class InferenceServerError(RuntimeError):
+    """Raised when the inference server cannot start or answer a request."""
+
+
+def _model_signature(model_file):
+    try:
+        status = os.stat(model_file)
+    except OSError:
+        return None
+    return status.st_ino, status.st_mtime_ns, status.st_size
+
+
+def _accept(listener, accepted, wake):
+    while True:
+        try:
+            connection = listener.accept()
+        except OSError:
+            return
+        accepted.put(connection)
+        wake.send_bytes(b"\0")
+
+
+def _score(model, rows):
+    with torch.inference_mode():
+        return model(torch.from_numpy(rows)).cpu().numpy().astype(_ROW_DTYPE, copy=False)
+
+
+def _serve(model_file, precision, max_batch_size, max_latency, reload_interval, authkey, ready):
+    try:
+        model = load_inference_model(model_file, precision)
+        listener = Listener(authkey=authkey)
+    except Exception as error:
+        ready.send(("error", f"{type(error).__name__}: {error}"))
+        return
+    version = 1
+    signature = _model_signature(model_file)
+    accepted = queue.SimpleQueue()
+    wake_reader, wake_writer = multiprocessing.Pipe(duplex=False)
+    threading.Thread(target=_accept, args=(listener, accepted, wake_writer), daemon=True).start()
+    ready.send(("ready", listener.address))
+
+    connections = []
+    pending = []
+    pending_rows = 0
+    deadline = None
+    next_reload = monotonic() + reload_interval
+    running = True
+    while running:
+        now = monotonic()
+        wake_at = next_reload if deadline is None else min(deadline, next_reload)
+        for connection in wait([wake_reader, *connections], max(0.0, wake_at - now)):
+            if connection is wake_reader:
+                wake_reader.recv_bytes()
+                connections.append(accepted.get())
+                continue
+            try:
+                payload = connection.recv_bytes()
+            except (EOFError, OSError):
+                connections.remove(connection)
+                connection.close()
+                continue
+            if payload == _STOP:
+                running = False
+                break
+            rows = np.frombuffer(payload, dtype=_ROW_DTYPE).reshape(-1, OBSERVATION_SIZE)
+            if not pending:
+                deadline = monotonic() + max_latency
+            pending.append((connection, rows))
+            pending_rows += len(rows)
+
+        now = monotonic()
+        if pending and (not running or pending_rows >= max_batch_size or now >= deadline):
+            scores = _score(model, np.concatenate([rows for _connection, rows in pending]))
+            header = _REPLY_HEADER.pack(version, pending_rows)
+            start = 0
+            for connection, rows in pending:
+                try:
+                    connection.send_bytes(header + scores[start : start + len(rows)].tobytes())
+                except OSError:
+                    pass
+                start += len(rows)
+            pending, pending_rows, deadline = [], 0, None
+        if now >= next_reload:
+            next_reload = now + reload_interval
+            current = _model_signature(model_file)
+            if current != signature:
+                signature = current
+                try:
+                    model = load_inference_model(model_file, precision)
+                except Exception:
+                    continue
+                version += 1
+
+    listener.close()
+    for connection in connections:
+        connection.close()
+
+
+class InferenceClient:
+    """Score observations through an ``InferenceServer``; called like ``HansaNN``.
+
+    The connection opens on first use, so a client can be handed to worker
+    processes. Use one client per thread.
+    """
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self.model_version = None
+        self.batch_rows = None
+        self._connection = None
+
+    def __getstate__(self):
+        return {"address": self.address, "authkey": self.authkey}
+
+    def __setstate__(self, state):
+        self.__init__(state["address"], state["authkey"])
+
+    def __call__(self, observation):
+        if observation.shape[-1] != OBSERVATION_SIZE:
+            raise ValueError(
+                f"HansaNN expected {OBSERVATION_SIZE} observation values, "
+                f"received {observation.shape[-1]}"
+            )
+        rows = observation.detach().to("cpu", torch.float32).reshape(-1, OBSERVATION_SIZE)
+        if self._connection is None:
+            self._connection = Client(self.address, authkey=self.authkey)
+        try:
+            self._connection.send_bytes(rows.numpy().astype(_ROW_DTYPE, copy=False).tobytes())
+            reply = self._connection.recv_bytes()
+        except (EOFError, OSError) as error:
+            self.close()
+            raise InferenceServerError(f"Inference server stopped answering: {error}") from error
+        self.model_version, self.batch_rows = _REPLY_HEADER.unpack_from(reply)
+        scores = np.frombuffer(reply, dtype=_ROW_DTYPE, offset=_REPLY_HEADER.size)
+        return torch.from_numpy(scores.copy()).reshape(*observation.shape[:-1], ACTION_SPACE_SIZE)
+
+    def eval(self):
+        return self
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class InferenceServer:
+    """Run the shared model in a separate process for every connected game."""
+
+    def __init__(
+        self,
+        model_file=SHARED_MODEL_FILE,
+        *,
+        precision="float32",
+        max_batch_size=64,
+        max_latency=0.002,
+        reload_interval=1.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("maximum batch size must be positive")
+        if max_latency < 0:
+            raise ValueError("maximum latency cannot be negative")
+        if reload_interval <= 0:
+            raise ValueError("reload interval must be positive")
+        self.model_file = Path(model_file)
+        self.precision = precision
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.reload_interval = reload_interval
+        self.address = None
+        self._authkey = os.urandom(16)
+        self._process = None
+        self._control = None
+
+    def start(self):
+        context = multiprocessing.get_context("spawn")
+        ready_reader, ready_writer = context.Pipe(duplex=False)
+        self._process = context.Process(
+            target=_serve,
+            args=(
+                str(self.model_file),
+                self.precision,
+                self.max_batch_size,
+                self.max_latency,
+                self.reload_interval,
+                self._authkey,
+                ready_writer,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+        ready_writer.close()
+        try:
+            status, detail = ready_reader.recv()
+        except EOFError:
+            self._process.join()
+            status, detail = "error", f"exit code {self._process.exitcode}"
+        if status != "ready":
+            self._process.join()
+            self._process = None
+            raise InferenceServerError(f"Inference server failed to start: {detail}")
+        self.address = detail
+        self._control = Client(self.address, authkey=self._authkey)
+        return self
+
+    def client(self):
+        """Return a new client connected to this server."""
+        if self.address is None:
+            raise InferenceServerError("Inference server has not been started")
+        return InferenceClient(self.address, self._authkey)
+
+    def close(self, timeout=5.0):
+        if self._process is None:
+            return
+        if self._control is not None:
+            try:
+                self._control.send_bytes(_STOP)
+            except OSError:
+                pass
+            self._control.close()
+            self._control = None
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_exc_info):
+        self.close()
+        return False
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from weakref import WeakKeyDictionary
+from operator import attrgetter
+from weakref import WeakKeyDictionary, ref
 
 import torch
 
@@ -25,6 +26,9 @@ from map_data.constants import (
     WHITE,
 )
 
+_OFFICE_STATE = attrgetter("controller", "owner_piece_shape")
+_POST_STATE = attrgetter("owner", "owner_piece_shape")
+
 
 @dataclass(frozen=True)
 class AIObservation:
@@ -135,9 +139,13 @@ class ObservationEncoder:
         self.all_game_state_size = self.FEATURE_SIZE
         self._structural_templates = WeakKeyDictionary()
 
-    def build(self, game) -> AIObservation:
+    def build(self, game, buffer: ObservationBuffer | None = None) -> AIObservation:
+        """Encode one decision; ``buffer`` reuses its preallocated feature row."""
         observer_index = self._observer_index(game)
-        features = self.get_game_state(game, observer_index=observer_index)
+        if buffer is None:
+            features = self.get_game_state(game, observer_index=observer_index)
+        else:
+            features = buffer.encode(game, observer_index=observer_index)
         mask = torch.tensor(game.ai_action_mask(), dtype=torch.uint8)
         return AIObservation(features, mask, observer_index)
 
@@ -255,58 +263,64 @@ class ObservationEncoder:
 
     def _write_dynamic_city_features(self, features, start, game, owner_ids):
         for city_index, city in enumerate(game.selected_map.cities):
-            if len(city.offices) > self.MAX_OFFICES:
-                raise ValueError(
-                    f"City {city.name} has {len(city.offices)} offices; "
-                    f"capacity is {self.MAX_OFFICES}"
-                )
             base = start + city_index * self.CITY_SIZE
-            tributes = self._pad(
-                (owner_ids.get(player, 0) for player in city.tributed_players),
-                4,
-                f"{city.name} tribute owners",
+            self._write_city_features(features, base, city, owner_ids)
+
+    def _write_city_features(self, features, base, city, owner_ids):
+        if len(city.offices) > self.MAX_OFFICES:
+            raise ValueError(
+                f"City {city.name} has {len(city.offices)} offices; capacity is {self.MAX_OFFICES}"
+            )
+        tributes = self._pad(
+            (owner_ids.get(player, 0) for player in city.tributed_players),
+            4,
+            f"{city.name} tribute owners",
+        )
+        features[base + 4 : base + 8] = tributes
+        for office_index, office in enumerate(city.offices):
+            office_base = base + 8 + office_index * 7
+            features[office_base : office_base + 7] = (
+                1,
+                int(office.place_adjacent_office),
+                self.PIECE_TYPE_TO_ID[office.shape],
+                self.PRIVILEGE_TO_ID.get(
+                    getattr(office, "printed_privilege", self._color_name(office.color)),
+                    0,
+                ),
+                office.awards_points,
+                owner_ids.get(office.controller, 0),
+                self.PIECE_TYPE_TO_ID[office.owner_piece_shape],
             )
-            features[base + 4 : base + 8] = tributes
-            for office_index, office in enumerate(city.offices):
-                office_base = base + 8 + office_index * 7
-                features[office_base : office_base + 7] = (
-                    1,
-                    int(office.place_adjacent_office),
-                    self.PIECE_TYPE_TO_ID[office.shape],
-                    self.PRIVILEGE_TO_ID.get(
-                        getattr(office, "printed_privilege", self._color_name(office.color)),
-                        0,
-                    ),
-                    office.awards_points,
-                    owner_ids.get(office.controller, 0),
-                    self.PIECE_TYPE_TO_ID[office.owner_piece_shape],
-                )
 
     def _write_dynamic_route_features(self, features, start, game, owner_ids):
         for route_index, route in enumerate(game.selected_map.routes):
-            if len(route.posts) > self.MAX_POSTS_PER_ROUTE:
-                raise ValueError(
-                    f"Route {route_index} has {len(route.posts)} posts; "
-                    f"capacity is {self.MAX_POSTS_PER_ROUTE}"
-                )
-            base = start + route_index * self.ROUTE_SIZE
-            features[base + 6] = self.BONUS_MARKER_TYPE_TO_ID.get(
-                route.bonus_marker.type if route.bonus_marker else None, 0
+            self._write_route_features(
+                features, start + route_index * self.ROUTE_SIZE, route_index, route, owner_ids
             )
-            features[base + 8 : base + 13] = self._pad(
-                (owner_ids.get(owner, 0) for owner in route.tribute_owners),
-                5,
-                f"route {route_index} tribute owners",
-            )
-            features[base + 13 : base + 18] = self._pad(
-                (owner_ids.get(owner, 0) for owner in route.block_marker_owners),
-                5,
-                f"route {route_index} block owners",
+
+    def _write_route_features(self, features, base, route_index, route, owner_ids):
+        if len(route.posts) > self.MAX_POSTS_PER_ROUTE:
+            raise ValueError(
+                f"Route {route_index} has {len(route.posts)} posts; "
+                f"capacity is {self.MAX_POSTS_PER_ROUTE}"
             )
-            for post_index, post in enumerate(route.posts):
-                post_base = base + 18 + post_index * 4
-                features[post_base + 2] = owner_ids.get(post.owner, 0)
-                features[post_base + 3] = self.PIECE_TYPE_TO_ID[post.owner_piece_shape]
+        features[base + 6] = self.BONUS_MARKER_TYPE_TO_ID.get(
+            route.bonus_marker.type if route.bonus_marker else None, 0
+        )
+        features[base + 8 : base + 13] = self._pad(
+            (owner_ids.get(owner, 0) for owner in route.tribute_owners),
+            5,
+            f"route {route_index} tribute owners",
+        )
+        features[base + 13 : base + 18] = self._pad(
+            (owner_ids.get(owner, 0) for owner in route.block_marker_owners),
+            5,
+            f"route {route_index} block owners",
+        )
+        for post_index, post in enumerate(route.posts):
+            post_base = base + 18 + post_index * 4
+            features[post_base + 2] = owner_ids.get(post.owner, 0)
+            features[post_base + 3] = self.PIECE_TYPE_TO_ID[post.owner_piece_shape]
 
     def _write_dynamic_optional_features(self, features, start, game, owner_ids):
         features[start : start + 6] = [int(tile in game.tile_pool) for tile in self.TILE_TYPE_TO_ID]
@@ -533,3 +547,117 @@ class ObservationEncoder:
             tuple(BLACK): "BLACK",
         }
         return mapping.get(tuple(color))
+
+
+class ObservationBuffer:
+    """Reusable feature row that ``ObservationEncoder`` refreshes in place.
+
+    Pass ``out`` to write into a row of a caller-owned batch tensor; otherwise
+    the buffer allocates its own. City and route blocks are rewritten only when
+    the pieces, markers and owners they encode changed since the previous
+    encode, so the row must not be modified by anyone else between calls. The
+    returned tensor is the buffer itself; clone it before keeping it.
+    """
+
+    def __init__(self, encoder: ObservationEncoder | None = None, out: torch.Tensor | None = None):
+        self.encoder = encoder if encoder is not None else ObservationEncoder()
+        size = self.encoder.FEATURE_SIZE
+        if out is None:
+            out = torch.zeros(size, dtype=torch.int16)
+        if out.shape != (size,) or out.dtype != torch.int16 or out.device.type != "cpu":
+            raise ValueError(f"Observation buffer must be a CPU int16 tensor of shape ({size},)")
+        if not out.is_contiguous():
+            raise ValueError("Observation buffer must be contiguous")
+        self.features = out
+        self._values = out.numpy()
+        self.player_start = self.encoder.GAME_SIZE
+        self.city_start = self.player_start + self.encoder.MAX_PLAYERS * self.encoder.PLAYER_SIZE
+        self.route_start = self.city_start + self.encoder.MAX_CITIES * self.encoder.CITY_SIZE
+        self.optional_start = self.route_start + self.encoder.MAX_ROUTES * self.encoder.ROUTE_SIZE
+        self.workflow_start = self.optional_start + self.encoder.OPTIONAL_COMPONENTS_SIZE
+        self.segments_written = 0
+        self.segments_skipped = 0
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget what the row holds so the next encode rewrites every block."""
+        self._game = None
+        self._template = None
+        self._city_states = []
+        self._route_states = []
+
+    def encode(self, game, observer_index=None) -> torch.Tensor:
+        """Write the observation for ``game`` into the buffer and return it."""
+        encoder = self.encoder
+        if observer_index is None:
+            observer_index = encoder._observer_index(game)
+        encoder._validate_observer(game, observer_index)
+
+        template = encoder._structural_template(game)
+        if self._game is None or self._game() is not game or self._template is not template:
+            self.invalidate()
+            self._values[:] = template
+            self._game = ref(game)
+            self._template = template
+            self._city_states = [None] * len(game.selected_map.cities)
+            self._route_states = [None] * len(game.selected_map.routes)
+        relative_players = tuple(encoder._relative_players(game, observer_index))
+        owner_ids = {player: index + 1 for index, player in enumerate(relative_players)}
+
+        values = self._values
+        values[: self.player_start] = encoder._game_features(game, owner_ids)
+        values[self.player_start : self.city_start] = encoder._player_features(
+            game, list(relative_players)
+        )
+        self._write_cities(game, template, relative_players, owner_ids)
+        self._write_routes(game, template, relative_players, owner_ids)
+        optional = list(template[self.optional_start : self.workflow_start])
+        encoder._write_dynamic_optional_features(optional, 0, game, owner_ids)
+        values[self.optional_start : self.workflow_start] = optional
+        values[self.workflow_start :] = encoder._workflow_features(
+            game, relative_players[0], owner_ids
+        )
+        return self.features
+
+    def _write_cities(self, game, template, relative_players, owner_ids):
+        size = self.encoder.CITY_SIZE
+        states = self._city_states
+        for city_index, city in enumerate(game.selected_map.cities):
+            tributes = tuple(city.tributed_players)
+            offices = tuple(map(_OFFICE_STATE, city.offices))
+            owned = tributes or any(controller is not None for controller, _ in offices)
+            state = (tributes, offices, relative_players if owned else None)
+            if state == states[city_index]:
+                self.segments_skipped += 1
+                continue
+            base = self.city_start + city_index * size
+            block = list(template[base : base + size])
+            self.encoder._write_city_features(block, 0, city, owner_ids)
+            self._values[base : base + size] = block
+            states[city_index] = state
+            self.segments_written += 1
+
+    def _write_routes(self, game, template, relative_players, owner_ids):
+        size = self.encoder.ROUTE_SIZE
+        states = self._route_states
+        for route_index, route in enumerate(game.selected_map.routes):
+            tributes = tuple(route.tribute_owners)
+            blocks = tuple(route.block_marker_owners)
+            posts = tuple(map(_POST_STATE, route.posts))
+            owned = tributes or blocks or any(owner is not None for owner, _ in posts)
+            state = (
+                route.bonus_marker.type if route.bonus_marker else None,
+                tributes,
+                blocks,
+                posts,
+                relative_players if owned else None,
+            )
+            if state == states[route_index]:
+                self.segments_skipped += 1
+                continue
+            base = self.route_start + route_index * size
+            block = list(template[base : base + size])
+            self.encoder._write_route_features(block, 0, route_index, route, owner_ids)
+            self._values[base : base + size] = block
+            states[route_index] = state
+            self.segments_written += 1
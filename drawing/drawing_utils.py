@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+import weakref
 
 import pygame
 
@@ -193,30 +194,19 @@ def draw_bonus_markers(win, selected_map):
 
     for route in routes:
         draw_line(win, route.color, route.cities[0].midpoint, route.cities[1].midpoint, 10, 2)
-        # Check if the route has a bonus marker and call its draw method
-        if route.bonus_marker:
-            # Construct the key for the dictionary
-            city_pair = tuple(sorted([route.cities[0].name, route.cities[1].name]))
-            # Fetch the bonus marker position from the dictionary
-            bonus_marker_pos = selected_map.bonus_marker_positions.get(city_pair)
-
-            # If the position exists, call the draw method on the bonus marker
-            if bonus_marker_pos:
-                draw_board_bonus_markers(win, route.bonus_marker, bonus_marker_pos)
-                # print(f"Drew bonus marker between {city_pair[0]} and {city_pair[1]} at position {bonus_marker_pos}")
-            # else:
-            # print(f"No bonus marker position found for route between {city_pair[0]} and {city_pair[1]}")
-        if route.permanent_bonus_marker:
-            # Construct the key for the dictionary
-            city_pair = tuple(sorted([route.cities[0].name, route.cities[1].name]))
-            # Fetch the bonus marker position from the dictionary
-            bonus_marker_pos = selected_map.bonus_marker_positions.get(city_pair)
-
-            # If the position exists, call the draw method on the bonus marker
-            if bonus_marker_pos:
-                draw_board_bonus_markers(
-                    win, route.permanent_bonus_marker, bonus_marker_pos, color=BLUE
-                )
+        draw_route_bonus_markers(win, selected_map, route)
+
+
+def draw_route_bonus_markers(win, selected_map, route):
+    # Markers sit at the position the map assigns to the route's city pair.
+    city_pair = tuple(sorted([route.cities[0].name, route.cities[1].name]))
+    bonus_marker_pos = selected_map.bonus_marker_positions.get(city_pair)
+    if not bonus_marker_pos:
+        return
+    if route.bonus_marker:
+        draw_board_bonus_markers(win, route.bonus_marker, bonus_marker_pos)
+    if route.permanent_bonus_marker:
+        draw_board_bonus_markers(win, route.permanent_bonus_marker, bonus_marker_pos, color=BLUE)
 
 
 def draw_board_bonus_markers(screen, bonus_marker, position, color=BLACK):
@@ -242,7 +232,11 @@ def draw_city_rectangle(win, city):
     rect_x, rect_y = city.x_pos, city.y_pos
     draw_shape(win, "rectangle", city.color, rect_x, rect_y, city.width, city.height)
     draw_text_below_rectangle(win, city.name, rect_x, rect_y, city.width, city.height)
+    draw_city_tributes(win, city)
+
 
+def draw_city_tributes(win, city):
+    rect_x, rect_y = city.x_pos, city.y_pos
     if any(player is not None for player in city.tributed_players):
         square_size = 15
         square_padding = 3
@@ -507,15 +501,69 @@ def draw_bonus_marker_pool(win, game):
     )
 
 
+# Board art per map, rebuilt only when the canvas size, a city's footprint (a
+# PlaceAdjacent office widens the city and moves its routes) or the bonus
+# markers lying on the routes change.
+_BOARD_LAYERS = weakref.WeakKeyDictionary()
+
+
+def _board_layer_key(selected_map, size):
+    return (
+        tuple(size),
+        tuple((city.width, city.height) for city in selected_map.cities),
+        tuple(
+            (
+                getattr(route.bonus_marker, "type", None),
+                getattr(route.permanent_bonus_marker, "type", None),
+            )
+            for route in selected_map.routes
+        ),
+    )
+
+
+def board_layer(selected_map, size):
+    """Return a cached surface with the board art that rarely changes.
+
+    The layer holds the background, route lines with their bonus markers,
+    upgrade boxes and city rectangles with their names. Tributes, offices,
+    posts and the special prestige track are drawn over it every frame.
+    """
+    key = _board_layer_key(selected_map, size)
+    cached = _BOARD_LAYERS.get(selected_map)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    layer = pygame.Surface(size)
+    draw_bonus_markers(layer, selected_map)
+    for upgrade in selected_map.upgrade_cities:
+        if upgrade.upgrade_type != "SpecialPrestigePoints":
+            draw_upgrade_on_map(layer, upgrade)
+    for city in selected_map.cities:
+        draw_shape(layer, "rectangle", city.color, city.x_pos, city.y_pos, city.width, city.height)
+        draw_text_below_rectangle(layer, city.name, city.x_pos, city.y_pos, city.width, city.height)
+    _BOARD_LAYERS[selected_map] = (key, layer)
+    return layer
+
+
+def draw_board_state(win, selected_map):
+    """Blit the cached board layer and draw the pieces that move every turn."""
+    win.blit(board_layer(selected_map, win.get_size()), (0, 0))
+    for upgrade in selected_map.upgrade_cities:
+        if upgrade.upgrade_type == "SpecialPrestigePoints":
+            draw_special_prestige_points(win, upgrade)
+    draw_special_prestige_points(win, selected_map.specialprestigepoints)
+    for city in selected_map.cities:
+        draw_city_tributes(win, city)
+        draw_city_offices(win, city)
+    draw_routes(win, selected_map.routes)
+
+
 def redraw_window(win, game, legal_actions=()):
     selected_map = game.selected_map
     layout = DrawLayout()
     acting_player = game.players[game.active_player]
 
-    draw_bonus_markers(win, selected_map)
-    draw_upgrades(win, selected_map)
-    draw_cities_and_offices(win, selected_map.cities)
-    draw_routes(win, selected_map.routes)
+    draw_board_state(win, selected_map)
     draw_actions_remaining(win, game)
     layout.tile_rects = draw_tiles(
         win,
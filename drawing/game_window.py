@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 import random
+from time import perf_counter
 
 import pygame
 import torch
@@ -28,7 +31,39 @@ from game.structured_actions import (
     RouteInteraction,
     TileInteraction,
 )
-from map_data.constants import TAN
+
+
+@dataclass
+class LegalActionView:
+    """Legal indices and their browser labels for one game state version."""
+
+    state_version: int
+    indices: list[int]
+    index_set: frozenset[int]
+    labels: dict[int, str] = field(default_factory=dict)
+    rendered: dict[tuple[int, tuple[int, int, int]], pygame.Surface] = field(default_factory=dict)
+
+
+@dataclass
+class PendingAIMove:
+    """An AI decision being computed off the frame loop for one state version.
+
+    The worker draws from ``rng``, a copy of the window's controller RNG, so a
+    cancelled or stale move leaves the window's RNG untouched.
+    """
+
+    state_version: int
+    future: Future
+    rng: random.Random
+    started: float
+
+
+def rank_ai_action(model, state, legal_actions, control, rng, thresholds):
+    """Score an observation snapshot and choose one of ``legal_actions``."""
+    with torch.no_grad():
+        scores = model(state.unsqueeze(0)).squeeze(0)
+    ranked = [(index, float(scores[index])) for index in legal_actions]
+    return choose_ranked_ai_action(ranked, control, rng, thresholds)
 
 
 class GameWindow:
@@ -53,9 +88,35 @@ class GameWindow:
         self.save_rect = pygame.Rect(0, 0, 0, 0)
         self.save_status = ""
         self.layout = None
+        self.legal_view = None
+        self.show_timings = False
+        self.timings = {"draw": 0.0, "legality": 0.0, "ai": 0.0}
+        self.pending_ai_move = None
+        self.ai_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hansa-ai")
+
+    def legal_action_view(self) -> LegalActionView:
+        """Return the legal actions of the current state, derived once per state version."""
+        version = getattr(self.game, "state_version", 0)
+        if self.legal_view is None or self.legal_view.state_version != version:
+            started = perf_counter()
+            indices = list(self.game.legal_action_indices())
+            self.legal_view = LegalActionView(version, indices, frozenset(indices))
+            self.timings["legality"] = perf_counter() - started
+        return self.legal_view
 
     def legal_actions(self) -> list[int]:
-        return [index for index, enabled in enumerate(self.game.ai_action_mask()) if enabled]
+        return self.legal_action_view().indices
+
+    def action_label_surface(self, action, color, max_width) -> pygame.Surface:
+        view = self.legal_action_view()
+        rendered = view.rendered.get((action, color))
+        if rendered is None:
+            text = view.labels.get(action)
+            if text is None:
+                text = fit_text(self.font, action_label(action, self.game), max_width)
+                view.labels[action] = text
+            rendered = view.rendered[(action, color)] = self.font.render(text, True, color)
+        return rendered
 
     def draw_action_browser(self, actions):
         self.action_rects.clear()
@@ -98,31 +159,78 @@ class GameWindow:
         for row, action in enumerate(actions[start : start + 15]):
             actual = start + row
             color = (70, 110, 75) if actual == self.selected else (30, 25, 20)
-            label_text = fit_text(
-                self.font,
-                action_label(action, self.game),
-                panel.width - 24,
-            )
-            label = self.font.render(label_text, True, color)
+            label = self.action_label_surface(action, color, panel.width - 24)
             position = (panel.x + 12, panel.y + 102 + row * 20)
             self.screen.blit(label, position)
             self.action_rects.append((pygame.Rect(position, (panel.width - 24, 21)), action))
 
-    def choose_ai_action(self, legal_actions):
+    def draw_timings(self):
+        panel = pygame.Rect(self.game.selected_map.map_width + 810, 456, 280, 28)
+        pygame.draw.rect(self.screen, (245, 238, 218), panel)
+        pygame.draw.rect(self.screen, (45, 38, 30), panel, 1)
+        text = " | ".join(
+            f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.timings.items()
+        )
+        self.screen.blit(
+            self.font.render(fit_text(self.font, text, panel.width - 16), True, (30, 25, 20)),
+            (panel.x + 8, panel.y + 6),
+        )
+
+    def _ai_move_arguments(self, legal_actions):
         player = self.acting_player
         state = public_game_state(self.observation_encoder, self.game, player).float()
         if self.game.ai_model is None:
             raise RuntimeError("The game has no shared AI model")
-        with torch.no_grad():
-            scores = self.game.ai_model(state.unsqueeze(0)).squeeze(0)
-        ranked = [(index, float(scores[index])) for index in legal_actions]
-        return choose_ranked_ai_action(
-            ranked,
+        return (
+            self.game.ai_model,
+            state,
+            tuple(legal_actions),
             player.control,
-            self.rng,
             dict(self.game.configuration.difficulty_top_k),
         )
 
+    def choose_ai_action(self, legal_actions):
+        model, state, legal_actions, control, thresholds = self._ai_move_arguments(legal_actions)
+        return rank_ai_action(model, state, legal_actions, control, self.rng, thresholds)
+
+    def start_ai_move(self, legal_actions):
+        """Compute the acting AI's move on the worker thread from a snapshot."""
+        model, state, legal_actions, control, thresholds = self._ai_move_arguments(legal_actions)
+        rng = random.Random()
+        rng.setstate(self.rng.getstate())
+        self.pending_ai_move = PendingAIMove(
+            getattr(self.game, "state_version", 0),
+            self.ai_executor.submit(
+                rank_ai_action, model, state, legal_actions, control, rng, thresholds
+            ),
+            rng,
+            perf_counter(),
+        )
+        return self.pending_ai_move
+
+    def finish_ai_move(self):
+        """Return the finished AI move, or ``None`` while it is pending or stale.
+
+        A move computed for an older state version is discarded. Worker
+        exceptions are raised here, as the synchronous path would raise them.
+        """
+        pending = self.pending_ai_move
+        if pending is None or not pending.future.done():
+            return None
+        self.pending_ai_move = None
+        if pending.state_version != getattr(self.game, "state_version", 0):
+            return None
+        action = pending.future.result()
+        self.rng.setstate(pending.rng.getstate())
+        self.timings["ai"] = perf_counter() - pending.started
+        return action
+
+    def cancel_ai_move(self):
+        """Drop any pending AI move; the next frame starts it again if still needed."""
+        if self.pending_ai_move is not None:
+            self.pending_ai_move.future.cancel()
+            self.pending_ai_move = None
+
     def save_current_game(self):
         try:
             filename = choose_save_file(self.game)
@@ -296,17 +404,38 @@ class GameWindow:
 
         return max(controlled_routes, key=alignment)
 
+    def frame_key(self):
+        """Return everything a frame depends on; an unchanged key needs no redraw."""
+        return (
+            getattr(self.game, "state_version", 0),
+            self.selected,
+            self.save_status,
+            self.game.game_end,
+            self.show_timings,
+        )
+
+    def draw_frame(self, actions):
+        self.layout = redraw_window(self.screen, self.game, actions)
+        self.draw_action_browser(actions)
+        if self.game.game_end:
+            draw_end_game(self.screen, self.game.end_the_game())
+        if self.show_timings:
+            self.draw_timings()
+
     def run(self):
         running = True
+        presented_key = None
         while running:
             actions = self.legal_actions()
             control = getattr(self.acting_player, "control", PlayerControl.HUMAN)
-            self.screen.fill(TAN)
-            self.layout = redraw_window(self.screen, self.game, actions)
-            self.draw_action_browser(actions)
-            if self.game.game_end:
-                draw_end_game(self.screen, self.game.end_the_game())
-            self.display.present()
+            # Idle frames leave the canvas and the window untouched; changed
+            # frames present only the screen areas that differ.
+            if self.frame_key() != presented_key:
+                started = perf_counter()
+                self.draw_frame(actions)
+                self.display.present_changes()
+                self.timings["draw"] = perf_counter() - started
+                presented_key = self.frame_key()
 
             action_applied = False
             for event in pygame.event.get():
@@ -314,12 +443,21 @@ class GameWindow:
                     running = False
                 elif event.type == pygame.VIDEORESIZE:
                     self.display.resize(event.size)
+                    presented_key = None
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.display.invalidate()
+                    presented_key = None
                 elif (
                     event.type == pygame.MOUSEBUTTONUP
                     and event.button == 1
                     and self.save_rect.collidepoint(self.display.to_logical(event.pos))
                 ):
+                    # Saving records the controller RNG before the pending
+                    # move consumes it, so the move restarts after the dialog.
+                    self.cancel_ai_move()
                     self.save_current_game()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.show_timings = not self.show_timings
                 elif (
                     control.is_human
                     and not action_applied
@@ -354,12 +492,19 @@ class GameWindow:
                     action = self.action_for_click(
                         self.display.to_logical(event.pos),
                         event.button,
-                        actions,
+                        self.legal_view.index_set,
                     )
                     if action is not None:
                         self.game.apply_action(action)
                         action_applied = True
 
             if running and not control.is_human and not self.game.game_end and actions:
-                self.game.apply_ai_action(self.choose_ai_action(actions))
+                if self.pending_ai_move is None:
+                    self.start_ai_move(actions)
+                action = self.finish_ai_move()
+                if action is not None:
+                    self.game.apply_ai_action(action)
             self.clock.tick(30)
+
+        self.cancel_ai_move()
+        self.ai_executor.shutdown(wait=False, cancel_futures=True)
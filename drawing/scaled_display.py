@@ -2,8 +2,51 @@
 
 from __future__ import annotations
 
+import math
+
+import numpy as np
 import pygame
 
+DIRTY_TILE_SIZE = 64
+
+
+def changed_regions(
+    previous: np.ndarray,
+    current: np.ndarray,
+    tile_size: int = DIRTY_TILE_SIZE,
+) -> list[pygame.Rect]:
+    """Return tile-aligned rectangles covering every pixel that differs.
+
+    Both arrays come from ``pygame.surfarray.array2d`` and are indexed
+    ``[x, y]``. Changed tiles in the same row are merged into one rectangle.
+    """
+    width, height = current.shape
+    columns = -(-width // tile_size)
+    rows = -(-height // tile_size)
+    changed = np.zeros((columns * tile_size, rows * tile_size), dtype=bool)
+    changed[:width, :height] = previous != current
+    tiles = changed.reshape(columns, tile_size, rows, tile_size).any(axis=(1, 3))
+    bounds = pygame.Rect(0, 0, width, height)
+    regions = []
+    for row in range(rows):
+        column = 0
+        while column < columns:
+            if not tiles[column, row]:
+                column += 1
+                continue
+            start = column
+            while column < columns and tiles[column, row]:
+                column += 1
+            regions.append(
+                pygame.Rect(
+                    start * tile_size,
+                    row * tile_size,
+                    (column - start) * tile_size,
+                    tile_size,
+                ).clip(bounds)
+            )
+    return regions
+
 
 class ScaledDisplay:
     """Keep drawing coordinates stable while fitting the whole UI on screen."""
@@ -33,6 +76,8 @@ class ScaledDisplay:
             self.fit_size(requested, available),
             pygame.RESIZABLE,
         )
+        self._presented_pixels = None
+        self._presented_rect = None
 
     @staticmethod
     def available_size(
@@ -94,3 +139,48 @@ class ScaledDisplay:
         self.window.fill((20, 20, 20))
         self.window.blit(frame, target)
         pygame.display.flip()
+
+    def invalidate(self) -> None:
+        """Make the next ``present_changes`` repaint the whole window."""
+        self._presented_pixels = None
+
+    def present_changes(self) -> list[pygame.Rect] | None:
+        """Show only the canvas areas that changed since the last call.
+
+        The first call, and any call after a resize or ``invalidate``,
+        presents the whole canvas and returns ``None``. Otherwise the changed
+        logical rectangles are returned; an empty list means nothing was shown.
+        """
+        pixels = pygame.surfarray.array2d(self.canvas)
+        previous, self._presented_pixels = self._presented_pixels, pixels
+        target = self.presentation_rect()
+        if previous is None or target != self._presented_rect:
+            self._presented_rect = target
+            self.present()
+            return None
+
+        regions = changed_regions(previous, pixels)
+        if not regions:
+            return regions
+        # Scaling the whole canvas keeps the smoothing identical to a full
+        # present; only the changed parts are copied to the window and flushed.
+        if target.size == self.logical_size:
+            frame = self.canvas
+        else:
+            frame = pygame.transform.smoothscale(self.canvas, target.size)
+        scale_x = target.width / self.logical_size[0]
+        scale_y = target.height / self.logical_size[1]
+        updates = []
+        for region in regions:
+            left = math.floor(region.x * scale_x)
+            top = math.floor(region.y * scale_y)
+            area = pygame.Rect(
+                left,
+                top,
+                math.ceil(region.right * scale_x) - left,
+                math.ceil(region.bottom * scale_y) - top,
+            ).clip(frame.get_rect())
+            self.window.blit(frame, area.move(target.topleft), area)
+            updates.append(area.move(target.topleft))
+        pygame.display.update(updates)
+        return regions
@@ -88,3 +88,4 @@ def execute_action(game, action):
         or game.waiting_for_place2_in_scotland_or_wales
     ):
         game.switch_player_if_needed()
+    game.mark_state_changed()
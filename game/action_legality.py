@@ -26,30 +26,44 @@ def _move_piece_fits(player, piece, post):
     )
 
 
-def _can_finish_move_after_placement(game, selected_post):
-    """Return whether every later held piece still has a distinct legal post."""
+def _move_completion_check(game):
+    """Return a predicate telling whether later held pieces still fit after a placement.
+
+    One assignment of the remaining held pieces is searched up front. A
+    placement on a post that assignment does not use cannot disturb it, so only
+    the few posts it does use need a fresh search without them.
+    """
     player = game.current_player
     remaining_pieces = player.holding_pieces[1:]
     if not remaining_pieces:
-        return True
-    available_posts = [
-        post
-        for route in game.selected_map.routes
-        for post in route.posts
-        if post is not selected_post and not post.is_owned()
+        return lambda selected_post: True
+    empty_posts = [
+        post for route in game.selected_map.routes for post in route.posts if not post.is_owned()
     ]
 
-    def can_assign(piece_index, posts):
+    def assign(piece_index, posts):
         if piece_index == len(remaining_pieces):
-            return True
+            return []
         piece = remaining_pieces[piece_index]
-        return any(
-            _move_piece_fits(player, piece, post)
-            and can_assign(piece_index + 1, posts[:index] + posts[index + 1 :])
-            for index, post in enumerate(posts)
-        )
+        for index, post in enumerate(posts):
+            if not _move_piece_fits(player, piece, post):
+                continue
+            assigned = assign(piece_index + 1, posts[:index] + posts[index + 1 :])
+            if assigned is not None:
+                return [post, *assigned]
+        return None
+
+    baseline = assign(0, empty_posts)
+    if baseline is None:
+        return lambda selected_post: False
+    used_posts = {id(post) for post in baseline}
+
+    def can_finish(selected_post):
+        if id(selected_post) not in used_posts:
+            return True
+        return assign(0, [post for post in empty_posts if post is not selected_post]) is not None
 
-    return can_assign(0, available_posts)
+    return can_finish
 
 
 def mask_place_adjacent(game):
@@ -88,6 +102,58 @@ def _has_pending_action_choice(game):
     )
 
 
+def can_displace_any_piece(player):
+    """Whether the player keeps a piece after paying the smallest displacement."""
+    return player.personal_supply_squares + player.personal_supply_circles > 1
+
+
+def ordinary_post_slots(game, route, post, can_displace):
+    """Return trader/merchant legality for claiming or displacing on one post.
+
+    This is the ordinary ACTIONS branch of ``mask_post_action`` once the
+    current player holds no moved pieces.
+    """
+    current_player = game.current_player
+    trader = merchant = False
+    if post.is_owned() and post.owner == current_player:
+        return True, True
+    if not post.is_owned() and game.check_brown_blue_priv(route):
+        block_cost = len(route.block_marker_owners)
+        total_supply = (
+            current_player.personal_supply_squares + current_player.personal_supply_circles
+        )
+        if (
+            current_player.personal_supply_squares > 0
+            and total_supply > block_cost
+            and (not post.required_shape or post.required_shape == "square")
+        ):
+            trader = True
+        if (
+            current_player.personal_supply_circles > 0
+            and total_supply > block_cost
+            and (not post.required_shape or post.required_shape == "circle")
+        ):
+            merchant = True
+    elif post.is_owned() and game.check_brown_blue_priv(route) and can_displace:
+        displacement_cost = 2 if post.owner_piece_shape == "square" else 3
+        if (
+            current_player.personal_supply_squares + current_player.personal_supply_circles
+            >= displacement_cost
+            and displacement_can_be_completed(game, route, post.owner, post.owner_piece_shape)
+        ):
+            if (
+                post.required_shape in (None, "square")
+                and current_player.personal_supply_squares > 0
+            ):
+                trader = True
+            if (
+                post.required_shape in (None, "circle")
+                and current_player.personal_supply_circles > 0
+            ):
+                merchant = True
+    return trader, merchant
+
+
 def mask_post_action(game):
     current_player = game.current_player
 
@@ -106,9 +172,8 @@ def mask_post_action(game):
     ):
         return post_tensor
 
-    can_displace = (
-        current_player.personal_supply_squares + current_player.personal_supply_circles > 1
-    )
+    can_displace = can_displace_any_piece(current_player)
+    can_finish_move = _move_completion_check(game)
 
     post_idx = 0
     for route in game.selected_map.routes:
@@ -203,7 +268,7 @@ def mask_post_action(game):
                         shape_to_place, _, origin_region = current_player.holding_pieces[0]
                         if current_player.is_valid_region_transition(
                             origin_region, post.region
-                        ) and _can_finish_move_after_placement(game, post):
+                        ) and can_finish_move(post):
                             if shape_to_place == "square" and (
                                 not post.required_shape or post.required_shape == "square"
                             ):
@@ -220,52 +285,10 @@ def mask_post_action(game):
                         post_tensor[post_idx] = 1
                         post_tensor[MAX_POSTS + post_idx] = 1
 
-                elif is_post_owned and post.owner == current_player:
-                    post_tensor[post_idx] = 1
-                    post_tensor[MAX_POSTS + post_idx] = 1
-                elif is_post_empty and game.check_brown_blue_priv(route):
-                    block_cost = len(route.block_marker_owners)
-                    total_supply = (
-                        current_player.personal_supply_squares
-                        + current_player.personal_supply_circles
-                    )
-                    if (
-                        current_player.personal_supply_squares > 0
-                        and total_supply > block_cost
-                        and (not post.required_shape or post.required_shape == "square")
-                    ):
-                        post_tensor[post_idx] = 1
-                    if (
-                        current_player.personal_supply_circles > 0
-                        and total_supply > block_cost
-                        and (not post.required_shape or post.required_shape == "circle")
-                    ):
-                        post_tensor[MAX_POSTS + post_idx] = 1
-                elif (
-                    is_post_owned
-                    and post.owner != current_player
-                    and game.check_brown_blue_priv(route)
-                    and can_displace
-                ):
-                    displacement_cost = 2 if post.owner_piece_shape == "square" else 3
-                    if (
-                        current_player.personal_supply_squares
-                        + current_player.personal_supply_circles
-                        >= displacement_cost
-                        and displacement_can_be_completed(
-                            game, route, post.owner, post.owner_piece_shape
-                        )
-                    ):
-                        if (
-                            post.required_shape in (None, "square")
-                            and current_player.personal_supply_squares > 0
-                        ):
-                            post_tensor[post_idx] = 1
-                        if (
-                            post.required_shape in (None, "circle")
-                            and current_player.personal_supply_circles > 0
-                        ):
-                            post_tensor[MAX_POSTS + post_idx] = 1
+                else:
+                    trader, merchant = ordinary_post_slots(game, route, post, can_displace)
+                    post_tensor[post_idx] = trader
+                    post_tensor[MAX_POSTS + post_idx] = merchant
             post_idx += 1
 
     return post_tensor
@@ -1,3 +1,5 @@
+from functools import wraps
+
 from game.action_schema import (
     BONUS_MARKER_PAYMENT_TYPES,
     BONUS_MARKER_SLOT_BY_TYPE,
@@ -25,6 +27,19 @@ from game.game_actions import (
 from game.turn_state import TurnPhase
 
 
+def _mutates_game(resolver):
+    """Advance the game's state version once the resolver has run."""
+
+    @wraps(resolver)
+    def resolve(game, *args):
+        try:
+            return resolver(game, *args)
+        finally:
+            game.mark_state_changed()
+
+    return resolve
+
+
 def _raise_invalid_action(game, route=None):
     route_description = "unknown route"
     if route is not None:
@@ -36,6 +51,7 @@ def _raise_invalid_action(game, route=None):
     )
 
 
+@_mutates_game
 def resolve_post_interaction(game, post_slot, post_type):
     current_player = game.current_player
     selected = game.post_context(post_slot)
@@ -121,6 +137,7 @@ def resolve_post_interaction(game, post_slot, post_type):
             _raise_invalid_action(game, selected_route)
 
 
+@_mutates_game
 def resolve_route_interaction(game, route_idx, interaction_slot):
     """Resolve one structured interaction with a completed route."""
     route = game.selected_map.routes[route_idx]
@@ -184,6 +201,7 @@ def resolve_route_interaction(game, route_idx, interaction_slot):
     game.check_for_game_end()
 
 
+@_mutates_game
 def resolve_income_interaction(game, index):
     if game.pending_britannia_place2:
         player = game.current_player
@@ -320,6 +338,7 @@ def resolve_income_interaction(game, index):
     game.begin_income_favour_response(current_player)
 
 
+@_mutates_game
 def resolve_bonus_marker_interaction(game, index):
     if game.waiting_for_buy_tile_with_bm and game.tile_to_buy is not None:
         resolve_tile_interaction(game, index)
@@ -385,6 +404,7 @@ def resolve_bonus_marker_interaction(game, index):
     return
 
 
+@_mutates_game
 def resolve_additional_office_marker(game):
     if game.waiting_for_buy_tile_with_bm and game.tile_to_buy is not None:
         resolve_tile_interaction(game, 8)
@@ -394,6 +414,7 @@ def resolve_additional_office_marker(game):
     game.waiting_for_bm_place_adjacent = True
 
 
+@_mutates_game
 def resolve_tile_interaction(game, index):
     current_player = game.current_player
     if game.pending_income_favour_owner is not None:
@@ -442,6 +463,7 @@ def resolve_tile_interaction(game, index):
     return
 
 
+@_mutates_game
 def resolve_replacement_marker(game, index):
     current_player = game.current_player
     if not (
@@ -470,6 +492,7 @@ def resolve_replacement_marker(game, index):
         game.switch_player_if_needed()
 
 
+@_mutates_game
 def resolve_player_interaction(game, player_slot):
     if not game.waiting_for_bm_exchange_bm or game.exchange_target_player is not None:
         raise InvalidActionError("Player interaction has no active workflow")
@@ -479,6 +502,7 @@ def resolve_player_interaction(game, player_slot):
     game.exchange_target_player = target
 
 
+@_mutates_game
 def resolve_city_interaction(game, action):
     if game.waiting_for_bm_swap_office:
         catalogue = city_pair_catalogue(game.selected_map.cities)
@@ -499,6 +523,7 @@ def resolve_city_interaction(game, action):
     raise InvalidActionError("City interaction has no active workflow")
 
 
+@_mutates_game
 def resolve_ability_interaction(game, index):
     for upgrade_idx, upgrade_city in enumerate(game.selected_map.upgrade_cities):
         if upgrade_idx == index:
@@ -508,6 +533,7 @@ def resolve_ability_interaction(game, index):
                 game.waiting_for_bm_upgrade_ability = False
 
 
+@_mutates_game
 def resolve_control_interaction(game):
     if game.waiting_for_bm_move3 or game.waiting_for_bm_move_any_2:
         game.current_player.pieces_to_pickup = 0
@@ -89,13 +89,12 @@ def validate_action_state(game, quiet: bool = False) -> ActionValidationResult:
             if DEFAULT_ACTION_CODEC.is_reserved(index) and mask[index]:
                 _fail(game, "reserved index is enabled", index)
 
-        snapshot = pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL)
         for index in enabled:
             action = DEFAULT_ACTION_CODEC.decode(index)
             if action not in legal_actions:
                 _fail(game, "enabled index decodes to an illegal action", index, action)
-            first = pickle.loads(snapshot)
-            second = pickle.loads(snapshot)
+            first = game.clone()
+            second = game.clone()
             try:
                 first.apply_ai_action(index)
                 second.apply_ai_action(index)
@@ -0,0 +1,105 @@
+"""Array snapshot of who occupies every trading post and office, for validation.
+
+Posts and offices are individual objects hanging off routes and cities, so
+``validate_game`` counting each player's squares and circles on the board
+walks the whole map once per player and shape. ``BoardOccupancy`` walks it
+once and stores the answer as parallel NumPy arrays: one entry per post slot,
+in route order, and one entry per office, in city order.
+
+The snapshot serves the invariant checks only. It is rebuilt by every
+``validate_game`` call and is not maintained as actions resolve, because
+scenario generators and tests assign post and office owners directly; the
+legal-action and scoring paths keep reading the game graph.
+"""
+
+import numpy as np
+
+
+NO_PLAYER = -1
+UNKNOWN_PLAYER = -2
+
+NO_SHAPE = 0
+SQUARE = 1
+CIRCLE = 2
+OTHER_SHAPE = 3
+
+_SHAPE_CODES = {None: NO_SHAPE, "square": SQUARE, "circle": CIRCLE}
+
+# Each post or office is packed into one small code, (owner + 2) * 4 + shape,
+# so a single bincount yields the occupancy of every player and shape.
+_SHAPE_COUNT = 4
+_OWNER_OFFSET = -UNKNOWN_PLAYER
+
+
+class BoardOccupancy:
+    """Owner and piece-shape arrays for every post slot and office of one game.
+
+    Owners are player indices into ``game.players``; ``NO_PLAYER`` marks an
+    empty post or office and ``UNKNOWN_PLAYER`` an owner that is not one of the
+    game's players. Office shapes are the occupying piece when there is one and
+    the printed shape otherwise, which is the shape the piece returns as.
+    """
+
+    def __init__(self, game):
+        self.player_count = len(game.players)
+        owner_codes = {
+            id(player): (index + _OWNER_OFFSET) * _SHAPE_COUNT
+            for index, player in enumerate(game.players)
+        }
+        owner_codes[id(None)] = (NO_PLAYER + _OWNER_OFFSET) * _SHAPE_COUNT
+        owner_code = owner_codes.get
+        shape_code = _SHAPE_CODES.get
+        unknown = (UNKNOWN_PLAYER + _OWNER_OFFSET) * _SHAPE_COUNT
+        self._cities = game.selected_map.cities
+        self.post_codes = np.array(
+            [
+                owner_code(id(post.owner), unknown)
+                + shape_code(post.owner_piece_shape, OTHER_SHAPE)
+                for route in game.selected_map.routes
+                for post in route.posts
+            ],
+            dtype=np.int8,
+        )
+        self.office_codes = np.array(
+            [
+                owner_code(id(office.controller), unknown)
+                + shape_code(office.owner_piece_shape or office.shape, OTHER_SHAPE)
+                for city in self._cities
+                for office in city.offices
+            ],
+            dtype=np.int8,
+        )
+        self.post_owner = self.post_codes // _SHAPE_COUNT - _OWNER_OFFSET
+        self.post_shape = self.post_codes % _SHAPE_COUNT
+        self.office_controller = self.office_codes // _SHAPE_COUNT - _OWNER_OFFSET
+        self.office_shape = self.office_codes % _SHAPE_COUNT
+
+    def _counts(self, codes, shape):
+        counts = np.bincount(codes, minlength=(self.player_count + 2) * _SHAPE_COUNT)
+        return counts[_OWNER_OFFSET * _SHAPE_COUNT + shape :: _SHAPE_COUNT][: self.player_count]
+
+    def post_counts(self, shape):
+        """Return how many posts each player occupies with ``shape``."""
+        return self._counts(self.post_codes, shape)
+
+    def office_counts(self, shape):
+        """Return how many offices each player occupies with ``shape``."""
+        return self._counts(self.office_codes, shape)
+
+    def first_inconsistent_post(self):
+        """Return ``(slot, reason)`` for the first post whose state is contradictory."""
+        disagree = (self.post_owner == NO_PLAYER) != (self.post_shape == NO_SHAPE)
+        unknown = self.post_owner == UNKNOWN_PLAYER
+        slots = np.flatnonzero(disagree | unknown)
+        if not len(slots):
+            return None
+        slot = int(slots[0])
+        return slot, "disagree" if disagree[slot] else "unknown"
+
+    def first_unknown_office_city(self):
+        """Return the city index of the first office held by an unknown controller."""
+        offices = np.flatnonzero(self.office_controller == UNKNOWN_PLAYER)
+        if not len(offices):
+            return None
+        office_counts = np.cumsum([len(city.offices) for city in self._cities])
+        return int(np.searchsorted(office_counts, offices[0], side="right"))
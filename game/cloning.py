@@ -0,0 +1,268 @@
+"""In-memory game snapshots that share immutable map geometry.
+
+``validate_action_state`` needs two independent copies of the engine for every
+enabled interaction. A pickle round trip rebuilds every value in the graph,
+including post positions, city rectangles, colours and upgrade boxes that
+never change after setup. ``GameSnapshot`` walks the graph once and records
+only its mutable containers: numbers, strings, enums and tuples of them are
+shared by reference, and the map-setup containers listed in ``_SHARED_FIELDS``
+are shared outright. ``restore`` then rebuilds the mutable part from flat
+slot tables without revisiting the shared values.
+
+``Game.clone`` keeps one snapshot per state version, so only the first copy
+of a state pays for the walk. A restored game also keeps the legal
+interactions already derived for the recorded state, which spares the
+validator a second legality pass on every copy."""
+
+from collections import deque
+import copy
+from enum import Enum
+import random
+import types
+from weakref import WeakKeyDictionary
+
+from game.legal_actions import adopt_legal_action_set, cached_legal_action_set
+from map_data.map_attributes import City, Map
+
+_IMMUTABLE_TYPES = {
+    int,
+    float,
+    complex,
+    str,
+    bytes,
+    bool,
+    type(None),
+    frozenset,
+    range,
+    type,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+}
+
+# Attributes written only while the map is built, then shared by every copy.
+_SHARED_FIELDS = {
+    City: frozenset({"upgrade_city_type"}),
+    Map: frozenset(
+        {"initial_bonus_types", "east_west_cities", "bonus_marker_positions", "mission_cards"}
+    ),
+}
+_SHARED_FIELDS_BY_TYPE = {}
+
+_OBJECTS, _CONTAINERS, _CONSTANTS, _TUPLES = range(4)
+_SHARED = object()
+
+_SNAPSHOTS = WeakKeyDictionary()
+
+
+def _shared_fields(kind):
+    shared = _SHARED_FIELDS_BY_TYPE.get(kind)
+    if shared is None:
+        shared = frozenset().union(
+            *(fields for declared, fields in _SHARED_FIELDS.items() if issubclass(kind, declared))
+        )
+        _SHARED_FIELDS_BY_TYPE[kind] = shared
+    return shared
+
+
+def _new_deque(maxlen):
+    return deque(maxlen=maxlen)
+
+
+def _new_random(state):
+    clone = random.Random()
+    clone.setstate(state)
+    return clone
+
+
+class GameSnapshot:
+    """Frozen copy of one game state that can be restored many times.
+
+    Every recorded value becomes a slot in one flat node list: objects and
+    containers are created empty, shared values are copied in as they are, and
+    tuples are rebuilt after their members. Each container is then filled from
+    a tuple of slot indices in a single pass. The attached AI model and the game
+    configuration are not engine state and are shared with every restored game.
+    """
+
+    def __init__(self, game):
+        self.state_version = getattr(game, "state_version", 0)
+        self._memo = {}
+        self._classes = []
+        self._containers = []
+        self._constants = []
+        self._tuple_slots = []
+        self._objects = []
+        self._sequences = []
+        self._mappings = []
+        self._sets = []
+        for external in (getattr(game, "ai_model", None), getattr(game, "configuration", None)):
+            if external is not None:
+                self._memo[id(external)] = _SHARED
+        root = self._record(game)
+        del self._memo
+        self._legal_actions = cached_legal_action_set(game)
+
+        offsets = (
+            0,
+            len(self._classes),
+            len(self._classes) + len(self._containers),
+            len(self._classes) + len(self._containers) + len(self._constants),
+        )
+
+        def slots(references):
+            return tuple(offsets[category] + local for category, local in references)
+
+        self._root = offsets[root[0]] + root[1]
+        self._tuple_slots = tuple(slots(items) for items in self._tuple_slots)
+        self._objects = tuple(
+            (offsets[_OBJECTS] + local, template, keys, slots(items))
+            for local, template, keys, items in self._objects
+        )
+        self._sequences = tuple(
+            (offsets[_CONTAINERS] + local, slots(items)) for local, items in self._sequences
+        )
+        self._mappings = tuple(
+            (offsets[_CONTAINERS] + local, slots(keys), slots(items))
+            for local, keys, items in self._mappings
+        )
+        self._sets = tuple(
+            (offsets[_CONTAINERS] + local, slots(items)) for local, items in self._sets
+        )
+        self._classes = tuple(self._classes)
+        self._containers = tuple(self._containers)
+        self._constants = tuple(self._constants)
+
+    def restore(self):
+        """Return a new game equal to the state this snapshot recorded."""
+        new = object.__new__
+        nodes = [new(kind) for kind in self._classes]
+        nodes += [make(argument) for make, argument in self._containers]
+        nodes += self._constants
+        lookup = nodes.__getitem__
+        append = nodes.append
+        for items in self._tuple_slots:
+            append(tuple(map(lookup, items)))
+        for index, template, keys, items in self._objects:
+            state = template.copy()
+            state.update(zip(keys, map(lookup, items)))
+            nodes[index].__dict__ = state
+        for index, items in self._sequences:
+            nodes[index].extend(map(lookup, items))
+        # Dicts and sets hash their members, so they are filled last.
+        for index, keys, items in self._mappings:
+            nodes[index].update(zip(map(lookup, keys), map(lookup, items)))
+        for index, items in self._sets:
+            nodes[index].update(map(lookup, items))
+        game = nodes[self._root]
+        adopt_legal_action_set(game, self._legal_actions)
+        return game
+
+    def _container(self, value, make, argument):
+        reference = _CONTAINERS, len(self._containers)
+        self._memo[id(value)] = reference
+        self._containers.append((make, argument))
+        return reference
+
+    def _slot(self, value):
+        """Return the ``(category, index)`` slot that holds ``value`` on restore."""
+        reference = None if type(value) in _IMMUTABLE_TYPES else self._record(value)
+        if reference is None:
+            self._constants.append(value)
+            return _CONSTANTS, len(self._constants) - 1
+        return reference
+
+    def _record(self, value):
+        """Return the slot that rebuilds ``value``, or ``None`` to share it."""
+        known = self._memo.get(id(value))
+        if known is not None:
+            return None if known is _SHARED else known
+        kind = type(value)
+        if kind is tuple:
+            return self._record_tuple(value)
+        if kind is list or kind is deque:
+            reference = (
+                self._container(value, list, ())
+                if kind is list
+                else self._container(value, _new_deque, value.maxlen)
+            )
+            self._sequences.append((reference[1], [self._slot(item) for item in value]))
+            return reference
+        if kind is dict:
+            reference = self._container(value, dict, ())
+            self._mappings.append(
+                (
+                    reference[1],
+                    [self._slot(key) for key in value],
+                    [self._slot(item) for item in value.values()],
+                )
+            )
+            return reference
+        if kind is set:
+            reference = self._container(value, set, ())
+            self._sets.append((reference[1], [self._slot(item) for item in value]))
+            return reference
+        if kind is random.Random:
+            return self._container(value, _new_random, value.getstate())
+        if kind in _IMMUTABLE_TYPES:
+            return None
+        if issubclass(kind, Enum):
+            _IMMUTABLE_TYPES.add(kind)
+            return None
+        if hasattr(value, "__dict__"):
+            return self._record_object(value, kind)
+        return self._container(value, copy.deepcopy, copy.deepcopy(value))
+
+    def _record_tuple(self, value):
+        references = [
+            None if type(item) in _IMMUTABLE_TYPES else self._record(item) for item in value
+        ]
+        if not any(references):
+            # Only immutable members: share the tuple itself.
+            self._memo[id(value)] = _SHARED
+            return None
+        reference = _TUPLES, len(self._tuple_slots)
+        self._memo[id(value)] = reference
+        self._tuple_slots.append(
+            [
+                self._slot(item) if item_reference is None else item_reference
+                for item, item_reference in zip(value, references)
+            ]
+        )
+        return reference
+
+    def _record_object(self, value, kind):
+        reference = _OBJECTS, len(self._classes)
+        self._memo[id(value)] = reference
+        self._classes.append(kind)
+        shared = _shared_fields(kind)
+        # Shared attribute values live in a template dict that restore copies
+        # in one call; only the remaining attributes are looked up by slot.
+        template = value.__dict__.copy()
+        keys = []
+        items = []
+        for key, item in template.items():
+            if type(item) in _IMMUTABLE_TYPES or key in shared:
+                continue
+            item_reference = self._record(item)
+            if item_reference is not None:
+                template[key] = None
+                keys.append(key)
+                items.append(item_reference)
+        self._objects.append((reference[1], template, tuple(keys), items))
+        return reference
+
+
+def game_snapshot(game):
+    """Return the snapshot of ``game`` recorded once per state version."""
+    version = getattr(game, "state_version", 0)
+    cached = _SNAPSHOTS.get(game)
+    if cached is not None and cached.state_version == version:
+        return cached
+    cached = GameSnapshot(game)
+    _SNAPSHOTS[game] = cached
+    return cached
+
+
+def clone_game(game):
+    """Return an independent copy of ``game`` that shares immutable geometry."""
+    return game_snapshot(game).restore()
@@ -1,4 +1,6 @@
 from collections import deque
+from operator import attrgetter
+from weakref import WeakKeyDictionary
 
 from map_data.constants import DARK_GREEN
 from player_info.player_attributes import valid_region_transition
@@ -99,8 +101,12 @@ def _post_accepts_any_shape(post, shapes, unavailable_posts=()):
     )
 
 
-def gather_all_empty_posts(game, required_shapes=("square", "circle"), unavailable_posts=()):
+def gather_all_empty_posts(
+    game, required_shapes=("square", "circle"), unavailable_posts=(), scanned_routes=None
+):
     all_empty_posts = []
+    if scanned_routes is not None:
+        scanned_routes.extend(game.selected_map.routes)
     for route in game.selected_map.routes:
         for post in route.posts:
             if _post_accepts_any_shape(post, required_shapes, unavailable_posts):
@@ -112,8 +118,12 @@ def gather_empty_adjacent_posts(
     start_route,
     required_shapes=("square", "circle"),
     unavailable_posts=(),
+    scanned_routes=None,
 ):
-    """Return compatible empty posts at the nearest reachable route distance."""
+    """Return compatible empty posts at the nearest reachable route distance.
+
+    Every route whose posts are inspected is appended to ``scanned_routes``.
+    """
     if not start_route:
         raise InvalidActionError("Displacement has no originating route")
 
@@ -136,6 +146,8 @@ def gather_empty_adjacent_posts(
                 if route not in visited_routes and route not in next_level_routes:
                     next_level_routes.append(route)
 
+            if scanned_routes is not None:
+                scanned_routes.append(current_route)
             for post in current_route.posts:
                 if _post_accepts_any_shape(post, required_shapes, unavailable_posts):
                     empty_posts.append(post)
@@ -148,9 +160,85 @@ def gather_empty_adjacent_posts(
     return []
 
 
+_DISPLACEMENT_MEMOS = WeakKeyDictionary()
+_POST_OWNER = attrgetter("owner")
+
+
+class DisplacementMemo:
+    """Remembered ``displacement_can_be_completed`` answers for one game.
+
+    An answer depends on the displaced player's stock and supply, whether they
+    may displace anywhere, and which posts on the routes the search inspected
+    are empty; required shapes and route adjacency never change. Each answer is
+    stored with the owners of those routes' posts and is reused only while
+    they are unchanged, so direct edits to the board can never return a stale
+    answer. Stale answers are dropped when found, and the memo keeps at most
+    ``max_entries`` answers, evicting the least recently used.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._answers = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def clear(self):
+        self._answers.clear()
+
+    def lookup(self, key):
+        """Return the remembered answer for ``key`` or ``None`` when it must be searched."""
+        entry = self._answers.pop(key, None)
+        if entry is not None:
+            answer, posts, owners = entry
+            if tuple(map(_POST_OWNER, posts)) == owners:
+                self._answers[key] = entry
+                self.hits += 1
+                return answer
+            self.stale += 1
+        self.misses += 1
+        return None
+
+    def store(self, key, answer, scanned_routes):
+        posts = tuple(post for route in dict.fromkeys(scanned_routes) for post in route.posts)
+        self._answers[key] = answer, posts, tuple(map(_POST_OWNER, posts))
+        if len(self._answers) > self.max_entries:
+            del self._answers[next(iter(self._answers))]
+
+    def __len__(self):
+        return len(self._answers)
+
+
+def displacement_memo(game):
+    """Return the displacement feasibility memo attached to ``game``."""
+    memo = _DISPLACEMENT_MEMOS.get(game)
+    if memo is None:
+        memo = DisplacementMemo()
+        _DISPLACEMENT_MEMOS[game] = memo
+    return memo
+
+
 def displacement_can_be_completed(game, route, displaced_player, displaced_shape):
     """Whether some legal placement sequence can relocate the mandatory piece."""
+    anywhere = game.DisplaceAnywhereOwner == displaced_player
+    general_stock = (displaced_player.general_stock_squares, displaced_player.general_stock_circles)
+    personal_supply = (
+        displaced_player.personal_supply_squares,
+        displaced_player.personal_supply_circles,
+    )
+    key = route, displaced_player, displaced_shape, anywhere, general_stock, personal_supply
+    memo = displacement_memo(game)
+    answer = memo.lookup(key)
+    if answer is not None:
+        return answer
+
     optional_limit = 1 if displaced_shape == "square" else 2
+    scanned_routes = []
 
     def search(unavailable_posts, general_stock, personal_supply, optional_remaining):
         source = general_stock if sum(general_stock) else personal_supply
@@ -160,10 +248,10 @@ def displacement_can_be_completed(game, route, displaced_player, displaced_shape
             for shape, count in zip(("square", "circle"), source)
             if count and shape != displaced_shape
         )
-        if game.DisplaceAnywhereOwner == displaced_player:
-            targets = gather_all_empty_posts(game, shapes, unavailable_posts)
+        if anywhere:
+            targets = gather_all_empty_posts(game, shapes, unavailable_posts, scanned_routes)
         else:
-            targets = gather_empty_adjacent_posts(route, shapes, unavailable_posts)
+            targets = gather_empty_adjacent_posts(route, shapes, unavailable_posts, scanned_routes)
 
         if any(post.required_shape in (None, displaced_shape) for post in targets):
             return True
@@ -188,12 +276,9 @@ def displacement_can_be_completed(game, route, displaced_player, displaced_shape
                 return True
         return False
 
-    return search(
-        frozenset(),
-        (displaced_player.general_stock_squares, displaced_player.general_stock_circles),
-        (displaced_player.personal_supply_squares, displaced_player.personal_supply_circles),
-        optional_limit,
-    )
+    answer = search(frozenset(), general_stock, personal_supply, optional_limit)
+    memo.store(key, answer, scanned_routes)
+    return answer
 
 
 def displacement_shapes_to_place(game):
@@ -37,6 +37,8 @@ AI_DIFFICULTY_TOP_K = {
 }
 
 SELECTION_MODES = ("random", "manual")
+# Numeric precision of the shared AI model; see ``ai.ai_model.inference_model``.
+AI_INFERENCE_PRECISIONS = ("float32", "int8", "bfloat16")
 
 
 def human_players(count: int) -> tuple[PlayerControl, ...]:
@@ -63,6 +65,7 @@ class GameConfiguration:
     difficulty_top_k: tuple[tuple[PlayerControl, int], ...] = field(
         default_factory=lambda: tuple(AI_DIFFICULTY_TOP_K.items())
     )
+    ai_precision: str = "float32"
 
     def __post_init__(self) -> None:
         controls = tuple(PlayerControl(value) for value in self.player_controls)
@@ -109,6 +112,8 @@ class GameConfiguration:
             raise ValueError("Difficulty thresholds must define every AI difficulty")
         if any(not isinstance(value, int) or value < 1 for value in thresholds.values()):
             raise ValueError("Difficulty thresholds must be positive integers")
+        if self.ai_precision not in AI_INFERENCE_PRECISIONS:
+            raise ValueError(f"Unknown AI inference precision: {self.ai_precision}")
 
     @staticmethod
     def _validate_optional_selection(
@@ -215,12 +220,11 @@ class GameConfiguration:
             player.ai_top_k = None if control.is_human else self.top_k_for(control)
         return game
 
-    @staticmethod
-    def _load_ai_model():
+    def _load_ai_model(self):
         # AI models are optional; human-only games must not import PyTorch.
-        from ai.ai_model import HansaNN, SHARED_MODEL_FILE
+        from ai.ai_model import SHARED_MODEL_FILE, load_inference_model
 
-        return HansaNN(model_file=SHARED_MODEL_FILE)
+        return load_inference_model(SHARED_MODEL_FILE, self.ai_precision)
 
 
 def choose_ranked_ai_action(
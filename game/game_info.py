@@ -3,8 +3,12 @@ import random
 from game.action_codec import ActionCodecError, DEFAULT_ACTION_CODEC
 from game.action_schema import TILE_TYPES
 from game.action_execution import execute_action
+from game.cloning import clone_game
 from game.game_actions import InvalidActionError
-from game.legal_actions import get_legal_actions
+from game.legal_actions import legal_action_set
+from game.map_topology import map_topology
+from game.office_network import OfficeNetwork
+from game.score_ledger import score_ledger
 from game.setup import validate_game_configuration
 from game.turn_state import TurnPhase, TurnStateError
 from map_data.map1 import Map1
@@ -48,6 +52,7 @@ class Game:
         self._post_catalogue = tuple(
             (route, post) for route in self.selected_map.routes for post in route.posts
         )
+        self.state_version = 0
         if bonus_marker_supply is not None:
             self.selected_map.configure_bonus_marker_supply(bonus_marker_supply)
         self.num_players = num_players
@@ -245,17 +250,39 @@ class Game:
             return True
         return False
 
+    def mark_state_changed(self):
+        """Advance the mutation version so derived legality is rebuilt.
+
+        Resolvers call this after every interaction. Code that edits the game
+        graph directly, such as scenario generators, must call it before
+        asking for legal interactions again.
+        """
+        self.state_version = getattr(self, "state_version", 0) + 1
+
+    def clone(self):
+        """Return an independent copy that shares immutable map geometry.
+
+        The object graph is recorded once per state version, so repeated
+        clones of one state only pay for the restore. Like the legality
+        cache, direct edits must call ``mark_state_changed`` first.
+        """
+        return clone_game(self)
+
     def get_legal_actions(self):
         """Return authoritative structured legal interactions."""
-        return get_legal_actions(self)
+        return list(legal_action_set(self).actions)
 
     def ai_action_mask(self):
         """Return the authoritative 768-entry AI action mask."""
-        return DEFAULT_ACTION_CODEC.create_mask(self.get_legal_actions())
+        return legal_action_set(self).mask
+
+    def legal_action_indices(self):
+        """Return the enabled AI action indices for the current state."""
+        return legal_action_set(self).indices
 
     def apply_structured_action(self, action):
         """Validate and execute one structured interaction."""
-        if action not in self.get_legal_actions():
+        if action not in legal_action_set(self).action_set:
             raise InvalidActionError(f"Structured action is not legal: {action!r}")
         execute_action(self, action)
 
@@ -404,63 +431,27 @@ class Game:
                 self.players_who_completed_east_west.add(self.current_player)
 
     def check_if_player_has_matching_offices_in_east_west(self, start_city_name, end_city_name):
-        start_city = next(
-            (city for city in self.selected_map.cities if city.name == start_city_name), None
-        )
-        end_city = next(
-            (city for city in self.selected_map.cities if city.name == end_city_name), None
-        )
-
-        if not start_city or not end_city:
+        topology = map_topology(self.selected_map)
+        start = topology.city_index.get(start_city_name)
+        end = topology.city_index.get(end_city_name)
+        if start is None or end is None:
             return False
 
-        return start_city.has_office_owned_by(self.current_player) and end_city.has_office_owned_by(
-            self.current_player
-        )
-
-    def has_east_west_connection(self, start_city_name, end_city_name, visited=None):
-        # This is a recursive depth-first search (DFS) algorithm.
-        if visited is None:
-            visited = set()
-
-        start_city = next(
-            (city for city in self.selected_map.cities if city.name == start_city_name), None
-        )
-        end_city = next(
-            (city for city in self.selected_map.cities if city.name == end_city_name), None
-        )
+        cities = self.selected_map.cities
+        return all(cities[index].has_office_owned_by(self.current_player) for index in (start, end))
 
-        # Check if both cities exist in the game.
-        if start_city is None or end_city is None:
-            return False
-        if not start_city.has_office_owned_by(self.current_player):
+    def has_east_west_connection(self, start_city_name, end_city_name):
+        """Return whether the current player's offices link the two named cities."""
+        topology = map_topology(self.selected_map)
+        start = topology.city_index.get(start_city_name)
+        end = topology.city_index.get(end_city_name)
+        if start is None or end is None:
             return False
-        if not end_city.has_office_owned_by(self.current_player):
+        if not self.check_if_player_has_matching_offices_in_east_west(
+            start_city_name, end_city_name
+        ):
             return False
-
-        # If we've reached the end city, return True
-        if start_city == end_city:
-            return True
-
-        # Mark the start city as visited
-        visited.add(start_city)
-
-        # Go through each route connected to the start city
-        for route in start_city.routes:
-            # Check all cities connected to this route
-            for connected_city in route.cities:
-                # Skip if we've already visited this city or if the connected city doesn't have the player's office
-                if connected_city in visited or not connected_city.has_office_owned_by(
-                    self.current_player
-                ):
-                    continue
-
-                # Recursively check if the connected city leads to the end city
-                if self.has_east_west_connection(connected_city.name, end_city_name, visited):
-                    return True
-
-        # If none of the routes lead to the end city, return False
-        return False
+        return OfficeNetwork(self, self.current_player).connected(start, end)
 
     def get_bonus_marker_points(self, total_bms):
         if total_bms == 1:
@@ -486,45 +477,11 @@ class Game:
         # 5 prestige points for cities, 2 per control
         # 6 largest network x key
 
-    def dfs_network_size(self, player, city, visited_cities):
-        if city in visited_cities:
-            return 0  # This city is already part of the current network
-
-        visited_cities.add(city)
-        offices_in_city = sum(1 for office in city.offices if office.controller == player)
-        network_size = offices_in_city  # Count the number of offices instead of just the city
-
-        for route in city.routes:
-            for connected_city in route.cities:
-                if (
-                    connected_city != city
-                    and connected_city.has_office_owned_by(player)
-                    and connected_city not in visited_cities
-                ):
-                    network_size += self.dfs_network_size(player, connected_city, visited_cities)
-
-        return network_size
-
     def calculate_largest_network(self, player):
-        largest_network = 0
-        all_visited_cities = set()
-
-        for city in self.selected_map.cities:
-            if city.has_office_owned_by(player) and city not in all_visited_cities:
-                visited_cities = set()
-                network_size = self.dfs_network_size(player, city, visited_cities)
-                largest_network = max(largest_network, network_size)
-                all_visited_cities.update(visited_cities)
-
-        return largest_network
-
-    def projected_score_breakdown(self, player, britannia_region_points=None):
-        """Calculate one player's authoritative score if the game ended now."""
-        if britannia_region_points is None:
-            britannia_region_points = (
-                self.calculate_britannia_region_points() if self.map_num == 3 else {}
-            )
+        return OfficeNetwork(self, player).largest()
 
+    def player_score_breakdown(self, player):
+        """Return the score categories that depend only on the player's own counters."""
         ability_points = 0
         for ability in ["privilege", "book", "actions", "bank"]:
             if getattr(player, ability) == UPGRADE_MAX_VALUES[ability]:
@@ -541,6 +498,20 @@ class Game:
                 )
             )
 
+        return {
+            "Initial Points": player.score,
+            "Ability Points": ability_points,
+            "Bonus Marker Points": self.get_bonus_marker_points(total_bms),
+            "Special Prestige Points": special_prestige_points,
+        }
+
+    def projected_score_breakdown(self, player, britannia_region_points=None):
+        """Calculate one player's authoritative score if the game ended now."""
+        if britannia_region_points is None:
+            britannia_region_points = (
+                self.calculate_britannia_region_points() if self.map_num == 3 else {}
+            )
+
         city_control_points = 0
         for city in self.selected_map.cities:
             if city.determine_controller() == player:
@@ -548,26 +519,21 @@ class Game:
                 if self.FourPtsPerOwnedCityOwner == player:
                     city_control_points += 2
 
-        breakdown = {
-            "Initial Points": player.score,
-            "Ability Points": ability_points,
-            "Bonus Marker Points": self.get_bonus_marker_points(total_bms),
-            "Special Prestige Points": special_prestige_points,
-            "City Control Points": city_control_points,
-            "Largest Network Points": self.calculate_largest_network(player) * player.keys,
-            "Britannia Region Points": britannia_region_points.get(player, 0),
-        }
+        breakdown = self.player_score_breakdown(player)
+        breakdown["City Control Points"] = city_control_points
+        breakdown["Largest Network Points"] = self.calculate_largest_network(player) * player.keys
+        breakdown["Britannia Region Points"] = britannia_region_points.get(player, 0)
         if self.use_mission_cards and player.mission_card:
             breakdown["Mission City Points"] = self.get_mission_card_points(player)
         return breakdown
 
     def projected_scores(self):
-        """Return final-score projections in seat order without ending the game."""
-        britannia = self.calculate_britannia_region_points() if self.map_num == 3 else {}
-        return tuple(
-            sum(self.projected_score_breakdown(player, britannia).values())
-            for player in self.players
-        )
+        """Return final-score projections in seat order without ending the game.
+
+        The board-derived categories come from the game's ``ScoreLedger``, which
+        only re-derives the cities whose offices changed since the last call.
+        """
+        return score_ledger(self).scores(self)
 
     def finalize_end_of_game_points(self):
         britannia = self.calculate_britannia_region_points() if self.map_num == 3 else {}
@@ -587,25 +553,15 @@ class Game:
         if self.num_players > 3:
             regions.append("Scotland")
 
-        city_names_by_region = {
-            region: {
-                city.name
-                for route in self.selected_map.routes
-                if route.region == region
-                for city in route.cities
-            }
-            | {"IsleOfMan"}
-            for region in regions
-        }
+        topology = map_topology(self.selected_map)
         awards = (7, 4, 2)
         for region in regions:
             standings = []
+            cities = [
+                self.selected_map.cities[index]
+                for index in topology.region_city_indices(region, shared=("IsleOfMan",))
+            ]
             for player in self.players:
-                cities = [
-                    city
-                    for city in self.selected_map.cities
-                    if city.name in city_names_by_region[region]
-                ]
                 controlled = sum(city.determine_controller() == player for city in cities)
                 offices = sum(
                     office.controller == player for city in cities for office in city.offices
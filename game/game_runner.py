@@ -2,14 +2,17 @@ from dataclasses import dataclass
 import json
 import random
 
-from game.action_codec import DEFAULT_ACTION_CODEC
+from game.action_codec import DEFAULT_ACTION_CODEC, ActionCodecError
+from game.action_execution import execute_action
 from game.action_schema import (
     ACTION_SPACE_SIZE,
     action_schema_metadata,
     validate_action_schema_metadata,
 )
+from game.cloning import GameSnapshot
+from game.game_actions import InvalidActionError
 from game.game_info import Game
-from game.invariants import validate_game
+from game.invariants import InvariantChecker, ValidationLevel, validate_game
 from game.structured_actions import (
     ControlInteraction,
     IncomeInteraction,
@@ -97,7 +100,29 @@ def legal_action_indices(game):
     mask = game.ai_action_mask()
     if len(mask) != ACTION_SPACE_SIZE:
         raise GameRunError(f"Expected a {ACTION_SPACE_SIZE}-entry action mask, got {len(mask)}")
-    return tuple(index for index, enabled in enumerate(mask) if enabled)
+    return game.legal_action_indices()
+
+
+def _replay_action(game, step, action_index, checker):
+    """Apply one recorded action; without a ``checker`` the trace is trusted."""
+    illegal = (
+        f"Replay action {action_index} is illegal at step {step}; "
+        f"player={game.current_player_index}, phase={game.turn_phase.value}"
+    )
+    if checker is None:
+        # A trusted trace was legal when it was recorded, so legality is not
+        # derived again; execution alone reproduces the recorded state and
+        # rejects an action that does not decode or apply.
+        try:
+            execute_action(game, DEFAULT_ACTION_CODEC.decode(action_index))
+        except (ActionCodecError, InvalidActionError) as error:
+            raise GameRunError(f"{illegal}: {error}") from error
+        return
+    if action_index not in legal_action_indices(game):
+        raise GameRunError(illegal)
+    turn_before, phase_before = game.turn_number, game.turn_phase
+    game.apply_ai_action(action_index)
+    checker.after_action(game, turn_before, phase_before)
 
 
 def replay_game(
@@ -108,8 +133,16 @@ def replay_game(
     use_mission_cards=False,
     use_emperors_favour=False,
     bonus_marker_supply=None,
+    validation=ValidationLevel.FULL,
+    full_validation_interval=50,
+    trusted=False,
 ):
-    """Restore a seeded headless game by replaying validated action indices."""
+    """Restore a seeded headless game by replaying validated action indices.
+
+    ``validation`` selects how often the board is recounted; see ``InvariantChecker``.
+    ``trusted`` skips the per-step legality check and invariants for traces this
+    engine recorded itself.
+    """
     game = create_headless_game(
         map_num,
         num_players,
@@ -118,15 +151,75 @@ def replay_game(
         use_emperors_favour=use_emperors_favour,
         bonus_marker_supply=bonus_marker_supply,
     )
+    checker = None if trusted else InvariantChecker(validation, full_validation_interval)
     for step, action_index in enumerate(action_trace):
-        if action_index not in legal_action_indices(game):
+        _replay_action(game, step, action_index, checker)
+    return game
+
+
+class SeekableReplay:
+    """Random access to every position of one replay.
+
+    A snapshot of the game is kept every ``checkpoint_interval`` actions the
+    replay has reached, so ``seek`` restores the nearest earlier checkpoint and
+    replays fewer than ``checkpoint_interval`` actions forward. Each call
+    returns an independent game. Replays are trusted by default, like
+    ``replay_game(..., trusted=True)``; with ``trusted=False`` every step is
+    checked for legality and fully validated.
+    """
+
+    def __init__(
+        self,
+        record,
+        *,
+        checkpoint_interval=50,
+        trusted=True,
+        use_mission_cards=False,
+        use_emperors_favour=False,
+        bonus_marker_supply=None,
+    ):
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint interval must be positive")
+        self.record = record
+        self.checkpoint_interval = checkpoint_interval
+        self.trusted = trusted
+        start = create_headless_game(
+            record.map_num,
+            record.num_players,
+            record.seed,
+            use_mission_cards=use_mission_cards,
+            use_emperors_favour=use_emperors_favour,
+            bonus_marker_supply=bonus_marker_supply,
+        )
+        self._checkpoints = {0: GameSnapshot(start)}
+
+    @property
+    def action_count(self):
+        return len(self.record.action_trace)
+
+    @property
+    def checkpoints(self):
+        """Return the action numbers that currently have a snapshot."""
+        return tuple(sorted(self._checkpoints))
+
+    def seek(self, action_number):
+        """Return a new game positioned after ``action_number`` recorded actions."""
+        if not 0 <= action_number <= self.action_count:
             raise GameRunError(
-                f"Replay action {action_index} is illegal at step {step}; "
-                f"player={game.current_player_index}, phase={game.turn_phase.value}"
+                f"Replay has no position {action_number}; it holds {self.action_count} actions"
             )
-        game.apply_ai_action(action_index)
-        validate_game(game)
-    return game
+        start = action_number - action_number % self.checkpoint_interval
+        while start not in self._checkpoints:
+            start -= self.checkpoint_interval
+        game = self._checkpoints[start].restore()
+        checker = None if self.trusted else InvariantChecker(ValidationLevel.FULL)
+        trace = self.record.action_trace
+        for step in range(start, action_number):
+            _replay_action(game, step, trace[step], checker)
+            reached = step + 1
+            if reached % self.checkpoint_interval == 0 and reached not in self._checkpoints:
+                self._checkpoints[reached] = GameSnapshot(game)
+        return game
 
 
 def select_progress_action(game, legal_actions, policy_rng):
@@ -201,8 +294,13 @@ def run_game(
     use_mission_cards=False,
     use_emperors_favour=False,
     bonus_marker_supply=None,
+    validation=ValidationLevel.FULL,
+    full_validation_interval=50,
 ):
-    """Run a deterministic legal-action baseline until terminal or a safety limit."""
+    """Run a deterministic legal-action baseline until terminal or a safety limit.
+
+    ``validation`` selects how often the board is recounted; see ``InvariantChecker``.
+    """
     game = create_headless_game(
         map_num,
         num_players,
@@ -213,6 +311,7 @@ def run_game(
     )
     policy_rng = random.Random(seed)
     action_trace = []
+    checker = InvariantChecker(validation, full_validation_interval)
 
     for _ in range(max_actions):
         if game.game_end:
@@ -235,8 +334,9 @@ def run_game(
 
         action_index = select_progress_action(game, legal_actions, policy_rng)
         action_trace.append(action_index)
+        turn_before, phase_before = game.turn_number, game.turn_phase
         game.apply_ai_action(action_index)
-        validate_game(game)
+        checker.after_action(game, turn_before, phase_before)
 
     raise GameRunError(
         f"Game did not finish within {max_actions} actions "
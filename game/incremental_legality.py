@@ -0,0 +1,207 @@
+"""Incremental trading-post legality between consecutive engine decisions.
+
+``mask_post_action`` walks every post on every route for each query, and an
+ordinary self-play decision asks for it at least twice. Between two decisions
+``execute_action`` usually touches one or two routes, so the engine keeps each
+route's slice of the post mask with the occupancy signature it was built from
+and re-evaluates only the routes whose signature changed. Slices are kept per
+player, so a player returning to the board only pays for the routes the
+opponents touched in between. Displacement slots
+depend on the surrounding board, so they are refreshed on every route whenever
+any occupancy or supply changed. A change to the current player's thresholds
+falls back to a full recompute, and every staged workflow is delegated to
+``mask_post_action`` unchanged.
+"""
+
+from dataclasses import dataclass
+from operator import attrgetter
+from weakref import WeakKeyDictionary
+
+from game.action_legality import (
+    _has_pending_action_choice,
+    can_displace_any_piece,
+    mask_post_action,
+    ordinary_post_slots,
+)
+from game.invariants import GameInvariantError
+from map_data.constants import MAX_POSTS
+
+VERIFY_INCREMENTAL_LEGALITY = False
+
+_ENGINES = WeakKeyDictionary()
+
+
+def _workflow_key(game):
+    return (
+        game.waiting_for_displaced_player,
+        game.waiting_for_bm_move_any_2,
+        game.waiting_for_bm_move3,
+        game.waiting_for_place2_from_route,
+        game.waiting_for_place2_in_scotland_or_wales,
+        game.waiting_for_bm_tribute_trading_post,
+        game.waiting_for_bm_block_trade_route,
+    )
+
+
+def _is_ordinary_post_turn(game):
+    player = game.current_player
+    return (
+        not any(_workflow_key(game))
+        and player.actions_remaining > 0
+        and not player.holding_pieces
+        and not _has_pending_action_choice(game)
+    )
+
+
+def _counter_key(game, block_cost_limit):
+    """Return the current-player thresholds every ordinary post slot tests.
+
+    Supply only matters through the zero checks, the displacement costs and the
+    block-marker surcharge, so counts above those thresholds share one key.
+    """
+    current = game.current_player
+    total_supply = current.personal_supply_squares + current.personal_supply_circles
+    return (
+        game.players.index(current),
+        current.personal_supply_squares > 0,
+        current.personal_supply_circles > 0,
+        min(total_supply, max(3, block_cost_limit + 1)),
+        current.brown_priv_count > 0,
+        current.blue_priv_count > 0,
+        current.london_priv_count > 0,
+    )
+
+
+def _displacement_key(game):
+    """Return the supplies and abilities a displacement search reads."""
+    return (
+        game.players.index(game.DisplaceAnywhereOwner)
+        if game.DisplaceAnywhereOwner in game.players
+        else None,
+        tuple(
+            (
+                player.general_stock_squares,
+                player.general_stock_circles,
+                player.personal_supply_squares,
+                player.personal_supply_circles,
+            )
+            for player in game.players
+        ),
+    )
+
+
+_POST_STATE = attrgetter("owner", "owner_piece_shape", "required_shape")
+
+
+def _route_key(route):
+    return tuple(map(_POST_STATE, route.posts)), len(route.block_marker_owners)
+
+
+@dataclass
+class _PlayerSlices:
+    counters: tuple
+    displacement: tuple
+    route_keys: list
+    slices: list
+
+
+class PostLegalityEngine:
+    """Cache of per-route post-mask slices for one game, kept per player."""
+
+    def __init__(self, game, *, verify=None):
+        self.verify = VERIFY_INCREMENTAL_LEGALITY if verify is None else verify
+        self._routes = tuple(game.selected_map.routes)
+        offsets = []
+        offset = 0
+        for route in self._routes:
+            offsets.append(offset)
+            offset += len(route.posts)
+        self._offsets = tuple(offsets)
+        self._players = {}
+        self.full_recomputes = 0
+        self.routes_evaluated = 0
+        self.delegated_queries = 0
+
+    def invalidate(self):
+        """Discard every cached slice so the next query recomputes fully."""
+        self._players.clear()
+
+    def enabled_slots(self, game):
+        """Return the enabled post-mask indices for the current decision, in mask order."""
+        if not _is_ordinary_post_turn(game):
+            self.delegated_queries += 1
+            return [index for index, enabled in enumerate(mask_post_action(game)) if enabled]
+
+        route_keys = [_route_key(route) for route in self._routes]
+        counters = _counter_key(game, max(key[1] for key in route_keys))
+        displacement = _displacement_key(game)
+        can_displace = can_displace_any_piece(game.current_player)
+        cached = self._players.get(counters[0])
+        if cached is None or cached.counters != counters:
+            self.full_recomputes += 1
+            cached = _PlayerSlices(
+                counters,
+                displacement,
+                route_keys,
+                [
+                    self._evaluate_route(game, index, can_displace)
+                    for index in range(len(route_keys))
+                ],
+            )
+            self._players[counters[0]] = cached
+        else:
+            dirty = {
+                index for index, key in enumerate(route_keys) if key != cached.route_keys[index]
+            }
+            for index in dirty:
+                cached.slices[index] = self._evaluate_route(game, index, can_displace)
+            if dirty or displacement != cached.displacement:
+                for index in range(len(route_keys)):
+                    if index not in dirty:
+                        self._refresh_displacements(game, cached.slices[index], index, can_displace)
+            cached.displacement = displacement
+            cached.route_keys = route_keys
+
+        traders = []
+        merchants = []
+        for offset, route_slice in zip(self._offsets, cached.slices):
+            for local, (trader, merchant) in enumerate(route_slice):
+                if trader:
+                    traders.append(offset + local)
+                if merchant:
+                    merchants.append(MAX_POSTS + offset + local)
+        enabled = traders + merchants
+
+        if self.verify:
+            expected = [index for index, flag in enumerate(mask_post_action(game)) if flag]
+            if enabled != expected:
+                changed = sorted(set(enabled).symmetric_difference(expected))
+                raise GameInvariantError(
+                    f"Incremental post legality diverged at slots {changed[:8]}"
+                )
+        return enabled
+
+    def _evaluate_route(self, game, index, can_displace):
+        self.routes_evaluated += 1
+        route = self._routes[index]
+        return [ordinary_post_slots(game, route, post, can_displace) for post in route.posts]
+
+    def _refresh_displacements(self, game, route_slice, index, can_displace):
+        route = self._routes[index]
+        for local, post in enumerate(route.posts):
+            if post.is_owned() and post.owner != game.current_player:
+                route_slice[local] = ordinary_post_slots(game, route, post, can_displace)
+
+
+def post_legality_engine(game):
+    """Return the incremental post-legality engine attached to ``game``."""
+    engine = _ENGINES.get(game)
+    if engine is None:
+        engine = PostLegalityEngine(game)
+        _ENGINES[game] = engine
+    return engine
+
+
+def incremental_post_slots(game):
+    """Return the enabled ``mask_post_action`` indices using cached route slices."""
+    return post_legality_engine(game).enabled_slots(game)
@@ -1,14 +1,40 @@
+"""Engine invariants, checked at one of three levels.
+
+``validate_game`` recounts every piece on the board and proves that each
+player's traders and merchants are conserved. ``validate_counters`` checks only
+what the engine already keeps as running counters on the game and its players,
+so its cost grows with the number of players rather than the size of the map.
+``InvariantChecker`` chooses between them after each action: always the full
+recount, never, or at the same interval and turn boundaries self-play training
+uses.
+"""
+
+from enum import Enum
+
+from game.board_occupancy import CIRCLE, SQUARE, BoardOccupancy
+from game.turn_state import TurnPhase
+
+TRADERS_PER_PLAYER = 27
+MERCHANTS_PER_PLAYER = 4
+
+
 class GameInvariantError(AssertionError):
     """Raised when the mutable game graph enters an internally inconsistent state."""
 
 
+class ValidationLevel(str, Enum):
+    COUNTERS = "counters"
+    SAMPLED = "sampled"
+    FULL = "full"
+
+
 def _require(condition, message):
     if not condition:
         raise GameInvariantError(message)
 
 
-def validate_game(game):
-    """Validate inexpensive invariants that must hold after every complete action."""
+def validate_counters(game):
+    """Validate the invariants that need no board scan."""
     _require(3 <= len(game.players) <= 5, "game must contain between 3 and 5 players")
     _require(
         0 <= game.current_player_index < len(game.players),
@@ -27,6 +53,7 @@ def validate_game(game):
     # Accessing turn_phase also rejects contradictory pending workflows.
     game.turn_phase
 
+    known_players = set(game.players)
     for player in game.players:
         counts = {
             "actions_remaining": player.actions_remaining,
@@ -39,27 +66,59 @@ def validate_game(game):
         }
         for name, value in counts.items():
             _require(value >= 0, f"player {player.order} has negative {name}: {value}")
-
-        board_squares = sum(
-            post.owner is player and post.owner_piece_shape == "square"
-            for route in game.selected_map.routes
-            for post in route.posts
+        off_board_traders = (
+            player.general_stock_squares
+            + player.personal_supply_squares
+            + player.locked_ability_traders
+            + 1  # score-track marker
         )
-        board_circles = sum(
-            post.owner is player and post.owner_piece_shape == "circle"
-            for route in game.selected_map.routes
-            for post in route.posts
+        off_board_merchants = (
+            player.general_stock_circles
+            + player.personal_supply_circles
+            + player.locked_ability_merchants
         )
-        office_squares = sum(
-            office.controller is player and (office.owner_piece_shape or office.shape) == "square"
-            for city in game.selected_map.cities
-            for office in city.offices
+        _require(
+            off_board_traders <= TRADERS_PER_PLAYER,
+            f"player {player.order} holds too many traders: {off_board_traders}",
+        )
+        _require(
+            off_board_merchants <= MERCHANTS_PER_PLAYER,
+            f"player {player.order} holds too many merchants: {off_board_merchants}",
+        )
+
+    if game.waiting_for_displaced_player:
+        _require(game.displaced_player.player in known_players, "missing displaced player")
+        _require(
+            game.displaced_player.displaced_shape in ("square", "circle"),
+            "invalid displaced piece shape",
         )
-        office_circles = sum(
-            office.controller is player and (office.owner_piece_shape or office.shape) == "circle"
-            for city in game.selected_map.cities
-            for office in city.offices
+        _require(
+            game.original_route_of_displacement is not None,
+            "displacement is missing its original route",
         )
+    else:
+        _require(game.displaced_player.player is None, "stale displaced player state")
+
+    if game.game_end:
+        for player in game.players:
+            _require(player.final_score >= player.score, "terminal final score is below score")
+
+    return True
+
+
+def validate_game(game):
+    """Validate every invariant that must hold after a complete action, recounting the board."""
+    validate_counters(game)
+    board = BoardOccupancy(game)
+    post_squares = board.post_counts(SQUARE)
+    post_circles = board.post_counts(CIRCLE)
+    office_squares_by_player = board.office_counts(SQUARE)
+    office_circles_by_player = board.office_counts(CIRCLE)
+    for player_index, player in enumerate(game.players):
+        board_squares = int(post_squares[player_index])
+        board_circles = int(post_circles[player_index])
+        office_squares = int(office_squares_by_player[player_index])
+        office_circles = int(office_circles_by_player[player_index])
         held_pieces = (piece for holder in game.players for piece in holder.holding_pieces)
         held_squares = sum(
             shape == "square" and owner is player for shape, owner, _region in held_pieces
@@ -113,48 +172,64 @@ def validate_game(game):
             + displaced_circle
         )
         _require(
-            trader_total == 27,
+            trader_total == TRADERS_PER_PLAYER,
             f"player {player.order} trader conservation failed: {trader_total}",
         )
         _require(
-            merchant_total == 4,
+            merchant_total == MERCHANTS_PER_PLAYER,
             f"player {player.order} merchant conservation failed: {merchant_total}",
         )
 
-    known_players = set(game.players)
-    for route in game.selected_map.routes:
-        for post in route.posts:
-            _require(
-                (post.owner is None) == (post.owner_piece_shape is None),
-                "post owner and owner_piece_shape disagree",
-            )
-            _require(
-                post.owner is None or post.owner in known_players,
-                "post owner is not a player in this game",
-            )
-
-    for city in game.selected_map.cities:
-        for office in city.offices:
-            _require(
-                office.controller is None or office.controller in known_players,
-                f"office in {city.name} has an unknown controller",
-            )
-
-    if game.waiting_for_displaced_player:
-        _require(game.displaced_player.player in known_players, "missing displaced player")
-        _require(
-            game.displaced_player.displaced_shape in ("square", "circle"),
-            "invalid displaced piece shape",
-        )
-        _require(
-            game.original_route_of_displacement is not None,
-            "displacement is missing its original route",
+    inconsistent_post = board.first_inconsistent_post()
+    if inconsistent_post is not None:
+        _slot, reason = inconsistent_post
+        raise GameInvariantError(
+            "post owner and owner_piece_shape disagree"
+            if reason == "disagree"
+            else "post owner is not a player in this game"
         )
-    else:
-        _require(game.displaced_player.player is None, "stale displaced player state")
 
-    if game.game_end:
-        for player in game.players:
-            _require(player.final_score >= player.score, "terminal final score is below score")
+    unknown_office_city = board.first_unknown_office_city()
+    if unknown_office_city is not None:
+        city = game.selected_map.cities[unknown_office_city]
+        raise GameInvariantError(f"office in {city.name} has an unknown controller")
 
     return True
+
+
+def should_fully_validate(action_count, interval, turn_before, phase_before, game):
+    """Validate periodically and whenever a turn or staged workflow completes."""
+    return (
+        action_count % interval == 0
+        or game.turn_number != turn_before
+        or (phase_before is not TurnPhase.ACTIONS and game.turn_phase is TurnPhase.ACTIONS)
+        or game.game_end
+    )
+
+
+class InvariantChecker:
+    """Validate a game after each action at one ``ValidationLevel``.
+
+    ``FULL`` recounts the board after every action and ``COUNTERS`` never does.
+    ``SAMPLED`` checks the counters after every action and recounts the board
+    every ``interval`` actions, at turn and workflow boundaries and at game end.
+    """
+
+    def __init__(self, level=ValidationLevel.FULL, interval=50):
+        if interval < 1:
+            raise ValueError("full validation interval must be positive")
+        self.level = ValidationLevel(level)
+        self.interval = interval
+        self.actions = 0
+        self.full_validations = 0
+
+    def after_action(self, game, turn_before, phase_before):
+        """Validate ``game`` after the action that started in ``turn_before``/``phase_before``."""
+        self.actions += 1
+        if self.level is ValidationLevel.FULL or (
+            self.level is ValidationLevel.SAMPLED
+            and should_fully_validate(self.actions, self.interval, turn_before, phase_before, game)
+        ):
+            self.full_validations += 1
+            return validate_game(game)
+        return validate_counters(game)
@@ -1,5 +1,9 @@
 """Structured legal interactions backed by the existing rules predicates."""
 
+from dataclasses import dataclass
+from weakref import WeakKeyDictionary
+
+from game.action_codec import DEFAULT_ACTION_CODEC
 from game.action_legality import (
     mask_bm,
     mask_bm_city_actions,
@@ -9,7 +13,6 @@ from game.action_legality import (
     mask_end_turn,
     mask_income_actions,
     mask_place_adjacent,
-    mask_post_action,
     mask_replace_bm,
 )
 from game.action_schema import (
@@ -20,6 +23,7 @@ from game.action_schema import (
     city_pair_catalogue,
     green_city_catalogue,
 )
+from game.incremental_legality import incremental_post_slots
 from game.structured_actions import (
     AbilityInteraction,
     BonusMarkerInteraction,
@@ -41,10 +45,16 @@ def _enabled(mask):
     return (index for index, enabled in enumerate(mask) if enabled)
 
 
+_POST_INTERACTIONS = tuple(
+    PostInteraction(
+        local % MAX_POSTS, PieceShape.MERCHANT if local >= MAX_POSTS else PieceShape.TRADER
+    )
+    for local in range(MAX_POSTS * 2)
+)
+
+
 def _post_actions(game):
-    for local in _enabled(mask_post_action(game)):
-        shape = PieceShape.MERCHANT if local >= MAX_POSTS else PieceShape.TRADER
-        yield PostInteraction(local % MAX_POSTS, shape)
+    return (_POST_INTERACTIONS[local] for local in incremental_post_slots(game))
 
 
 def _route_actions(game):
@@ -196,3 +206,50 @@ def get_legal_actions(game):
     if len(unique) != len(actions):
         raise RuntimeError("Legal interaction generation produced a duplicate")
     return unique
+
+
+@dataclass(frozen=True)
+class LegalActionSet:
+    """Legal interactions, AI mask and index set derived for one state version."""
+
+    state_version: int
+    actions: tuple
+    mask: tuple
+    indices: tuple
+    action_set: frozenset
+
+
+_LEGAL_ACTION_SETS = WeakKeyDictionary()
+
+
+def legal_action_set(game):
+    """Return the legal interactions for ``game``, derived once per state version."""
+    version = getattr(game, "state_version", 0)
+    cached = _LEGAL_ACTION_SETS.get(game)
+    if cached is not None and cached.state_version == version:
+        return cached
+    actions = tuple(get_legal_actions(game))
+    mask = DEFAULT_ACTION_CODEC.create_mask(actions)
+    cached = LegalActionSet(
+        version,
+        actions,
+        mask,
+        tuple(index for index, enabled in enumerate(mask) if enabled),
+        frozenset(actions),
+    )
+    _LEGAL_ACTION_SETS[game] = cached
+    return cached
+
+
+def cached_legal_action_set(game):
+    """Return the legal interactions already derived for the current state, or ``None``."""
+    cached = _LEGAL_ACTION_SETS.get(game)
+    if cached is not None and cached.state_version == getattr(game, "state_version", 0):
+        return cached
+    return None
+
+
+def adopt_legal_action_set(game, legal):
+    """Attach legal interactions derived for an identical copy of ``game``."""
+    if legal is not None and legal.state_version == getattr(game, "state_version", 0):
+        _LEGAL_ACTION_SETS[game] = legal
@@ -0,0 +1,109 @@
+"""Immutable index of a map's cities, routes, post slots and regions.
+
+Every game of the same map and player count shares the same board layout, but
+each game owns its own ``City`` and ``Route`` objects, so the index holds
+positions into ``selected_map.cities`` and ``selected_map.routes`` rather than
+the objects themselves. The same index therefore serves the original game,
+its clones and games loaded from a save.
+
+``map_topology`` keeps one index per map object. A map seen for the first time
+is matched by its layout against the indexes already built, so a new game pays
+for one pass over its routes instead of a rebuild.
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from weakref import WeakKeyDictionary
+
+_TOPOLOGIES_BY_LAYOUT = {}
+_TOPOLOGIES_BY_MAP = WeakKeyDictionary()
+
+
+@dataclass(frozen=True)
+class MapTopology:
+    """City adjacency, route endpoints and post slots of one map layout."""
+
+    city_names: tuple
+    city_index: MappingProxyType
+    neighbours: tuple
+    route_cities: tuple
+    route_between: MappingProxyType
+    route_post_slots: tuple
+    post_route: tuple
+    region_cities: MappingProxyType
+    east_west: tuple | None
+
+    @classmethod
+    def build(cls, game_map):
+        city_names = tuple(city.name for city in game_map.cities)
+        city_index = {name: index for index, name in enumerate(city_names)}
+        if len(city_index) != len(city_names):
+            raise ValueError("map city names must be unique")
+
+        neighbours = [[] for _ in city_names]
+        route_cities = []
+        route_between = {}
+        route_post_slots = []
+        post_route = []
+        region_cities = {}
+        for route_index, route in enumerate(game_map.routes):
+            first, second = (city_index[city.name] for city in route.cities)
+            route_cities.append((first, second))
+            route_between.setdefault(frozenset((first, second)), route_index)
+            if second not in neighbours[first]:
+                neighbours[first].append(second)
+            if first not in neighbours[second]:
+                neighbours[second].append(first)
+            route_post_slots.append(range(len(post_route), len(post_route) + len(route.posts)))
+            post_route.extend([route_index] * len(route.posts))
+            if route.region is not None:
+                region_cities.setdefault(route.region, set()).update((first, second))
+
+        endpoints = getattr(game_map, "east_west_cities", None)
+        east_west = None
+        if endpoints and all(name in city_index for name in endpoints):
+            east_west = tuple(city_index[name] for name in endpoints)
+        return cls(
+            city_names=city_names,
+            city_index=MappingProxyType(city_index),
+            neighbours=tuple(tuple(adjacent) for adjacent in neighbours),
+            route_cities=tuple(route_cities),
+            route_between=MappingProxyType(route_between),
+            route_post_slots=tuple(route_post_slots),
+            post_route=tuple(post_route),
+            region_cities=MappingProxyType(
+                {region: frozenset(cities) for region, cities in region_cities.items()}
+            ),
+            east_west=east_west,
+        )
+
+    def region_city_indices(self, region, shared=()):
+        """Return the cities of ``region`` in map order, plus any ``shared`` city names."""
+        members = set(self.region_cities.get(region, ()))
+        members.update(self.city_index[name] for name in shared if name in self.city_index)
+        return sorted(members)
+
+
+def _layout(game_map):
+    return (
+        type(game_map),
+        tuple(city.name for city in game_map.cities),
+        tuple(
+            (route.cities[0].name, route.cities[1].name, len(route.posts), route.region)
+            for route in game_map.routes
+        ),
+        tuple(getattr(game_map, "east_west_cities", None) or ()),
+    )
+
+
+def map_topology(game_map):
+    """Return the shared topology index of ``game_map``."""
+    topology = _TOPOLOGIES_BY_MAP.get(game_map)
+    if topology is None:
+        layout = _layout(game_map)
+        topology = _TOPOLOGIES_BY_LAYOUT.get(layout)
+        if topology is None:
+            topology = MapTopology.build(game_map)
+            _TOPOLOGIES_BY_LAYOUT[layout] = topology
+        _TOPOLOGIES_BY_MAP[game_map] = topology
+    return topology
@@ -0,0 +1,81 @@
+"""Connected office networks of one player, as a union-find over the map topology.
+
+East-West scoring, the largest-network bonus and the self-play route heuristics
+all ask how a player's offices are linked. ``OfficeNetwork`` answers those
+questions from one pass over the offices and one union per route: afterwards
+"are these cities connected?", "how many offices are in the largest network?"
+and "would an office in this city connect them?" only look at a city's
+neighbours.
+
+Offices change hands through swaps and displacement as well as claims, and
+scenario generators and tests assign controllers directly, so a network is
+built from the current offices when it is needed rather than kept up to date
+by the claim handlers; union-find cannot undo a union when an office is
+vacated. Build one network and reuse it for every question about the same
+position.
+"""
+
+from game.map_topology import map_topology
+
+
+class OfficeNetwork:
+    """Union-find of the cities where one player holds an office."""
+
+    def __init__(self, game, player):
+        self.topology = map_topology(game.selected_map)
+        self.offices = {}
+        for index, city in enumerate(game.selected_map.cities):
+            offices = [office.controller for office in city.offices].count(player)
+            if offices:
+                self.offices[index] = offices
+        self._parent = {index: index for index in self.offices}
+        for first, second in self.topology.route_cities:
+            if first in self._parent and second in self._parent:
+                self._union(first, second)
+        self.network_offices = {}
+        for index, offices in self.offices.items():
+            root = self.root(index)
+            self.network_offices[root] = self.network_offices.get(root, 0) + offices
+
+    def _union(self, first, second):
+        first, second = self.root(first), self.root(second)
+        if first != second:
+            self._parent[max(first, second)] = min(first, second)
+
+    def root(self, city):
+        """Return the representative city of ``city``'s network, or ``None`` without an office."""
+        parent = self._parent
+        if city not in parent:
+            return None
+        while parent[city] != city:
+            parent[city] = parent[parent[city]]
+            city = parent[city]
+        return city
+
+    def connected(self, first, second):
+        """Return whether the player's offices link the two city indices."""
+        root = self.root(first)
+        return root is not None and root == self.root(second)
+
+    def largest(self):
+        """Return the office count of the player's largest connected network."""
+        return max(self.network_offices.values(), default=0)
+
+    def connects_with(self, first, second, city):
+        """Return whether the two cities are linked once the player has an office in ``city``."""
+        if self.connected(first, second):
+            return True
+        merged = {self.root(adjacent) for adjacent in self.topology.neighbours[city]}
+        merged.add(self.root(city))
+        merged.discard(None)
+        return all(end == city or self.root(end) in merged for end in (first, second))
+
+    def east_west_connected(self):
+        """Return whether the player's offices link the map's East-West cities."""
+        return self.topology.east_west is not None and self.connected(*self.topology.east_west)
+
+    def would_connect_east_west(self, city):
+        """Return whether an office in ``city`` would link the East-West cities."""
+        return self.topology.east_west is not None and self.connects_with(
+            *self.topology.east_west, city
+        )
@@ -1,4 +1,16 @@
-"""Versioned, exact snapshots for trusted local Hansa save files."""
+"""Versioned, exact snapshots for trusted local Hansa save files.
+
+Saves are written either as a JSON document with a base64 payload or, with
+``compact=True``, as a binary container: an eight-byte magic, a little-endian
+header length, the same metadata as compact JSON, then the raw pickle payload.
+``load_game`` recognises both. Binary saves are memory-mapped, so the payload
+is hashed and unpickled straight from the mapped file.
+
+Every payload hash that passed :func:`validate_loaded_game` in this process is
+remembered. ``load_game(..., trusted=True)`` skips the revalidation when the
+file's hash is one of them, which is the common case for training states that
+are saved once and loaded for every retry and evaluation batch.
+"""
 
 from __future__ import annotations
 
@@ -8,9 +20,11 @@ from datetime import datetime, timezone
 from enum import Enum
 import hashlib
 import json
+import mmap
 import os
 from pathlib import Path
 import pickle
+import struct
 import tempfile
 
 from game.action_schema import action_schema_metadata, validate_action_schema_metadata
@@ -21,6 +35,10 @@ from game.loaded_state_validation import validate_loaded_game
 SAVE_FORMAT = "hansa-exact-game"
 SAVE_FORMAT_VERSION = 1
 SAVE_EXTENSION = ".hansa"
+BINARY_SAVE_MAGIC = b"HANSABIN"
+_BINARY_HEADER = struct.Struct("<8sI")
+
+_VALIDATED_PAYLOADS = set()
 
 
 class SaveGameError(ValueError):
@@ -86,6 +104,102 @@ def _deserialize_snapshot(payload: bytes):
     return _GameSaveUnpickler(io.BytesIO(payload)).load()
 
 
+def _validate_metadata(metadata) -> None:
+    if not isinstance(metadata, dict):
+        raise SaveGameError("Saved game metadata must be a JSON object")
+    if metadata.get("save_format") != SAVE_FORMAT:
+        raise SaveGameError("This is not a Hansa exact-game save file")
+    if metadata.get("save_format_version") != SAVE_FORMAT_VERSION:
+        raise SaveGameError(
+            "Saved game uses an incompatible save format: "
+            f"{metadata.get('save_format_version')!r}; expected {SAVE_FORMAT_VERSION}"
+        )
+    try:
+        validate_action_schema_metadata(metadata, "Saved game")
+    except ValueError as error:
+        raise SaveGameError(str(error)) from error
+
+
+def _check_payload_hash(metadata, payload) -> str:
+    actual_hash = hashlib.sha256(payload).hexdigest()
+    if actual_hash != metadata.get("payload_sha256"):
+        raise SaveGameError("Saved game is damaged or has been modified")
+    return actual_hash
+
+
+def _restore_payload(read):
+    try:
+        return read()
+    except Exception as error:
+        raise SaveGameError(f"Could not restore saved game: {error}") from error
+
+
+def _read_json_save(text: str):
+    try:
+        document = json.loads(text)
+    except (json.JSONDecodeError, KeyError, TypeError) as error:
+        raise SaveGameError(f"Could not read saved game: {error}") from error
+    if not isinstance(document, dict):
+        raise SaveGameError("Saved game must contain a JSON object")
+    metadata = document.get("metadata")
+    encoded_payload = document.get("payload")
+    _validate_metadata(metadata)
+    if not isinstance(encoded_payload, str):
+        raise SaveGameError("Saved game payload must be text")
+
+    try:
+        payload = base64.b64decode(encoded_payload, validate=True)
+    except (ValueError, TypeError) as error:
+        raise SaveGameError("Saved game payload is not valid") from error
+    payload_hash = _check_payload_hash(metadata, payload)
+    return metadata, payload_hash, _restore_payload(lambda: _deserialize_snapshot(payload))
+
+
+def _read_binary_save(file):
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if len(mapped) < _BINARY_HEADER.size:
+            raise SaveGameError("Saved game header is truncated")
+        _magic, header_size = _BINARY_HEADER.unpack_from(mapped)
+        payload_start = _BINARY_HEADER.size + header_size
+        if payload_start > len(mapped):
+            raise SaveGameError("Saved game header is truncated")
+        try:
+            metadata = json.loads(mapped[_BINARY_HEADER.size : payload_start])
+        except (UnicodeError, json.JSONDecodeError) as error:
+            raise SaveGameError(f"Could not read saved game: {error}") from error
+        _validate_metadata(metadata)
+        with memoryview(mapped) as view, view[payload_start:] as payload:
+            payload_hash = _check_payload_hash(metadata, payload)
+        mapped.seek(payload_start)
+        return metadata, payload_hash, _restore_payload(_GameSaveUnpickler(mapped).load)
+
+
+def write_atomically(target: Path, chunks, *, binary: bool) -> None:
+    """Write ``chunks`` to a temporary file beside ``target``, then replace ``target``.
+
+    Readers see either the previous file or the complete new one, never a
+    partial write.
+    """
+    temporary_name = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "wb" if binary else "w",
+            encoding=None if binary else "utf-8",
+            dir=target.parent,
+            prefix=f".{target.name}.",
+            suffix=".tmp",
+            delete=False,
+        ) as temporary:
+            temporary_name = Path(temporary.name)
+            for chunk in chunks:
+                temporary.write(chunk)
+            temporary.flush()
+        temporary_name.replace(target)
+    finally:
+        if temporary_name is not None and temporary_name.exists():
+            temporary_name.unlink()
+
+
 def _restore_office_printed_privileges(game: Game) -> None:
     """Backfill immutable printed office data absent from older exact saves."""
     if all(
@@ -154,8 +268,12 @@ def save_game(
     filename: str | Path,
     *,
     controller_rng_state=None,
+    compact: bool = False,
 ) -> Path:
-    """Atomically save the complete engine object to a trusted local file."""
+    """Atomically save the complete engine object to a trusted local file.
+
+    ``compact`` writes the binary container instead of the JSON document.
+    """
     try:
         validate_loaded_game(game)
     except Exception as error:
@@ -170,85 +288,53 @@ def save_game(
     except (pickle.PickleError, TypeError, AttributeError) as error:
         raise SaveGameError(f"Could not serialize game state: {error}") from error
     payload_hash = hashlib.sha256(payload).hexdigest()
-    document = {
-        "metadata": _metadata(game, payload_hash),
-        "payload": base64.b64encode(payload).decode("ascii"),
-    }
-
-    temporary_name = None
-    try:
-        with tempfile.NamedTemporaryFile(
-            "w",
-            encoding="utf-8",
-            dir=target.parent,
-            prefix=f".{target.name}.",
-            suffix=".tmp",
-            delete=False,
-        ) as temporary:
-            temporary_name = Path(temporary.name)
-            json.dump(document, temporary, indent=2)
-            temporary.flush()
-        temporary_name.replace(target)
-    finally:
-        if temporary_name is not None and temporary_name.exists():
-            temporary_name.unlink()
+    metadata = _metadata(game, payload_hash)
+    if compact:
+        header = json.dumps(metadata, separators=(",", ":")).encode("utf-8")
+        chunks = (_BINARY_HEADER.pack(BINARY_SAVE_MAGIC, len(header)), header, payload)
+    else:
+        document = {
+            "metadata": metadata,
+            "payload": base64.b64encode(payload).decode("ascii"),
+        }
+        chunks = (json.dumps(document, indent=2),)
+    write_atomically(target, chunks, binary=compact)
+    _VALIDATED_PAYLOADS.add(payload_hash)
     return target
 
 
-def load_game(filename: str | Path) -> Game:
+def load_game(filename: str | Path, *, trusted: bool = False) -> Game:
     """Load an exact game snapshot created by :func:`save_game`.
 
     Save files contain Python object data and must only be opened when they
-    were created locally or came from a trusted source.
+    were created locally or came from a trusted source. With ``trusted`` the
+    thorough state validation is skipped when the payload hash already passed
+    it in this process; the hash itself is always checked.
     """
     source = Path(filename)
     try:
-        document = json.loads(source.read_text(encoding="utf-8"))
-    except (OSError, UnicodeError, json.JSONDecodeError, KeyError, TypeError) as error:
+        with source.open("rb") as file:
+            if file.read(len(BINARY_SAVE_MAGIC)) == BINARY_SAVE_MAGIC:
+                metadata, payload_hash, restored = _read_binary_save(file)
+            else:
+                file.seek(0)
+                metadata, payload_hash, restored = _read_json_save(file.read().decode("utf-8"))
+    except SaveGameError:
+        raise
+    except (OSError, UnicodeError, ValueError) as error:
         raise SaveGameError(f"Could not read saved game: {error}") from error
-    if not isinstance(document, dict):
-        raise SaveGameError("Saved game must contain a JSON object")
-    metadata = document.get("metadata")
-    encoded_payload = document.get("payload")
-    if not isinstance(metadata, dict):
-        raise SaveGameError("Saved game metadata must be a JSON object")
-    if not isinstance(encoded_payload, str):
-        raise SaveGameError("Saved game payload must be text")
-
-    if metadata.get("save_format") != SAVE_FORMAT:
-        raise SaveGameError("This is not a Hansa exact-game save file")
-    if metadata.get("save_format_version") != SAVE_FORMAT_VERSION:
-        raise SaveGameError(
-            "Saved game uses an incompatible save format: "
-            f"{metadata.get('save_format_version')!r}; expected {SAVE_FORMAT_VERSION}"
-        )
-    try:
-        validate_action_schema_metadata(metadata, "Saved game")
-    except ValueError as error:
-        raise SaveGameError(str(error)) from error
-
-    try:
-        payload = base64.b64decode(encoded_payload, validate=True)
-    except (ValueError, TypeError) as error:
-        raise SaveGameError("Saved game payload is not valid") from error
-    actual_hash = hashlib.sha256(payload).hexdigest()
-    if actual_hash != metadata.get("payload_sha256"):
-        raise SaveGameError("Saved game is damaged or has been modified")
-
-    try:
-        restored = _deserialize_snapshot(payload)
-    except Exception as error:
-        raise SaveGameError(f"Could not restore saved game: {error}") from error
     if not isinstance(restored, dict) or not isinstance(restored.get("game"), Game):
         raise SaveGameError("Saved payload does not contain a Hansa game")
     game = restored["game"]
     _remove_legacy_player_state(game)
     _restore_office_printed_privileges(game)
     game._saved_controller_rng_state = restored.get("controller_rng_state")
-    try:
-        validate_loaded_game(game)
-    except Exception as error:
-        raise SaveGameError(f"Saved game contains invalid engine state: {error}") from error
+    if not (trusted and payload_hash in _VALIDATED_PAYLOADS):
+        try:
+            validate_loaded_game(game)
+        except Exception as error:
+            raise SaveGameError(f"Saved game contains invalid engine state: {error}") from error
+        _VALIDATED_PAYLOADS.add(payload_hash)
 
     expected = {
         "map_num": game.map_num,
@@ -0,0 +1,222 @@
+"""Single-file archive of many replays stored as packed action-index columns.
+
+``save_replay`` writes one JSON document per game, which is convenient for a
+single game but slow to scan when re-simulating or building datasets from
+thousands of them. An archive holds every trace back to back in one ``uint16``
+column (the action space has 768 entries), an ``offsets`` column marking where
+each game starts, and one column per ``ReplayRecord`` metadata field.
+
+The file is an eight-byte magic, a little-endian header length, a compact JSON
+header with the action-schema identity and the byte range of every column,
+then the columns themselves, each aligned to eight bytes. ``ReplayArchive``
+memory-maps the file, so opening it reads only the header, ``archive[i]``
+touches only game ``i``'s actions, and iteration streams the games in order.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import struct
+
+import numpy as np
+
+from game.action_schema import (
+    ACTION_SPACE_SIZE,
+    action_schema_metadata,
+    validate_action_schema_metadata,
+)
+from game.game_runner import ReplayRecord
+from game.persistence import write_atomically
+
+
+ARCHIVE_FORMAT = "hansa-replay-archive"
+ARCHIVE_FORMAT_VERSION = 1
+ARCHIVE_MAGIC = b"HANSARPA"
+_ARCHIVE_HEADER = struct.Struct("<8sI")
+_ALIGNMENT = 8
+
+ACTION_DTYPE = np.dtype("<u2")
+METADATA_COLUMNS = {
+    "map_num": np.dtype("<u1"),
+    "num_players": np.dtype("<u1"),
+    "seed": np.dtype("<i8"),
+}
+_OFFSET_DTYPE = np.dtype("<u8")
+
+
+class ReplayArchiveError(ValueError):
+    """Raised when a replay archive is invalid or incompatible."""
+
+
+def _column(values, dtype, name):
+    try:
+        column = np.asarray(values, dtype=np.int64)
+    except (TypeError, ValueError, OverflowError) as error:
+        raise ReplayArchiveError(f"Replay {name} values must be integers: {error}") from error
+    limits = np.iinfo(dtype)
+    if column.size and (column.min() < limits.min or column.max() > limits.max):
+        raise ReplayArchiveError(f"Replay {name} values do not fit in {dtype.name}")
+    return column.astype(dtype)
+
+
+def write_replay_archive(records, filename) -> Path:
+    """Atomically write ``records`` to one archive file and return its path."""
+    records = tuple(records)
+    lengths = [len(record.action_trace) for record in records]
+    offsets = np.zeros(len(records) + 1, dtype=_OFFSET_DTYPE)
+    np.cumsum(lengths, out=offsets[1:])
+    actions = np.fromiter(
+        (index for record in records for index in record.action_trace),
+        dtype=np.int64,
+        count=int(offsets[-1]),
+    )
+    if actions.size and (actions.min() < 0 or actions.max() >= ACTION_SPACE_SIZE):
+        raise ReplayArchiveError(f"Replay action indices must be below {ACTION_SPACE_SIZE}")
+    columns = {"offsets": offsets, "actions": actions.astype(ACTION_DTYPE)}
+    for name, dtype in METADATA_COLUMNS.items():
+        columns[name] = _column([getattr(record, name) for record in records], dtype, name)
+
+    layout = {}
+    position = 0
+    for name, column in columns.items():
+        layout[name] = {"dtype": column.dtype.str, "offset": position, "count": len(column)}
+        position += -(-column.nbytes // _ALIGNMENT) * _ALIGNMENT
+    header = json.dumps(
+        {
+            "archive_format": ARCHIVE_FORMAT,
+            "archive_format_version": ARCHIVE_FORMAT_VERSION,
+            **action_schema_metadata(),
+            "game_count": len(records),
+            "columns": layout,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    header += b" " * (-(_ARCHIVE_HEADER.size + len(header)) % _ALIGNMENT)
+
+    def chunks():
+        yield _ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, len(header))
+        yield header
+        for column in columns.values():
+            yield column.tobytes()
+            yield bytes(-column.nbytes % _ALIGNMENT)
+
+    target = Path(filename)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    write_atomically(target, chunks(), binary=True)
+    return target
+
+
+def _read_header(raw):
+    if len(raw) < _ARCHIVE_HEADER.size:
+        raise ReplayArchiveError("Replay archive header is truncated")
+    magic, header_size = _ARCHIVE_HEADER.unpack_from(raw)
+    if magic != ARCHIVE_MAGIC:
+        raise ReplayArchiveError("This is not a Hansa replay archive")
+    data_start = _ARCHIVE_HEADER.size + header_size
+    if data_start > len(raw):
+        raise ReplayArchiveError("Replay archive header is truncated")
+    try:
+        header = json.loads(bytes(raw[_ARCHIVE_HEADER.size : data_start]))
+    except (UnicodeError, json.JSONDecodeError) as error:
+        raise ReplayArchiveError(f"Could not read replay archive: {error}") from error
+    if not isinstance(header, dict) or header.get("archive_format") != ARCHIVE_FORMAT:
+        raise ReplayArchiveError("This is not a Hansa replay archive")
+    if header.get("archive_format_version") != ARCHIVE_FORMAT_VERSION:
+        raise ReplayArchiveError(
+            "Replay archive uses an incompatible format: "
+            f"{header.get('archive_format_version')!r}; expected {ARCHIVE_FORMAT_VERSION}"
+        )
+    try:
+        validate_action_schema_metadata(header, "Replay archive")
+    except ValueError as error:
+        raise ReplayArchiveError(str(error)) from error
+    return header, data_start
+
+
+def _column_view(raw, data_start, name, spec):
+    if spec is None:
+        raise ReplayArchiveError(f"Replay archive is missing the {name} column")
+    try:
+        dtype = np.dtype(spec["dtype"])
+        offset, count = spec["offset"], spec["count"]
+    except (KeyError, TypeError, ValueError) as error:
+        raise ReplayArchiveError(f"Replay archive {name} column is malformed: {error}") from error
+    if not all(isinstance(value, int) and value >= 0 for value in (offset, count)):
+        raise ReplayArchiveError(f"Replay archive {name} column is malformed: {spec!r}")
+    if dtype.kind not in "iu":
+        raise ReplayArchiveError(f"Replay archive {name} column must hold integers")
+    start = data_start + offset
+    stop = start + count * dtype.itemsize
+    if stop > len(raw):
+        raise ReplayArchiveError(f"Replay archive {name} column is truncated")
+    return raw[start:stop].view(dtype)
+
+
+class ReplayArchive:
+    """Read-only, memory-mapped view of an archive written by ``write_replay_archive``.
+
+    ``archive[game_id]`` returns a ``ReplayRecord``; ``actions(game_id)``
+    returns the trace as a ``uint16`` array view without copying. The metadata
+    columns are exposed as ``map_num``, ``num_players`` and ``seed`` arrays.
+    """
+
+    def __init__(self, filename):
+        self.path = Path(filename)
+        try:
+            raw = np.memmap(self.path, dtype=np.uint8, mode="r")
+        except (OSError, ValueError) as error:
+            raise ReplayArchiveError(f"Could not read replay archive: {error}") from error
+        header, data_start = _read_header(raw)
+        self.game_count = header.get("game_count")
+        if not isinstance(self.game_count, int) or self.game_count < 0:
+            raise ReplayArchiveError("Replay archive game count must be a non-negative integer")
+        layout = header.get("columns")
+        if not isinstance(layout, dict):
+            raise ReplayArchiveError("Replay archive header has no column layout")
+        columns = {
+            name: _column_view(raw, data_start, name, layout.get(name))
+            for name in ("offsets", "actions", *METADATA_COLUMNS)
+        }
+        self.offsets = columns["offsets"]
+        self.action_indices = columns["actions"]
+        self.map_num = columns["map_num"]
+        self.num_players = columns["num_players"]
+        self.seed = columns["seed"]
+        if len(self.offsets) != self.game_count + 1 or int(self.offsets[-1]) != len(
+            self.action_indices
+        ):
+            raise ReplayArchiveError("Replay archive offsets do not match its actions")
+
+    def __len__(self):
+        return self.game_count
+
+    def _game_id(self, game_id):
+        game_id = int(game_id)
+        if game_id < 0:
+            game_id += self.game_count
+        if not 0 <= game_id < self.game_count:
+            raise IndexError(f"Replay archive has no game {game_id}")
+        return game_id
+
+    def actions(self, game_id):
+        """Return the action indices of one game as a read-only array view."""
+        game_id = self._game_id(game_id)
+        return self.action_indices[self.offsets[game_id] : self.offsets[game_id + 1]]
+
+    def action_count(self, game_id):
+        game_id = self._game_id(game_id)
+        return int(self.offsets[game_id + 1] - self.offsets[game_id])
+
+    def __getitem__(self, game_id):
+        game_id = self._game_id(game_id)
+        return ReplayRecord(
+            map_num=int(self.map_num[game_id]),
+            num_players=int(self.num_players[game_id]),
+            seed=int(self.seed[game_id]),
+            action_trace=tuple(self.actions(game_id).tolist()),
+        )
+
+    def __iter__(self):
+        for game_id in range(self.game_count):
+            yield self[game_id]
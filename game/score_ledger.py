@@ -0,0 +1,115 @@
+"""Projected end-game scores kept up to date between decisions.
+
+Self-play asks for ``Game.projected_scores`` after every action, and
+``projected_score_breakdown`` recomputes city control, every player's largest
+network and the Britannia ladders from the whole board each time. The
+board-derived categories depend only on who holds each office, so the ledger
+keeps, per city, the office controllers its totals were built from. On each
+query it re-derives control only for the cities whose offices changed,
+rebuilds the networks of the players who gained or lost an office there, and
+re-ranks Britannia only when one of its cities changed. The remaining
+categories read a handful of player counters and are recomputed directly.
+
+Comparing controllers rather than listening to the claim, swap and upgrade
+resolvers also keeps the ledger correct when generators and tests assign
+offices directly. ``verify`` cross-checks every answer against the full
+``projected_score_breakdown``.
+"""
+
+from operator import attrgetter
+from weakref import WeakKeyDictionary
+
+from game.invariants import GameInvariantError
+from game.map_topology import map_topology
+from game.office_network import OfficeNetwork
+
+VERIFY_SCORE_LEDGER = False
+
+_LEDGERS = WeakKeyDictionary()
+_CONTROLLER = attrgetter("controller")
+
+
+class ScoreLedger:
+    """Board-derived score categories of one game, refreshed city by city."""
+
+    def __init__(self, game, *, verify=None):
+        self.verify = VERIFY_SCORE_LEDGER if verify is None else verify
+        self._city_keys = None
+        self._controllers = []
+        self._networks = {}
+        self._britannia = {}
+        self._britannia_cities = frozenset()
+        if game.map_num == 3:
+            topology = map_topology(game.selected_map)
+            self._britannia_cities = frozenset(
+                index
+                for region in ("Wales", "Scotland")
+                for index in topology.region_city_indices(region, shared=("IsleOfMan",))
+            )
+        self.full_refreshes = 0
+        self.cities_refreshed = 0
+        self.networks_refreshed = 0
+
+    def _refresh(self, game):
+        cities = game.selected_map.cities
+        keys = [tuple(map(_CONTROLLER, city.offices)) for city in cities]
+        previous = self._city_keys
+        if keys == previous:
+            return
+        if previous is None or len(previous) != len(keys):
+            self.full_refreshes += 1
+            changed = range(len(keys))
+            players = set(game.players)
+            self._controllers = [None] * len(keys)
+        else:
+            changed = [index for index, key in enumerate(keys) if key != previous[index]]
+            players = {
+                controller
+                for index in changed
+                for controller in (*keys[index], *previous[index])
+                if controller is not None
+            }
+        for index in changed:
+            self._controllers[index] = cities[index].determine_controller()
+        self.cities_refreshed += len(changed)
+        for player in players:
+            self._networks[player] = OfficeNetwork(game, player).largest()
+        self.networks_refreshed += len(players)
+        if self._britannia_cities and not self._britannia_cities.isdisjoint(changed):
+            self._britannia = game.calculate_britannia_region_points()
+        self._city_keys = keys
+
+    def breakdown(self, game, player):
+        """Return the same categories as ``Game.projected_score_breakdown``."""
+        self._refresh(game)
+        return self._breakdown(game, player)
+
+    def _breakdown(self, game, player):
+        breakdown = game.player_score_breakdown(player)
+        city_points = 4 if game.FourPtsPerOwnedCityOwner == player else 2
+        breakdown["City Control Points"] = self._controllers.count(player) * city_points
+        breakdown["Largest Network Points"] = self._networks.get(player, 0) * player.keys
+        breakdown["Britannia Region Points"] = self._britannia.get(player, 0)
+        if game.use_mission_cards and player.mission_card:
+            breakdown["Mission City Points"] = game.get_mission_card_points(player)
+        if self.verify:
+            expected = game.projected_score_breakdown(player)
+            if breakdown != expected:
+                raise GameInvariantError(
+                    f"Score ledger diverged for player {player.order}: {breakdown} != {expected}"
+                )
+        return breakdown
+
+    def scores(self, game):
+        """Return every player's projected final score in seat order."""
+        self._refresh(game)
+        return tuple(sum(self._breakdown(game, player).values()) for player in game.players)
+
+
+def score_ledger(game):
+    """Return the score ledger attached to ``game``."""
+    ledger = _LEDGERS.get(game)
+    if ledger is None:
+        ledger = ScoreLedger(game)
+        _LEDGERS[game] = ledger
+    return ledger
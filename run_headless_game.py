@@ -1,6 +1,7 @@
 import argparse
 
 from game.game_runner import GameRunError, run_game
+from game.invariants import ValidationLevel
 
 
 def main():
@@ -17,6 +18,13 @@ def main():
         dest="bonus_marker_supply",
         help="Explicit supply marker type; repeat exactly 12 times to choose a promo mix.",
     )
+    parser.add_argument(
+        "--validation",
+        choices=[level.value for level in ValidationLevel],
+        default=ValidationLevel.FULL.value,
+        help="Recount the board after every action, at sampled boundaries, or never.",
+    )
+    parser.add_argument("--full-validation-interval", type=int, default=50)
     args = parser.parse_args()
 
     try:
@@ -28,6 +36,8 @@ def main():
             use_mission_cards=args.mission_cards,
             use_emperors_favour=args.emperors_favour,
             bonus_marker_supply=args.bonus_marker_supply,
+            validation=args.validation,
+            full_validation_interval=args.full_validation_interval,
         )
     except GameRunError as error:
         parser.exit(1, f"Headless game failed: {error}\n")
@@ -38,7 +48,7 @@ def main():
     print(f"Actions: {result.action_count}")
     print(f"Terminal reason: {result.terminal_reason}")
     print(f"Final scores: {result.final_scores}")
-    print("Invariants: passed")
+    print(f"Invariants: passed ({args.validation})")
 
 
 if __name__ == "__main__":
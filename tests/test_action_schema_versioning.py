@@ -1,6 +1,7 @@
 import hashlib
 import json
 from pathlib import Path
+import struct
 import tempfile
 import unittest
 
@@ -15,6 +16,7 @@ from ai.observation_schema import (
 )
 from game.action_codec import DEFAULT_ACTION_CODEC
 from game.game_runner import ReplayRecord, load_replay, save_replay
+from game.replay_archive import ReplayArchive, ReplayArchiveError, write_replay_archive
 from game.action_schema import (
     ACTION_SCHEMA_FINGERPRINT,
     ACTION_SCHEMA_VERSION,
@@ -119,5 +121,89 @@ class TestActionSchemaVersioning(unittest.TestCase):
                 load_replay(path)
 
 
+class ReplayArchiveTests(unittest.TestCase):
+    def setUp(self):
+        self.records = (
+            ReplayRecord(2, 3, 124, (1, 2, 3)),
+            ReplayRecord(3, 5, 2**40, ()),
+            ReplayRecord(1, 4, -7, tuple(range(ACTION_SPACE_SIZE))),
+        )
+
+    def test_archive_gives_random_and_streaming_access(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_replay_archive(self.records, Path(directory) / "replays.hra")
+            archive = ReplayArchive(path)
+            self.assertEqual(len(archive), 3)
+            self.assertEqual(archive[2], self.records[2])
+            self.assertEqual(archive[-2], self.records[1])
+            self.assertEqual(tuple(archive), self.records)
+            self.assertEqual(archive.actions(0).dtype.itemsize, 2)
+            self.assertEqual(archive.action_count(2), ACTION_SPACE_SIZE)
+            self.assertEqual(archive.seed.tolist(), [124, 2**40, -7])
+            with self.assertRaises(IndexError):
+                archive[3]
+
+            empty = ReplayArchive(write_replay_archive((), Path(directory) / "empty.hra"))
+            self.assertEqual(list(empty), [])
+
+    def test_archive_rejects_bad_actions_and_foreign_schema(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "replays.hra"
+            with self.assertRaisesRegex(ReplayArchiveError, "below"):
+                write_replay_archive([ReplayRecord(2, 3, 1, (ACTION_SPACE_SIZE,))], path)
+            write_replay_archive(self.records, path)
+            data = path.read_bytes()
+            version = b'"action_schema_version":%d' % ACTION_SCHEMA_VERSION
+            path.write_bytes(
+                data.replace(version, b'"action_schema_version":%d' % (ACTION_SCHEMA_VERSION - 1))
+            )
+            with self.assertRaisesRegex(ReplayArchiveError, "incompatible action schema"):
+                ReplayArchive(path)
+            path.write_bytes(b"not an archive")
+            with self.assertRaisesRegex(ReplayArchiveError, "not a Hansa replay archive"):
+                ReplayArchive(path)
+
+    def test_archive_rejects_corrupted_column_layouts(self):
+        def set_column(name, field, value):
+            def change(header):
+                header["columns"][name][field] = value
+
+            return change
+
+        def drop_field(name, field):
+            def change(header):
+                del header["columns"][name][field]
+
+            return change
+
+        corruptions = {
+            "no layout": (lambda header: header.update(columns=[]), "no column layout"),
+            "missing column": (lambda header: header["columns"].pop("seed"), "missing the seed"),
+            "column spec": (
+                lambda header: header["columns"].update(offsets="broken"),
+                "offsets column is malformed",
+            ),
+            "missing field": (drop_field("map_num", "offset"), "map_num column is malformed"),
+            "unknown dtype": (set_column("actions", "dtype", "nonsense"), "actions column"),
+            "float dtype": (set_column("actions", "dtype", "<f4"), "must hold integers"),
+            "text offset": (set_column("seed", "offset", "8"), "seed column is malformed"),
+            "negative count": (set_column("actions", "count", -1), "actions column"),
+            "truncated column": (set_column("actions", "count", 10**9), "truncated"),
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_replay_archive(self.records, Path(directory) / "replays.hra")
+            data = path.read_bytes()
+            magic, header_size = struct.unpack_from("<8sI", data)
+            body = data[12 + header_size :]
+            for label, (corrupt, message) in corruptions.items():
+                with self.subTest(label):
+                    header = json.loads(data[12 : 12 + header_size])
+                    corrupt(header)
+                    encoded = json.dumps(header).encode("utf-8")
+                    path.write_bytes(struct.pack("<8sI", magic, len(encoded)) + encoded + body)
+                    with self.assertRaisesRegex(ReplayArchiveError, message):
+                        ReplayArchive(path)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,6 +5,7 @@ import random
 import unittest
 
 from game.action_validation import state_fingerprint, validate_action_state
+from game.cloning import GameSnapshot
 from game.game_actions import refresh_displacement_targets
 from game.game_runner import (
     create_headless_game,
@@ -114,6 +115,7 @@ class ExhaustiveActionValidationTests(unittest.TestCase):
         exchange.pending_exchange_marker = exchange_player.bonus_markers[0]
         self.validate_quietly(exchange)
         exchange.exchange_target_player = exchange_target
+        exchange.mark_state_changed()
         self.validate_quietly(exchange)
 
         ability = create_headless_game(1, 3, seed=124)
@@ -319,5 +321,69 @@ class ExhaustiveActionValidationTests(unittest.TestCase):
         self.validate_quietly(replay)
 
 
+class GameCloneTests(unittest.TestCase):
+    def played_game(self, map_num=1, num_players=5, steps=40):
+        game = create_headless_game(map_num, num_players, seed=31)
+        policy_rng = random.Random(31)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(steps):
+                game.apply_ai_action(
+                    select_progress_action(game, legal_action_indices(game), policy_rng)
+                )
+        return game
+
+    def test_clone_matches_pickle_state_and_is_independent(self):
+        for map_num, num_players in ((1, 5), (2, 3), (3, 4)):
+            with self.subTest(map_num=map_num):
+                game = self.played_game(map_num, num_players)
+                before = state_fingerprint(game)
+                clone = game.clone()
+
+                self.assertEqual(before, state_fingerprint(clone))
+                self.assertEqual(game.ai_action_mask(), clone.ai_action_mask())
+                with contextlib.redirect_stdout(io.StringIO()):
+                    clone.apply_ai_action(legal_action_indices(clone)[0])
+                self.assertEqual(before, state_fingerprint(game))
+
+    def test_clone_shares_immutable_geometry_only(self):
+        game = self.played_game()
+        clone = game.clone()
+        original_route = game.selected_map.routes[0]
+        cloned_route = clone.selected_map.routes[0]
+
+        self.assertIsNot(cloned_route, original_route)
+        self.assertIsNot(cloned_route.posts[0], original_route.posts[0])
+        self.assertIs(cloned_route.posts[0].pos, original_route.posts[0].pos)
+        self.assertIs(clone.selected_map.cities[0].midpoint, game.selected_map.cities[0].midpoint)
+        self.assertIs(clone.selected_map.initial_bonus_types, game.selected_map.initial_bonus_types)
+        self.assertIsNot(clone.selected_map.bonus_marker_pool, game.selected_map.bonus_marker_pool)
+        self.assertIsNot(clone.rng, game.rng)
+        self.assertIs(clone.selected_map.rng, clone.rng)
+
+    def test_clone_records_again_after_state_change(self):
+        game = self.played_game(3, 4)
+        game.clone()
+        game.current_player.personal_supply_squares += 1
+        game.mark_state_changed()
+
+        self.assertEqual(state_fingerprint(game), state_fingerprint(game.clone()))
+
+    def test_snapshot_restores_recorded_state_after_original_moves_on(self):
+        game = self.played_game(2, 3)
+        expected_actions = game.get_legal_actions()
+        before = state_fingerprint(game)
+        snapshot = GameSnapshot(game)
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.apply_ai_action(legal_action_indices(game)[0])
+
+        first = snapshot.restore()
+        second = snapshot.restore()
+
+        self.assertEqual(before, state_fingerprint(first))
+        self.assertEqual(before, state_fingerprint(second))
+        self.assertIsNot(first.selected_map, second.selected_map)
+        self.assertEqual(expected_actions, first.get_legal_actions())
+
+
 if __name__ == "__main__":
     unittest.main()
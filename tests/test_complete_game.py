@@ -1,8 +1,19 @@
 import contextlib
 import io
 import unittest
+from unittest import mock
 
-from game.game_runner import run_game
+from game import invariants
+from game.action_validation import state_fingerprint
+from game.game_runner import (
+    GameRunError,
+    SeekableReplay,
+    create_headless_game,
+    replay_game,
+    run_game,
+)
+from game.invariants import GameInvariantError, InvariantChecker, ValidationLevel
+from game.turn_state import TurnPhase
 
 
 class CompleteGameTests(unittest.TestCase):
@@ -27,5 +38,88 @@ class CompleteGameTests(unittest.TestCase):
                 self.assertEqual(result.terminal_reason, "game_end")
 
 
+class InvariantLevelTests(unittest.TestCase):
+    def test_validation_levels_play_the_same_game(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            full = run_game(map_num=2, num_players=3, seed=124)
+            sampled = run_game(
+                map_num=2, num_players=3, seed=124, validation=ValidationLevel.SAMPLED
+            )
+            counters = run_game(map_num=2, num_players=3, seed=124, validation="counters")
+            replay_game(full.action_trace, map_num=2, num_players=3, seed=124, validation="sampled")
+        self.assertEqual(sampled.action_trace, full.action_trace)
+        self.assertEqual(counters.final_scores, full.final_scores)
+
+    def test_sampled_level_recounts_at_interval_and_boundaries(self):
+        game = create_headless_game(2, 3, seed=124)
+        checker = InvariantChecker(ValidationLevel.SAMPLED, interval=3)
+        with mock.patch.object(invariants, "validate_game", return_value=True) as full:
+            for _ in range(5):
+                checker.after_action(game, game.turn_number, TurnPhase.ACTIONS)
+            self.assertEqual(full.call_count, 1)
+            checker.after_action(game, game.turn_number - 1, TurnPhase.ACTIONS)
+            self.assertEqual(full.call_count, 2)
+        self.assertEqual(checker.full_validations, 2)
+        with self.assertRaisesRegex(ValueError, "positive"):
+            InvariantChecker(interval=0)
+
+    def test_counter_level_rejects_impossible_supply(self):
+        game = create_headless_game(2, 3, seed=124)
+        game.players[1].general_stock_circles += 4
+        checker = InvariantChecker(ValidationLevel.COUNTERS)
+        with self.assertRaisesRegex(GameInvariantError, "too many merchants"):
+            checker.after_action(game, game.turn_number, TurnPhase.ACTIONS)
+
+
+class SeekableReplayTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.record = run_game(map_num=2, num_players=3, seed=124).replay_record()
+
+    def replay_prefix(self, action_count):
+        return replay_game(
+            self.record.action_trace[:action_count], map_num=2, num_players=3, seed=124
+        )
+
+    def test_trusted_replay_reaches_the_validated_state(self):
+        trace = self.record.action_trace
+        trusted = replay_game(trace, map_num=2, num_players=3, seed=124, trusted=True)
+        validated = self.replay_prefix(len(trace))
+        self.assertEqual(state_fingerprint(trusted), state_fingerprint(validated))
+
+    def test_trusted_and_validated_replays_reject_bad_actions_alike(self):
+        game = create_headless_game(2, 3, 124)
+        illegal = next(index for index in range(768) if index not in game.legal_action_indices())
+        for action_index in (illegal, 768, -1):
+            for trusted in (False, True):
+                with self.subTest(action_index=action_index, trusted=trusted):
+                    with self.assertRaisesRegex(GameRunError, "illegal at step 0"):
+                        replay_game((action_index,), seed=124, trusted=trusted)
+
+    def test_seek_matches_replaying_the_prefix_in_any_order(self):
+        replay = SeekableReplay(self.record, checkpoint_interval=20)
+        total = replay.action_count
+        for action_number in (total, 45, 0, 20, total - 7):
+            with self.subTest(action_number=action_number):
+                self.assertEqual(
+                    state_fingerprint(replay.seek(action_number)),
+                    state_fingerprint(self.replay_prefix(action_number)),
+                )
+        self.assertEqual(replay.checkpoints, tuple(range(0, total + 1, 20)))
+
+    def test_seek_returns_independent_games(self):
+        replay = SeekableReplay(self.record, checkpoint_interval=10, trusted=False)
+        first = replay.seek(30)
+        first.players[0].score += 100
+        self.assertEqual(
+            state_fingerprint(replay.seek(30)), state_fingerprint(self.replay_prefix(30))
+        )
+        with self.assertRaisesRegex(GameRunError, "no position"):
+            replay.seek(replay.action_count + 1)
+        with self.assertRaisesRegex(ValueError, "positive"):
+            SeekableReplay(self.record, checkpoint_interval=0)
+
+
 if __name__ == "__main__":
     unittest.main()
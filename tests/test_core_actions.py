@@ -1,5 +1,6 @@
 import contextlib
 import io
+import random
 import unittest
 
 from tests.action_helpers import legal_action_mask
@@ -9,10 +10,13 @@ from game.game_actions import (
     can_pick_up_displacement_fallback,
     can_place_displacement_piece,
     displacement_can_be_completed,
+    displacement_memo,
     get_adjacent_routes,
     refresh_displacement_targets,
 )
 from game.game_runner import create_headless_game
+from game.map_topology import map_topology
+from game.office_network import OfficeNetwork
 from game.turn_state import TurnPhase
 
 
@@ -292,6 +296,7 @@ class CoreActionTests(unittest.TestCase):
         self.assertEqual(mask[post_index(game, circle_post, "circle")].item(), 0)
         actor.personal_supply_squares = 0
         actor.personal_supply_circles = 3
+        game.mark_state_changed()
         self.assertEqual(legal_action_mask(game)[post_index(game, circle_post, "circle")].item(), 1)
 
     def test_displaced_extra_piece_falls_back_to_piece_already_on_board(self):
@@ -505,6 +510,7 @@ class CoreActionTests(unittest.TestCase):
 
         game.displaced_player.use_optional_displaced_shape = True
         refresh_displacement_targets(game)
+        game.mark_state_changed()
         self.assertFalse(can_place_displacement_piece(game, flexible_post, "square"))
         self.assertEqual(
             legal_action_mask(game)[post_index(game, flexible_post, "square")].item(),
@@ -775,6 +781,7 @@ class CoreActionTests(unittest.TestCase):
         cardiff = next(city for city in game.selected_map.cities if city.name == "Cardiff")
         cardiff.offices[0].controller = player
         player.refresh_map3_priv_actions(game)
+        game.mark_state_changed()
         self.assertEqual(legal_action_mask(game)[target_index].item(), 1)
         self.apply(game, target_index)
         self.assertEqual(player.brown_priv_count, 0)
@@ -864,6 +871,7 @@ class CoreActionTests(unittest.TestCase):
         route.cities[0].offices[0].controller = player
         route.cities[1].offices[0].controller = opponent
         stock_before = player.general_stock_squares
+        game.mark_state_changed()
 
         self.assertEqual(legal_action_mask(game)[action_index].item(), 1)
         self.apply(game, action_index)
@@ -966,6 +974,7 @@ class CoreActionTests(unittest.TestCase):
 
         self.assertEqual(legal_action_mask(game)[action_index].item(), 0)
         player.privilege = "ORANGE"
+        game.mark_state_changed()
         self.assertEqual(legal_action_mask(game)[action_index].item(), 1)
 
     def test_circle_only_route_cannot_claim_square_office(self):
@@ -1104,6 +1113,7 @@ class CoreActionTests(unittest.TestCase):
         player.personal_supply_circles -= 1
         stock_squares_before = player.general_stock_squares
         stock_circles_before = player.general_stock_circles
+        game.mark_state_changed()
 
         self.apply(game, action_index)
 
@@ -1245,6 +1255,137 @@ class CoreActionTests(unittest.TestCase):
         self.assertTrue(game.has_east_west_connection(start_name, end_name))
         self.assertEqual(game.calculate_largest_network(player), len(path))
 
+    def test_map_topology_is_shared_by_games_with_the_same_layout(self):
+        for map_num in range(1, 4):
+            game = create_headless_game(map_num, 4, seed=124)
+            topology = map_topology(game.selected_map)
+            other_game = create_headless_game(map_num, 4, seed=7)
+            self.assertIs(map_topology(other_game.selected_map), topology)
+            self.assertIs(map_topology(game.clone().selected_map), topology)
+
+            cities = game.selected_map.cities
+            for index, city in enumerate(cities):
+                self.assertEqual(topology.city_index[city.name], index)
+                self.assertEqual(
+                    {cities[adjacent] for adjacent in topology.neighbours[index]},
+                    {other for route in city.routes for other in route.cities if other is not city},
+                )
+            for route_index, route in enumerate(game.selected_map.routes):
+                slots = topology.route_post_slots[route_index]
+                self.assertEqual(
+                    [game.post_context(slot) for slot in slots],
+                    [(route, post) for post in route.posts],
+                )
+
+        three_players = map_topology(create_headless_game(3, 3, seed=124).selected_map)
+        self.assertIsNot(three_players, map_topology(create_headless_game(3, 4).selected_map))
+
+    def test_largest_network_scores_the_biggest_connected_group(self):
+        game = create_headless_game(2, 3, seed=124)
+        player = game.players[0]
+        start_name, end_name = game.selected_map.east_west_cities
+        path = self.city_path(game, start_name, end_name)
+        for city in path[:2] + path[-1:]:
+            city.offices[0].controller = player
+        path[0].offices[1].controller = player
+
+        self.assertEqual(game.calculate_largest_network(player), 3)
+        self.assertEqual(game.calculate_largest_network(game.players[1]), 0)
+
+    def test_office_network_matches_a_search_of_the_board(self):
+        rng = random.Random(5)
+        for map_num in range(1, 4):
+            game = create_headless_game(map_num, 3, seed=124)
+            cities = game.selected_map.cities
+            player = game.players[0]
+            for city in cities:
+                for office in city.offices:
+                    office.controller = rng.choice((player, game.players[1], None, None))
+            network = OfficeNetwork(game, player)
+
+            def linked(first, second, extra=None):
+                owned = {
+                    index for index, city in enumerate(cities) if city.has_office_owned_by(player)
+                }
+                if extra is not None:
+                    owned.add(extra)
+                pending, seen = [first], {first}
+                while pending:
+                    city = pending.pop()
+                    for adjacent in network.topology.neighbours[city]:
+                        if adjacent in owned and adjacent not in seen:
+                            seen.add(adjacent)
+                            pending.append(adjacent)
+                return first in owned and second in seen
+
+            start, end = network.topology.east_west
+            self.assertEqual(network.east_west_connected(), linked(start, end))
+            for index in range(len(cities)):
+                with self.subTest(map_num=map_num, city=cities[index].name):
+                    self.assertEqual(
+                        network.would_connect_east_west(index), linked(start, end, index)
+                    )
+                    self.assertEqual(network.connected(start, index), linked(start, index))
+
+    def test_displacement_memo_reuses_answers_until_a_scanned_post_changes(self):
+        game = create_headless_game(2, 3, seed=124)
+        actor, opponent = game.players[:2]
+        original_route = next(
+            route
+            for route in game.selected_map.routes
+            if {city.name for city in route.cities} == {"Malmo", "Visby"}
+        )
+        adjacent_posts = [
+            post
+            for city in original_route.cities
+            for route in city.routes
+            if route is not original_route
+            for post in route.posts
+        ]
+        memo = displacement_memo(game)
+
+        self.assertTrue(displacement_can_be_completed(game, original_route, opponent, "square"))
+        self.assertTrue(displacement_can_be_completed(game, original_route, opponent, "square"))
+        self.assertEqual((memo.hits, memo.misses, memo.stale), (1, 1, 0))
+        self.assertEqual(memo.hit_rate, 0.5)
+
+        # Filling the neighbouring routes directly must not reuse the old answer.
+        for post in adjacent_posts:
+            post.owner = actor
+            post.owner_piece_shape = post.required_shape or "square"
+        self.assertEqual(
+            displacement_can_be_completed(game, original_route, opponent, "square"),
+            any(
+                post.owner is None
+                for route in game.selected_map.routes
+                if route is not original_route
+                for post in route.posts
+            ),
+        )
+        self.assertEqual(memo.stale, 1)
+
+        opponent.general_stock_squares += 1
+        displacement_can_be_completed(game, original_route, opponent, "square")
+        self.assertEqual(memo.misses, 3)
+
+    def test_displacement_memo_evicts_the_least_recently_used_answer(self):
+        game = create_headless_game(2, 3, seed=124)
+        opponent = game.players[1]
+        first, second, third = game.selected_map.routes[:3]
+        memo = displacement_memo(game)
+        memo.max_entries = 2
+
+        displacement_can_be_completed(game, first, opponent, "square")
+        displacement_can_be_completed(game, second, opponent, "square")
+        displacement_can_be_completed(game, first, opponent, "square")
+        displacement_can_be_completed(game, third, opponent, "square")
+        self.assertEqual(len(memo), 2)
+
+        displacement_can_be_completed(game, first, opponent, "square")
+        self.assertEqual((memo.hits, memo.misses), (2, 3))
+        displacement_can_be_completed(game, second, opponent, "square")
+        self.assertEqual((memo.hits, memo.misses), (2, 4))
+
 
 if __name__ == "__main__":
     unittest.main()
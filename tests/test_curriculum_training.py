@@ -1,11 +1,15 @@
 import csv
+from dataclasses import asdict
 import json
 from pathlib import Path
 import random
 from types import SimpleNamespace
 import tempfile
 import unittest
+from unittest import mock
 
+from training import rollout_workers
+from training.balanced_curriculum import BalancedCurriculumRunner
 from training.curriculum import (
     CurriculumConfig,
     CurriculumRunner,
@@ -150,6 +154,78 @@ class TestRunner(CurriculumRunner):
         )
 
 
+class SeededTrainer(FakeTrainer):
+    """Deadlocks on a fraction of action seeds so retries depend only on the seed."""
+
+    def collect_game(self, path, *, failure_callback=None, evaluation=False, **kwargs):
+        if not evaluation and self.rng.random() < 0.3:
+            self.collect_calls += 1
+            return deadlocked_trajectory()
+        trajectory = super().collect_game(
+            path, failure_callback=failure_callback, evaluation=evaluation, **kwargs
+        )
+        trajectory.final_scores = (self.rng.randrange(100), 20, 10)
+        return trajectory
+
+
+class EvaluationDeadlockTrainer(SeededTrainer):
+    """Also deadlocks on half of the evaluation action seeds, so evaluation retries."""
+
+    def collect_game(self, path, *, failure_callback=None, evaluation=False, **kwargs):
+        if evaluation and self.rng.random() < 0.5:
+            self.collect_calls += 1
+            return deadlocked_trajectory()
+        return super().collect_game(
+            path, failure_callback=failure_callback, evaluation=evaluation, **kwargs
+        )
+
+
+class InvalidActionTrainer(FakeTrainer):
+    """Records an invalid action attempt on a fraction of action seeds."""
+
+    def collect_game(self, path, *, failure_callback=None, evaluation=False, **kwargs):
+        if not evaluation and self.rng.random() < 0.3:
+            self.progress.invalid_action_attempts += 1
+        return super().collect_game(
+            path, failure_callback=failure_callback, evaluation=evaluation, **kwargs
+        )
+
+
+class RolloutTestRunner(TestRunner):
+    __test__ = False
+    trainer_class = SeededTrainer
+
+    def _rollout_trainer(self, model_path, training_config):
+        trainer = self.trainer_class()
+        trainer.config = training_config
+        trainer.loaded_model = model_path
+        return trainer
+
+
+class EvaluationDeadlockRunner(RolloutTestRunner):
+    __test__ = False
+    trainer_class = EvaluationDeadlockTrainer
+
+
+class InvalidActionRolloutRunner(RolloutTestRunner):
+    __test__ = False
+    trainer_class = InvalidActionTrainer
+
+
+class BalancedRolloutRunner(RolloutTestRunner, BalancedCurriculumRunner):
+    """Draws training configurations from the balanced rotation without generating states."""
+
+    __test__ = False
+
+    def _generate_state(self, stage, seed, directory, *, map_num=None, player_count=None):
+        if map_num is None and player_count is None:
+            map_num, player_count = self._configuration_for_game()
+            self.training_generation_number += 1
+        return super()._generate_state(
+            stage, seed, directory, map_num=map_num, player_count=player_count
+        )
+
+
 class CurriculumTrainingTests(unittest.TestCase):
     def test_saved_game_numbers_are_compact_but_preserve_gaps(self):
         self.assertEqual(_format_game_numbers([16, 17, 18, 19, 20]), "16-20")
@@ -616,6 +692,256 @@ class CurriculumTrainingTests(unittest.TestCase):
                 )
             )
 
+    def test_rollout_workers_match_sequential_training_rows(self):
+        def training_rows(root, **config_changes):
+            runner = RolloutTestRunner(
+                SeededTrainer(),
+                self.config(training_games_per_batch=6, update_batch_size=2, **config_changes),
+                checkpoint_path=root / "model.pth",
+                playable_model_path=root / "playable.pth",
+                csv_path=root / "results.csv",
+                temporary_directory=root / "states",
+                failure_directory=root / "failures",
+                evaluation_suite_directory=root / "evaluation",
+            )
+            runner.run()
+            with (root / "results.csv").open(newline="", encoding="utf-8") as source:
+                rows = list(csv.DictReader(source))
+            fields = (
+                "game#",
+                "run_type",
+                "state_seed",
+                "action_seed",
+                "final_player_scores",
+                "retry_count",
+            )
+            return [{field: row[field] for field in fields} for row in rows], runner
+
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            sequential, sequential_runner = training_rows(root / "sequential")
+            parallel, parallel_runner = training_rows(
+                root / "parallel", rollout_workers=2, weight_sync_interval=3
+            )
+
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(parallel_runner.game_number, sequential_runner.game_number)
+        self.assertIn("1", {row["retry_count"] for row in parallel})
+        self.assertEqual(parallel_runner.generated_seeds, [10000])
+
+    def test_rollout_workers_follow_the_inline_configuration_rotation(self):
+        def run(root, **config_changes):
+            runner = BalancedRolloutRunner(
+                SeededTrainer(),
+                self.config(
+                    iterations=2, training_games_per_batch=6, update_batch_size=2, **config_changes
+                ),
+                checkpoint_path=root / "model.pth",
+                playable_model_path=root / "playable.pth",
+                csv_path=root / "results.csv",
+                temporary_directory=root / "states",
+                failure_directory=root / "failures",
+                evaluation_suite_directory=root / "evaluation",
+            )
+            runner.run()
+            with (root / "results.csv").open(newline="", encoding="utf-8") as source:
+                configurations = [
+                    (row["game#"], row["retry_count"], row["map"], row["player_count"])
+                    for row in csv.DictReader(source)
+                    if row["run_type"] != "evaluation"
+                ]
+            return configurations, runner
+
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            inline, inline_runner = run(root / "inline")
+            parallel, parallel_runner = run(
+                root / "parallel", rollout_workers=2, weight_sync_interval=3
+            )
+
+        self.assertEqual(len(inline), 12)
+        self.assertIn("1", {row[1] for row in inline})
+        self.assertEqual(parallel, inline)
+        self.assertEqual(
+            parallel_runner.training_generation_number, inline_runner.training_generation_number
+        )
+        self.assertEqual(
+            parallel_runner.trainer.saved_curriculum_state["training_generation_number"],
+            inline_runner.training_generation_number,
+        )
+
+    def test_rollout_workers_delete_weights_no_pending_game_uses(self):
+        class RolloutModel(FakeModel):
+            def __init__(self):
+                super().__init__()
+                self.saved_rollout_models = []
+
+            def save_model(self, path):
+                target = super().save_model(path)
+                if target.parent.name == "rollout_models":
+                    self.saved_rollout_models.append(sorted(target.parent.iterdir()))
+                return target
+
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            trainer = SeededTrainer()
+            trainer.model = RolloutModel()
+            runner = RolloutTestRunner(
+                trainer,
+                self.config(
+                    training_games_per_batch=6,
+                    update_batch_size=2,
+                    rollout_workers=2,
+                    weight_sync_interval=1,
+                ),
+                checkpoint_path=root / "model.pth",
+                playable_model_path=root / "playable.pth",
+                csv_path=root / "results.csv",
+                temporary_directory=root / "states",
+                failure_directory=root / "failures",
+                evaluation_suite_directory=root / "evaluation",
+            )
+            runner.run()
+
+            saved = trainer.model.saved_rollout_models
+            self.assertGreater(len(saved), 3)
+            # The new weights plus the ones each of the two in-flight games was submitted with.
+            self.assertLessEqual(max(len(paths) for paths in saved), 3)
+
+    def test_rollout_workers_report_worker_progress_to_the_learner(self):
+        def run(root, **config_changes):
+            runner = InvalidActionRolloutRunner(
+                InvalidActionTrainer(),
+                self.config(
+                    training_games_per_batch=6,
+                    update_batch_size=2,
+                    stages=(
+                        CurriculumStage("first", 10, (18, 19)),
+                        CurriculumStage("second", 10, (18, 19)),
+                    ),
+                    **config_changes,
+                ),
+                checkpoint_path=root / "model.pth",
+                playable_model_path=root / "playable.pth",
+                csv_path=root / "results.csv",
+                temporary_directory=root / "states",
+                failure_directory=root / "failures",
+                evaluation_suite_directory=root / "evaluation",
+            )
+            runner.run()
+            return runner
+
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            sequential = run(root / "sequential")
+            parallel = run(root / "parallel", rollout_workers=2, weight_sync_interval=3)
+
+        self.assertGreater(sequential.trainer.progress.invalid_action_attempts, 0)
+        self.assertEqual(asdict(parallel.trainer.progress), asdict(sequential.trainer.progress))
+        self.assertEqual(sequential.stage_index, 0)
+        self.assertEqual(parallel.stage_index, sequential.stage_index)
+
+    def test_prefetched_states_match_inline_generation(self):
+        def training_rows(root, **config_changes):
+            runner = RolloutTestRunner(
+                SeededTrainer(),
+                self.config(training_games_per_batch=6, update_batch_size=2, **config_changes),
+                checkpoint_path=root / "model.pth",
+                playable_model_path=root / "playable.pth",
+                csv_path=root / "results.csv",
+                temporary_directory=root / "states",
+                failure_directory=root / "failures",
+                evaluation_suite_directory=root / "evaluation",
+            )
+            runner.run()
+            with (root / "results.csv").open(newline="", encoding="utf-8") as source:
+                rows = [
+                    (row["game#"], row["state_seed"], row["action_seed"], row["retry_count"])
+                    for row in csv.DictReader(source)
+                ]
+            return rows, runner
+
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            inline, inline_runner = training_rows(root / "inline")
+            prefetched, prefetched_runner = training_rows(root / "prefetched", prefetch_states=2)
+
+        self.assertEqual(prefetched, inline)
+        self.assertEqual(prefetched_runner.game_number, inline_runner.game_number)
+        self.assertIn("1", {row[3] for row in prefetched})
+        # First attempts were generated by the workers; retries still run inline.
+        self.assertTrue(
+            all((seed - 124) % 10_007 for seed in prefetched_runner.generated_seeds[:-1])
+        )
+        self.assertLess(len(prefetched_runner.generated_seeds), len(inline_runner.generated_seeds))
+        self.assertIsNone(prefetched_runner._state_prefetcher)
+
+    def test_evaluation_workers_merge_rows_in_suite_order_with_retries(self):
+        def run(root, **config_changes):
+            runner = EvaluationDeadlockRunner(
+                EvaluationDeadlockTrainer(),
+                self.config(
+                    iterations=2, evaluation_games_per_batch=5, retry_limit=2, **config_changes
+                ),
+                checkpoint_path=root / "model.pth",
+                playable_model_path=root / "playable.pth",
+                csv_path=root / "results.csv",
+                temporary_directory=root / "states",
+                failure_directory=root / "failures",
+                evaluation_suite_directory=root / "evaluation",
+            )
+            messages = []
+            runner.progress_callback = messages.append
+            runner.run()
+            with (root / "results.csv").open(newline="", encoding="utf-8") as source:
+                rows = [
+                    (
+                        row["game#"],
+                        row["state_seed"],
+                        row["action_seed"],
+                        row["final_player_scores"],
+                        row["retry_count"],
+                    )
+                    for row in csv.DictReader(source)
+                    if row["run_type"] == "evaluation"
+                ]
+            retries = [message for message in messages if message.endswith("; retrying")]
+            return rows, retries, runner
+
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            sequential, sequential_retries, sequential_runner = run(root / "sequential")
+            with mock.patch(
+                "training.rollout_workers._worker_pool", wraps=rollout_workers._worker_pool
+            ) as worker_pool:
+                parallel, parallel_retries, parallel_runner = run(
+                    root / "parallel", evaluation_workers=2
+                )
+
+        # Both batches were evaluated on the workers started for the run.
+        worker_pool.assert_called_once()
+        self.assertIsNone(parallel_runner._evaluation_pool)
+
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(parallel_retries, sequential_retries)
+        self.assertTrue(parallel_retries)
+        self.assertEqual([row[1] for row in parallel], sorted(row[1] for row in parallel))
+        self.assertEqual(
+            parallel_runner.trainer.rng.getstate(), sequential_runner.trainer.rng.getstate()
+        )
+
+    def test_rollout_options_are_validated(self):
+        with self.assertRaises(ValueError):
+            self.config(rollout_workers=-1)
+        with self.assertRaises(ValueError):
+            self.config(weight_sync_interval=0)
+        with self.assertRaises(ValueError):
+            self.config(evaluation_workers=-1)
+        with self.assertRaises(ValueError):
+            self.config(prefetch_states=-1)
+        args = parse_curriculum_args(["--rollout-workers", "3", "--evaluation-workers", "2"])
+        self.assertEqual((args.rollout_workers, args.evaluation_workers), (3, 2))
+
     def test_checkpoint_rejects_changed_curriculum_configuration(self):
         with tempfile.TemporaryDirectory() as directory:
             root = Path(directory)
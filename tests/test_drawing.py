@@ -1,9 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
 import random
 import unittest
 
 from tests.action_helpers import legal_action_mask
 from unittest.mock import patch
 
+import numpy as np
 import pygame
 import torch
 
@@ -11,13 +13,19 @@ from ai.observation_encoder import ObservationEncoder
 from drawing.action_ui import action_label, fit_text, phase_prompt
 from drawing.ai_observation import public_game_state
 from drawing.drawing_utils import (
+    board_layer,
+    draw_board_state,
+    draw_bonus_markers,
+    draw_cities_and_offices,
     draw_completed_cities_indicator,
+    draw_routes,
     draw_upgrades,
     draw_used_bm_section,
     player_board_layout,
     redraw_window,
 )
 from drawing.game_window import GameWindow
+from drawing.scaled_display import ScaledDisplay, changed_regions
 from game.game_config import GameConfiguration, PlayerControl
 from map_data.map_attributes import BonusMarker
 
@@ -86,6 +94,70 @@ class DrawingTests(unittest.TestCase):
         self.assertEqual(first.action_rects, second.action_rects)
         self.assertEqual(first.tile_rects, second.tile_rects)
 
+    def test_cached_board_layer_matches_a_full_board_redraw(self):
+        game = GameConfiguration(map_num=3, seed=1).create_game()
+        selected_map = game.selected_map
+        size = (selected_map.map_width + 1100, selected_map.map_height)
+        rng = random.Random(1)
+
+        for _ in range(40):
+            expected = pygame.Surface(size)
+            draw_bonus_markers(expected, selected_map)
+            draw_upgrades(expected, selected_map)
+            draw_cities_and_offices(expected, selected_map.cities)
+            draw_routes(expected, selected_map.routes)
+            actual = pygame.Surface(size)
+            draw_board_state(actual, selected_map)
+            self.assertEqual(
+                pygame.image.tobytes(expected, "RGB"), pygame.image.tobytes(actual, "RGB")
+            )
+            legal_actions = legal_action_mask(game).nonzero(as_tuple=True)[0].tolist()
+            game.apply_ai_action(rng.choice(legal_actions))
+
+    def test_board_layer_is_rebuilt_only_when_printed_art_changes(self):
+        game = GameConfiguration(map_num=1, seed=124).create_game()
+        selected_map = game.selected_map
+        size = (selected_map.map_width + 1100, selected_map.map_height)
+
+        layer = board_layer(selected_map, size)
+        self.assertIs(board_layer(selected_map, size), layer)
+
+        route = next(route for route in selected_map.routes if route.bonus_marker)
+        route.bonus_marker = None
+        self.assertIsNot(board_layer(selected_map, size), layer)
+
+    def test_changed_regions_cover_only_modified_tiles(self):
+        previous = np.zeros((200, 100), dtype=np.uint32)
+        current = previous.copy()
+        self.assertEqual(changed_regions(previous, current), [])
+
+        current[5, 5] = 1
+        current[70, 10] = 1
+        current[199, 99] = 1
+        self.assertEqual(
+            changed_regions(previous, current),
+            [pygame.Rect(0, 0, 128, 64), pygame.Rect(192, 64, 8, 36)],
+        )
+
+    def test_present_changes_updates_only_the_changed_window_area(self):
+        display = ScaledDisplay.__new__(ScaledDisplay)
+        display.logical_size = (256, 128)
+        display.canvas = pygame.Surface(display.logical_size)
+        display.window = pygame.Surface((128, 64))
+        display.invalidate()
+        display._presented_rect = None
+
+        with patch("pygame.display.flip"), patch("pygame.display.update") as update:
+            self.assertIsNone(display.present_changes())
+            self.assertEqual(display.present_changes(), [])
+
+            display.canvas.fill((200, 10, 10), pygame.Rect(70, 70, 4, 4))
+            regions = display.present_changes()
+
+        self.assertEqual(regions, [pygame.Rect(64, 64, 64, 64)])
+        update.assert_called_once_with([pygame.Rect(32, 32, 32, 32)])
+        self.assertNotEqual(display.window.get_at((36, 36)), pygame.Color(0, 0, 0))
+
     def test_ai_private_information_is_not_rendered(self):
         game = GameConfiguration(
             map_num=1,
@@ -190,6 +262,38 @@ class DrawingTests(unittest.TestCase):
         self.assertIs(window.acting_player, game.players[1])
         self.assertIs(window.acting_player.control, PlayerControl.EASY)
 
+    def test_gui_legal_actions_and_labels_are_cached_per_state_version(self):
+        game = GameConfiguration(map_num=1, seed=124).create_game()
+        window = GameWindow.__new__(GameWindow)
+        window.game = game
+        window.screen = pygame.Surface(
+            (game.selected_map.map_width + 1100, game.selected_map.map_height)
+        )
+        window.font = pygame.font.Font(None, 22)
+        window.selected = 0
+        window.action_rects = []
+        window.save_status = ""
+        window.legal_view = None
+        window.show_timings = True
+        window.timings = {"draw": 0.0, "legality": 0.0, "ai": 0.0}
+
+        actions = window.legal_actions()
+        self.assertEqual(actions, legal_action_mask(game).nonzero(as_tuple=True)[0].tolist())
+        with patch("drawing.game_window.action_label", wraps=action_label) as label:
+            window.draw_action_browser(actions)
+            first_calls = label.call_count
+            with patch.object(game, "ai_action_mask", side_effect=AssertionError("mask rebuilt")):
+                self.assertIs(window.legal_actions(), actions)
+                window.draw_action_browser(window.legal_actions())
+            window.draw_timings()
+
+        self.assertEqual(first_calls, min(15, len(actions)))
+        self.assertEqual(label.call_count, first_calls)
+
+        game.apply_action(actions[0])
+        self.assertIsNot(window.legal_actions(), actions)
+        self.assertEqual(window.legal_view.state_version, game.state_version)
+
     def test_gui_ai_uses_the_legal_actions_already_generated_for_the_frame(self):
         game = GameConfiguration(
             player_controls=(PlayerControl.EASY, PlayerControl.HUMAN, PlayerControl.HUMAN),
@@ -210,6 +314,47 @@ class DrawingTests(unittest.TestCase):
 
         self.assertIn(selected, (4, 9))
 
+    def test_background_ai_moves_match_the_synchronous_choice(self):
+        def ai_window(seed):
+            game = GameConfiguration(
+                player_controls=(PlayerControl.EASY,) * 3,
+                seed=seed,
+            ).create_game()
+            game.ai_model = lambda state: torch.linspace(0, 3, 768).repeat(state.shape[0], 1)
+            window = GameWindow.__new__(GameWindow)
+            window.game = game
+            window.observation_encoder = ObservationEncoder()
+            window.rng = random.Random(seed)
+            window.legal_view = None
+            window.timings = {"draw": 0.0, "legality": 0.0, "ai": 0.0}
+            window.pending_ai_move = None
+            window.ai_executor = ThreadPoolExecutor(max_workers=1)
+            self.addCleanup(window.ai_executor.shutdown)
+            return window
+
+        synchronous = ai_window(124)
+        background = ai_window(124)
+        for _ in range(12):
+            expected = synchronous.choose_ai_action(synchronous.legal_actions())
+            synchronous.game.apply_ai_action(expected)
+
+            # A cancelled move leaves the controller RNG where it was.
+            background.start_ai_move(background.legal_actions())
+            background.cancel_ai_move()
+            pending = background.start_ai_move(background.legal_actions())
+            pending.future.result()
+            action = background.finish_ai_move()
+            background.game.apply_ai_action(action)
+
+            self.assertEqual(action, expected)
+            self.assertEqual(background.rng.getstate(), synchronous.rng.getstate())
+
+        stale = background.start_ai_move(background.legal_actions())
+        stale.future.result()
+        background.game.mark_state_changed()
+        self.assertIsNone(background.finish_ai_move())
+        self.assertIsNone(background.pending_ai_move)
+
     def test_gui_ai_observation_matches_headless_private_view(self):
         game = GameConfiguration(
             map_num=1,
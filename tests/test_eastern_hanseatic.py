@@ -71,6 +71,7 @@ class EasternHanseaticTests(unittest.TestCase):
         )
         marker.owner = player
         player.bonus_markers.append(marker)
+        game.mark_state_changed()
         self.assertEqual(legal_action_mask(game)[PLACE_ADJACENT_ACTION].item(), 1)
 
     def test_maritime_routes_expose_and_require_exact_merchant_posts(self):
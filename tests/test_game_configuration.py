@@ -480,6 +480,7 @@ class GameConfigurationTests(unittest.TestCase):
                         for post in route.posts:
                             post.owner = game.current_player
                             post.owner_piece_shape = "square"
+                    game.mark_state_changed()
                     legal_actions = legal_action_mask(game).nonzero(as_tuple=True)[0].tolist()
                     upgrade_index = city.upgrade_city_type.index(upgrade.upgrade_type)
                     expected = {
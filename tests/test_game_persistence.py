@@ -13,7 +13,13 @@ from drawing.game_window import GameWindow
 from drawing.new_game_menu import NewGameMenu
 from game.action_schema import ACTION_SCHEMA_VERSION
 from game.game_config import GameConfiguration, PlayerControl
-from game.persistence import SAVE_FORMAT_VERSION, SaveGameError, load_game, save_game
+from game.persistence import (
+    BINARY_SAVE_MAGIC,
+    SAVE_FORMAT_VERSION,
+    SaveGameError,
+    load_game,
+    save_game,
+)
 from game.persistence import default_save_directory
 from game.loaded_state_validation import validate_loaded_game
 from game.invariants import GameInvariantError
@@ -191,6 +197,56 @@ class ExactGamePersistenceTests(unittest.TestCase):
 
         self.assertEqual(restored._saved_controller_rng_state, expected_state)
 
+    def test_compact_save_round_trips_the_same_payload(self):
+        game = self.configured_game()
+        game.apply_ai_action(game.legal_action_indices()[0])
+
+        with tempfile.TemporaryDirectory() as directory:
+            document_path = save_game(game, Path(directory) / "document")
+            compact_path = save_game(game, Path(directory) / "compact", compact=True)
+            document_text = document_path.read_text(encoding="utf-8")
+            compact = compact_path.read_bytes()
+            restored = load_game(compact_path)
+
+        self.assertEqual(compact_path.suffix, ".hansa")
+        self.assertTrue(compact.startswith(BINARY_SAVE_MAGIC))
+        self.assertLess(len(compact), len(document_text))
+        self.assertTrue(compact.endswith(base64.b64decode(json.loads(document_text)["payload"])))
+        self.assertEqual(restored.turn_number, game.turn_number)
+        self.assertEqual(restored.rng.getstate(), game.rng.getstate())
+        self.assertEqual(restored.ai_action_mask(), game.ai_action_mask())
+
+    def test_compact_save_rejects_damaged_payload(self):
+        game = self.configured_game()
+        with tempfile.TemporaryDirectory() as directory:
+            filename = save_game(game, Path(directory) / "position", compact=True)
+            payload = bytearray(filename.read_bytes())
+            payload[-1] ^= 1
+            filename.write_bytes(payload)
+
+            with self.assertRaisesRegex(SaveGameError, "damaged or has been modified"):
+                load_game(filename)
+
+            filename.write_bytes(BINARY_SAVE_MAGIC + b"\x40")
+            with self.assertRaisesRegex(SaveGameError, "truncated"):
+                load_game(filename)
+
+    def test_trusted_load_skips_revalidation_only_for_validated_payloads(self):
+        game = self.configured_game()
+        with tempfile.TemporaryDirectory() as directory:
+            filename = save_game(game, Path(directory) / "position", compact=True)
+            with mock.patch(
+                "game.persistence.validate_loaded_game", wraps=validate_loaded_game
+            ) as validate:
+                load_game(filename, trusted=True)
+                self.assertEqual(validate.call_count, 0)
+                load_game(filename)
+                self.assertEqual(validate.call_count, 1)
+                with mock.patch("game.persistence._VALIDATED_PAYLOADS", set()):
+                    load_game(filename, trusted=True)
+                    load_game(filename, trusted=True)
+                self.assertEqual(validate.call_count, 2)
+
     def test_load_rejects_damaged_payload(self):
         game = self.configured_game()
         with tempfile.TemporaryDirectory() as directory:
@@ -1,9 +1,15 @@
+import random
 import unittest
+from unittest import mock
 
 from game.action_codec import DEFAULT_ACTION_CODEC
+from game.action_legality import mask_post_action
+from game.board_occupancy import CIRCLE, SQUARE, BoardOccupancy
 from game.game_actions import refresh_displacement_targets
 from game.game_runner import create_headless_game, legal_action_indices
-from game.invariants import validate_game
+from game import legal_actions
+from game.incremental_legality import PostLegalityEngine
+from game.invariants import GameInvariantError, validate_game
 from map_data.constants import MAX_POSTS
 from game.structured_actions import (
     BonusMarkerInteraction,
@@ -83,6 +89,7 @@ class LegalActionTests(unittest.TestCase):
 
         game.displaced_player.played_displaced_shape = True
         opponent.holding_pieces.clear()
+        game.mark_state_changed()
         actions = game.get_legal_actions()
         self.assertIn(ControlInteraction(0), actions)
 
@@ -200,5 +207,149 @@ class LegalActionTests(unittest.TestCase):
         self.assertEqual(DEFAULT_ACTION_CODEC.encode(actions[0]), 632)
 
 
+class LegalActionCacheTests(unittest.TestCase):
+    def test_one_decision_derives_legality_once(self):
+        game = create_headless_game(2, 3, seed=124)
+        with mock.patch.object(
+            legal_actions, "get_legal_actions", wraps=legal_actions.get_legal_actions
+        ) as generator:
+            actions = game.get_legal_actions()
+            mask = game.ai_action_mask()
+            indices = legal_action_indices(game)
+            game.apply_structured_action(actions[0])
+            self.assertEqual(generator.call_count, 1)
+
+            game.get_legal_actions()
+            self.assertEqual(generator.call_count, 2)
+        self.assertEqual(indices, tuple(index for index, enabled in enumerate(mask) if enabled))
+
+    def test_resolvers_advance_the_state_version(self):
+        game = create_headless_game(2, 3, seed=124)
+        version = game.state_version
+        game.apply_ai_action(legal_action_indices(game)[0])
+        self.assertGreater(game.state_version, version)
+
+    def test_direct_edits_are_visible_after_marking_the_state_changed(self):
+        game = create_headless_game(2, 3, seed=124)
+        before = game.get_legal_actions()
+        claim = before[0]
+        before.clear()
+        self.assertIn(claim, game.get_legal_actions())
+
+        game.current_player.actions_remaining = 0
+        game.mark_state_changed()
+        self.assertNotIn(claim, game.get_legal_actions())
+
+
+class IncrementalPostLegalityTests(unittest.TestCase):
+    def test_cross_checks_full_generator_through_random_play(self):
+        for map_num, players in ((1, 4), (2, 3), (3, 5)):
+            with self.subTest(map_num=map_num, players=players):
+                game = create_headless_game(map_num, players, seed=31)
+                engine = PostLegalityEngine(game, verify=True)
+                rng = random.Random(31)
+                for _ in range(250):
+                    engine.enabled_slots(game)
+                    actions = game.get_legal_actions()
+                    if not actions:
+                        break
+                    game.apply_structured_action(rng.choice(actions))
+                self.assertLess(engine.full_recomputes, 250)
+
+    def test_only_touched_routes_are_reevaluated(self):
+        game = create_headless_game(2, 3, seed=124)
+        engine = PostLegalityEngine(game, verify=True)
+        engine.enabled_slots(game)
+        self.assertEqual(engine.full_recomputes, 1)
+        self.assertEqual(engine.routes_evaluated, len(game.selected_map.routes))
+
+        self.assertEqual(engine.enabled_slots(game), engine.enabled_slots(game))
+        self.assertEqual(engine.routes_evaluated, len(game.selected_map.routes))
+
+        route = game.selected_map.routes[3]
+        route.posts[0].claim(game.players[1], "square")
+        engine.enabled_slots(game)
+        self.assertEqual(engine.full_recomputes, 1)
+        self.assertEqual(engine.routes_evaluated, len(game.selected_map.routes) + 1)
+
+    def test_counter_change_falls_back_to_full_recompute(self):
+        game = create_headless_game(2, 3, seed=124)
+        engine = PostLegalityEngine(game, verify=True)
+        engine.enabled_slots(game)
+        game.current_player.personal_supply_circles = 0
+        engine.enabled_slots(game)
+        self.assertEqual(engine.full_recomputes, 2)
+
+    def test_staged_workflows_use_full_generator(self):
+        game = create_headless_game(2, 3, seed=124)
+        engine = PostLegalityEngine(game)
+        game.waiting_for_bm_tribute_trading_post = True
+        expected = [index for index, enabled in enumerate(mask_post_action(game)) if enabled]
+        self.assertEqual(engine.enabled_slots(game), expected)
+        self.assertEqual(engine.delegated_queries, 1)
+
+    def test_verification_reports_divergent_cache(self):
+        game = create_headless_game(2, 3, seed=124)
+        engine = PostLegalityEngine(game, verify=True)
+        engine.enabled_slots(game)
+        cached = engine._players[0]
+        cached.slices[0] = [(not trader, merchant) for trader, merchant in cached.slices[0]]
+        with self.assertRaisesRegex(GameInvariantError, "diverged"):
+            engine.enabled_slots(game)
+
+
+class BoardOccupancyTests(unittest.TestCase):
+    def played_game(self):
+        game = create_headless_game(3, 5, seed=124)
+        rng = random.Random(124)
+        for _ in range(150):
+            legal = legal_action_indices(game)
+            if not legal:
+                break
+            game.apply_ai_action(rng.choice(legal))
+        return game
+
+    def test_counts_match_board_scan(self):
+        game = self.played_game()
+        board = BoardOccupancy(game)
+        posts = [post for route in game.selected_map.routes for post in route.posts]
+        offices = [office for city in game.selected_map.cities for office in city.offices]
+        self.assertEqual(len(board.post_owner), len(posts))
+        self.assertEqual(len(board.office_controller), len(offices))
+        for index, player in enumerate(game.players):
+            for code, shape in ((SQUARE, "square"), (CIRCLE, "circle")):
+                self.assertEqual(
+                    board.post_counts(code)[index],
+                    sum(post.owner is player and post.owner_piece_shape == shape for post in posts),
+                )
+                self.assertEqual(
+                    board.office_counts(code)[index],
+                    sum(
+                        office.controller is player
+                        and (office.owner_piece_shape or office.shape) == shape
+                        for office in offices
+                    ),
+                )
+
+    def test_validation_reports_inconsistent_posts_and_offices(self):
+        game = create_headless_game(2, 3, seed=124)
+        post = game.selected_map.routes[0].posts[0]
+        post.owner = game.players[0]
+        with self.assertRaisesRegex(GameInvariantError, "disagree"):
+            validate_game(game)
+
+        post.owner = object()
+        post.owner_piece_shape = "square"
+        with self.assertRaisesRegex(GameInvariantError, "not a player"):
+            validate_game(game)
+
+        post.owner = None
+        post.owner_piece_shape = None
+        city = game.selected_map.cities[2]
+        city.offices[0].controller = object()
+        with self.assertRaisesRegex(GameInvariantError, f"office in {city.name}"):
+            validate_game(game)
+
+
 if __name__ == "__main__":
     unittest.main()
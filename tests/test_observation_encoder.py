@@ -1,11 +1,14 @@
+import contextlib
 import hashlib
+import io
 import json
+import random
 import sys
 import unittest
 
 import torch
 
-from ai.observation_encoder import ObservationEncoder
+from ai.observation_encoder import ObservationBuffer, ObservationEncoder
 from game.game_actions import refresh_displacement_targets
 from game.game_runner import create_headless_game
 from game.structured_actions import SupplyInteraction, TileInteraction
@@ -184,14 +187,17 @@ class ObservationEncoderTests(unittest.TestCase):
         current.general_stock_squares = 0
         current.general_stock_circles = 0
         displaced.general_stock_squares = 1
+        game.mark_state_changed()
         with_optional_piece = game.get_legal_actions()
         current.general_stock_squares = 5
         current.general_stock_circles = 5
+        game.mark_state_changed()
         self.assertEqual(with_optional_piece, game.get_legal_actions())
         displaced.general_stock_squares = 0
         displaced.general_stock_circles = 0
         displaced.personal_supply_squares = 0
         displaced.personal_supply_circles = 0
+        game.mark_state_changed()
         self.assertNotEqual(
             any(isinstance(action, SupplyInteraction) for action in with_optional_piece),
             any(isinstance(action, SupplyInteraction) for action in game.get_legal_actions()),
@@ -470,5 +476,69 @@ class ObservationEncoderTests(unittest.TestCase):
         )
 
 
+class ObservationBufferTests(unittest.TestCase):
+    MAP_SETUPS = ((1, 5), (2, 3), (3, 4))
+
+    def play(self, game, steps, seed=5):
+        policy_rng = random.Random(seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(steps):
+                legal = game.legal_action_indices()
+                if not legal:
+                    return
+                yield game
+                game.apply_ai_action(policy_rng.choice(legal))
+
+    def test_buffer_and_batch_row_match_fresh_encoding_through_play(self):
+        encoder = ObservationEncoder()
+        for map_num, players in self.MAP_SETUPS:
+            with self.subTest(map_num=map_num):
+                game = create_headless_game(map_num, players, seed=5)
+                buffer = ObservationBuffer(encoder)
+                batch = torch.zeros((2, encoder.FEATURE_SIZE), dtype=torch.int16)
+                row = ObservationBuffer(encoder, batch[1])
+                for step, game in enumerate(self.play(game, 150)):
+                    expected = encoder.get_game_state(game)
+                    self.assertTrue(torch.equal(buffer.encode(game), expected))
+                    row.encode(game)
+                    self.assertTrue(torch.equal(batch[1], expected))
+                    observer = step % players
+                    self.assertTrue(
+                        torch.equal(
+                            buffer.encode(game, observer_index=observer),
+                            encoder.get_game_state(game, observer_index=observer),
+                        )
+                    )
+                self.assertFalse(batch[0].any())
+                self.assertGreater(buffer.segments_skipped, 0)
+
+    def test_unchanged_blocks_are_not_rewritten(self):
+        game = create_headless_game(2, 3, seed=5)
+        buffer = ObservationBuffer()
+        buffer.encode(game)
+        written = buffer.segments_written
+        buffer.encode(game)
+
+        self.assertEqual(buffer.segments_written, written)
+        buffer.invalidate()
+        buffer.encode(game)
+        self.assertEqual(buffer.segments_written, 2 * written)
+
+    def test_build_reuses_buffer_and_rejects_incompatible_rows(self):
+        game = create_headless_game(1, 3, seed=124)
+        encoder = ObservationEncoder()
+        buffer = ObservationBuffer(encoder)
+
+        observation = encoder.build(game, buffer)
+
+        self.assertIs(observation.features, buffer.features)
+        self.assertTrue(torch.equal(observation.features, encoder.build(game).features))
+        with self.assertRaises(ValueError):
+            ObservationBuffer(encoder, torch.zeros(encoder.FEATURE_SIZE, dtype=torch.int32))
+        with self.assertRaises(ValueError):
+            strided = torch.zeros((encoder.FEATURE_SIZE, 2), dtype=torch.int16)[:, 0]
+            ObservationBuffer(encoder, strided)
+
+
 if __name__ == "__main__":
     unittest.main()
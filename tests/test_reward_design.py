@@ -1,6 +1,10 @@
+import contextlib
+import io
+import random
 import unittest
 
 from game.game_runner import create_headless_game
+from game.score_ledger import ScoreLedger
 from game.structured_actions import IncomeInteraction
 from map_data.constants import UPGRADE_MAX_VALUES
 from map_data.map_attributes import BonusMarker
@@ -103,6 +107,33 @@ class RewardDesignTests(unittest.TestCase):
         self.assertTrue(all(not hasattr(player, "reward") for player in game.players))
         self.assertTrue(all(not hasattr(player, "reward_structure") for player in game.players))
 
+    def test_score_ledger_matches_full_projection_through_played_games(self):
+        for map_num, players in ((1, 4), (3, 5)):
+            game = create_headless_game(map_num, players, seed=124)
+            ledger = ScoreLedger(game, verify=True)
+            rng = random.Random(map_num)
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(300):
+                    legal = game.legal_action_indices()
+                    if not legal:
+                        break
+                    game.apply_ai_action(rng.choice(legal))
+                    ledger.scores(game)
+            self.assertEqual(ledger.full_refreshes, 1)
+            self.assertLess(ledger.cities_refreshed, 300 * len(game.selected_map.cities) // 10)
+
+    def test_score_ledger_refreshes_only_changed_cities(self):
+        game = self.game()
+        player = game.players[0]
+        ledger = ScoreLedger(game, verify=True)
+        ledger.scores(game)
+        refreshed = ledger.cities_refreshed
+
+        game.selected_map.cities[0].offices[0].controller = player
+        self.assertEqual(ledger.breakdown(game, player)["City Control Points"], 2)
+        self.assertEqual(ledger.cities_refreshed, refreshed + 1)
+        self.assertEqual(ledger.networks_refreshed, len(game.players) + 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,7 @@
 from dataclasses import replace
 import math
 from pathlib import Path
+import random
 import tempfile
 import unittest
 from unittest import mock
@@ -9,7 +10,7 @@ import torch
 
 from ai.ai_model import HansaNN, device
 from ai.observation_encoder import ObservationEncoder
-from ai.observation_schema import LEGACY_OBSERVATION_SCHEMA_V1_FINGERPRINT
+from ai.observation_schema import LEGACY_OBSERVATION_SCHEMA_V1_FINGERPRINT, OBSERVATION_SIZE
 from game.action_codec import DEFAULT_ACTION_CODEC
 from game.action_schema import ACTION_SCHEMA_VERSION, ACTION_SPACE_SIZE
 from game.persistence import load_game
@@ -27,6 +28,7 @@ from training.self_play import (
     TrainingConfig,
     TrainingDecision,
     _is_normal_move_in_progress,
+    action_set_loss,
     action_phase_selection_groups,
     apply_all_move_turn_target,
     apply_income_efficiency_penalty,
@@ -49,6 +51,7 @@ from training.self_play import (
     movement_efficiency_penalty,
     move_workflow_exploration_categories,
     normalized_rank_weights,
+    pack_action_sets,
     pointless_movement_penalty,
     pointless_route_claim_penalty,
     route_building_post_reward,
@@ -64,6 +67,7 @@ from game.structured_actions import (
     RouteInteraction,
 )
 from tests.action_helpers import self_play_test_state
+from training.replay_buffer import ReplayBuffer, ReplayBufferError
 
 
 STATE = self_play_test_state()
@@ -740,9 +744,9 @@ class SelfPlayTrainingTests(unittest.TestCase):
         selected_tiers = []
         select_action = trainer._select_action
 
-        def capture_tier(scores, legal_indices, tier, equivalent_groups=None):
+        def capture_tier(scores, legal_indices, tier, equivalent_groups=None, rng=None):
             selected_tiers.append(tier)
-            return select_action(scores, legal_indices, tier, equivalent_groups)
+            return select_action(scores, legal_indices, tier, equivalent_groups, rng)
 
         trainer._select_action = capture_tier
         trainer.collect_game(STATE, evaluation=True)
@@ -1220,6 +1224,47 @@ class SelfPlayTrainingTests(unittest.TestCase):
         )
         self.assertEqual(first.final_scores, second.final_scores)
 
+    def test_batched_collection_matches_sequential_games_per_seed(self):
+        seeds = (11, 12, 13)
+        sequential = []
+        trainer = self.trainer(seed=99)
+        for seed in seeds:
+            trainer.rng.seed(seed)
+            sequential.append(trainer.collect_game(STATE))
+
+        batched = self.trainer(seed=99).collect_games((STATE,) * len(seeds), seeds=seeds)
+
+        self.assertEqual(len(batched), len(seeds))
+        for expected, actual in zip(sequential, batched):
+            self.assertEqual(actual.action_trace, expected.action_trace)
+            self.assertEqual(actual.seat_tiers, expected.seat_tiers)
+            self.assertEqual(actual.terminal_rewards, expected.terminal_rewards)
+            self.assertEqual(actual.final_scores, expected.final_scores)
+            self.assertEqual(
+                [decision.reward_to_go for decision in actual.decisions],
+                [decision.reward_to_go for decision in expected.decisions],
+            )
+
+    def test_batched_collection_reports_failures_in_input_order(self):
+        trainer = self.trainer(seed=5)
+        failure = RuntimeError("engine failure")
+        real_load_game = load_game
+
+        def load(state, **kwargs):
+            if state == "broken":
+                raise failure
+            return real_load_game(state, **kwargs)
+
+        with mock.patch("training.self_play.load_game", side_effect=load):
+            results = trainer.collect_games((STATE, "broken"), seeds=(1, 2), return_exceptions=True)
+            with self.assertRaises(RuntimeError):
+                trainer.collect_games((STATE, "broken"), seeds=(1, 2))
+
+        self.assertTrue(results[0].action_trace)
+        self.assertIs(results[1], failure)
+        with self.assertRaises(ValueError):
+            trainer.collect_games((STATE, STATE), seeds=(1,))
+
     def test_discounted_reward_to_go_is_separate_for_each_player(self):
         decisions = (
             training_decision(1, 0, (100, 0), 100, turn=1),
@@ -1556,5 +1601,86 @@ class SelfPlayTrainingTests(unittest.TestCase):
         self.assertFalse(inference_model.training)
 
 
+def stored_decision(action, target, immediate=0.0, equivalent_action_indices=()):
+    return replace(
+        training_decision(
+            action, 0, (immediate,), immediate, equivalent_action_indices=equivalent_action_indices
+        ),
+        observation=torch.full((OBSERVATION_SIZE,), action, dtype=torch.int16),
+        reward_to_go=target,
+    )
+
+
+class ReplayBufferTests(unittest.TestCase):
+    def test_buffer_evicts_oldest_and_reopens_where_it_stopped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            buffer = ReplayBuffer(directory, capacity=4)
+            buffer.add(stored_decision(action, float(action)) for action in range(3))
+            buffer.add(
+                [stored_decision(3, 3.0), stored_decision(4, 4.0, equivalent_action_indices=(4, 9))]
+            )
+            self.assertEqual((len(buffer), buffer.cursor, buffer.added), (4, 1, 5))
+
+            reopened = ReplayBuffer(directory)
+            batch = reopened.sample(10, random.Random(1))
+            self.assertEqual(sorted(batch.action_indices.tolist()), [1, 2, 3, 4])
+            row = batch.action_indices.tolist().index(4)
+            self.assertEqual(batch.observations[row, 0].item(), 4)
+            actions = batch.action_sets[row][batch.action_set_valid[row]]
+            self.assertEqual(actions.tolist(), [4, 9])
+            self.assertEqual(batch.targets[row].item(), 4.0)
+            with self.assertRaisesRegex(ReplayBufferError, "holds 4 decisions"):
+                ReplayBuffer(directory, capacity=8)
+            with self.assertRaisesRegex(ReplayBufferError, "training targets"):
+                reopened.add([replace(stored_decision(5, 0.0), reward_to_go=None)])
+
+    def test_sampling_prefers_large_rewards(self):
+        with tempfile.TemporaryDirectory() as directory:
+            buffer = ReplayBuffer(directory, capacity=20, priority_exponent=1.0)
+            buffer.add(stored_decision(action, 0.0) for action in range(19))
+            buffer.add([stored_decision(19, 0.0, immediate=500.0)])
+            rng = random.Random(3)
+            draws = [buffer.sample(1, rng).action_indices.item() for _ in range(50)]
+        self.assertGreater(draws.count(19), 25)
+
+    def test_action_set_loss_matches_per_row_loss(self):
+        decisions = [
+            stored_decision(4, 1.0),
+            stored_decision(7, -2.0, equivalent_action_indices=(7, 8, 9)),
+            stored_decision(0, 0.5, equivalent_action_indices=(0, 767)),
+        ]
+        weights = torch.randn(len(decisions), ACTION_SPACE_SIZE, requires_grad=True)
+        targets = torch.tensor([decision.reward_to_go for decision in decisions])
+
+        expected = torch.stack(
+            [
+                torch.nn.functional.smooth_l1_loss(
+                    weights[row, torch.as_tensor(actions)],
+                    targets[row].expand(len(actions)),
+                )
+                for row, actions in enumerate(((4,), (7, 8, 9), (0, 767)))
+            ]
+        ).mean()
+        (expected_gradient,) = torch.autograd.grad(expected, weights)
+        action_indices, valid = pack_action_sets(decisions)
+        actual = action_set_loss(weights, targets, action_indices, valid)
+        (actual_gradient,) = torch.autograd.grad(actual, weights)
+
+        self.assertEqual(action_indices.tolist(), [[4, 0, 0], [7, 8, 9], [0, 767, 0]])
+        self.assertTrue(torch.allclose(actual, expected))
+        self.assertTrue(torch.allclose(actual_gradient, expected_gradient))
+
+    def test_trainer_learns_from_prioritized_replay_batches(self):
+        trainer = SelfPlayTrainingTests.trainer(None)
+        trainer.config = replace(trainer.config, decision_batch_size=8, replay_batches=3)
+        trajectory = trainer.collect_game(STATE)
+        with tempfile.TemporaryDirectory() as directory:
+            trainer.replay_buffer = ReplayBuffer(directory, capacity=1000)
+            loss = trainer.update_model((trajectory,))
+            self.assertEqual(len(trainer.replay_buffer), len(trajectory.decisions))
+        self.assertGreater(loss, 0)
+        self.assertEqual(trainer.progress.training_updates, 3)
+
+
 if __name__ == "__main__":
     unittest.main()
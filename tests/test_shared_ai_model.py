@@ -1,15 +1,22 @@
+from pathlib import Path
 import random
+import tempfile
+import threading
+import time
 import unittest
 from unittest import mock
 
 import torch
 
+from ai.ai_model import HansaNN, inference_model, load_inference_model
+from ai.inference_server import InferenceServer, InferenceServerError
 from ai.observation_encoder import ObservationEncoder
 from ai.observation_schema import OBSERVATION_SIZE
 from drawing.game_window import GameWindow
 from game.action_schema import ACTION_SPACE_SIZE
 from game.game_config import GameConfiguration, PlayerControl
-from game.game_runner import legal_action_indices, select_progress_action
+from game.game_runner import create_headless_game, legal_action_indices, select_progress_action
+from tools.compare_inference_precision import compare_precisions
 
 
 class ProgressModel:
@@ -79,5 +86,83 @@ class SharedAIModelTests(unittest.TestCase):
         self.assertIn(2, model.observer_indices)
 
 
+class InferencePrecisionTests(unittest.TestCase):
+    def test_reduced_precision_copies_score_close_to_float32(self):
+        model = HansaNN()
+        observation = torch.randint(-5, 50, (3, OBSERVATION_SIZE)).float()
+        with torch.no_grad():
+            expected = model(observation)
+            for precision in ("int8", "bfloat16"):
+                with self.subTest(precision=precision):
+                    candidate = inference_model(model, precision)
+                    scores = candidate(observation)
+                    self.assertEqual(candidate.precision, precision)
+                    self.assertEqual(scores.dtype, torch.float32)
+                    self.assertLess((scores - expected).abs().max().item(), 0.5)
+        self.assertIs(inference_model(model, "float32"), model)
+        self.assertEqual(model.precision, "float32")
+        with self.assertRaisesRegex(ValueError, "Unknown inference precision"):
+            inference_model(model, "int4")
+
+    def test_quantized_copy_loads_from_checkpoint_but_is_never_saved(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = HansaNN().save_model(Path(directory) / "model.pth")
+            quantized = load_inference_model(path, "int8")
+            with self.assertRaisesRegex(ValueError, "Only float32"):
+                quantized.save_model(Path(directory) / "quantized.pth")
+        with self.assertRaisesRegex(ValueError, "precision"):
+            GameConfiguration(ai_precision="int4")
+
+    def test_agreement_harness_counts_every_compared_decision(self):
+        game = create_headless_game(2, 3, seed=124)
+        reference, results = compare_precisions(HansaNN(), [game], ["int8"], top_k=3, steps=4)
+        self.assertEqual(reference.positions, 4)
+        self.assertEqual((reference.top_one_rate, reference.top_k_rate), (1.0, 1.0))
+        self.assertEqual(results["int8"].positions, 4)
+        self.assertLessEqual(results["int8"].top_k_rate, 1.0)
+
+
+class InferenceServerTests(unittest.TestCase):
+    def test_server_batches_concurrent_rows_and_swaps_replaced_weights(self):
+        observations = torch.randint(-5, 50, (4, OBSERVATION_SIZE)).float()
+        with tempfile.TemporaryDirectory() as directory:
+            path = HansaNN().save_model(Path(directory) / "model.pth")
+            with torch.no_grad():
+                expected = HansaNN(model_file=path)(observations)
+            server = InferenceServer(path, max_batch_size=4, max_latency=5.0, reload_interval=0.05)
+            with server:
+                clients = [server.client() for _ in observations]
+                barrier = threading.Barrier(len(clients))
+                scores = [None] * len(clients)
+
+                def score(row):
+                    barrier.wait()
+                    scores[row] = clients[row](observations[row])
+
+                threads = [threading.Thread(target=score, args=(row,)) for row in range(4)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                self.assertEqual([client.batch_rows for client in clients], [4, 4, 4, 4])
+                self.assertTrue(torch.allclose(torch.stack(scores), expected))
+
+                replacement = HansaNN()
+                with torch.no_grad():
+                    replacement.layer3.bias += 1
+                    updated = replacement(observations)
+                replacement.save_model(path)
+                client = server.client()
+                for _attempt in range(100):
+                    swapped = client(observations)
+                    if client.model_version == 2:
+                        break
+                    time.sleep(0.05)
+                self.assertEqual(client.model_version, 2)
+                self.assertTrue(torch.allclose(swapped, updated))
+            with self.assertRaises(InferenceServerError):
+                client(observations)
+
+
 if __name__ == "__main__":
     unittest.main()
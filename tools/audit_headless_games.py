@@ -17,7 +17,8 @@ if str(ROOT) not in sys.path:
 
 from game.action_schema import ACTION_RANGES, action_schema_metadata
 from game.action_validation import validate_action_state
-from game.game_runner import create_headless_game, run_game
+from game.game_runner import ReplayRecord, create_headless_game, run_game
+from game.replay_archive import write_replay_archive
 
 
 def validate_fresh_state(map_num, num_players, seed):
@@ -64,6 +65,7 @@ def validate_complete_game(map_num, num_players, seed):
             "deterministic": deterministic,
             "trace_sha256": hashlib.sha256(trace_bytes).hexdigest(),
             "observed_action_indices": sorted(set(first.action_trace)),
+            "action_trace": first.action_trace,
             "duration_seconds": round(time.time() - started, 3),
         }
     except Exception as error:
@@ -90,6 +92,10 @@ def main():
     parser.add_argument("--seeds", nargs="+", type=int, default=[124, 125])
     parser.add_argument("--full-game-seeds", nargs="+", type=int, default=[124])
     parser.add_argument("--out", default="audit_results.json")
+    parser.add_argument(
+        "--replay-archive",
+        help="also write every complete game's trace to this replay archive",
+    )
     args = parser.parse_args()
 
     fresh_tasks = [
@@ -105,7 +111,17 @@ def main():
         for seed in args.full_game_seeds
     ]
     fresh_results = run_parallel(validate_fresh_state, fresh_tasks)
-    game_results = run_parallel(validate_complete_game, game_tasks)
+    game_results = sorted(
+        run_parallel(validate_complete_game, game_tasks),
+        key=lambda item: (item["map"], item["players"], item["seed"]),
+    )
+    traces = [
+        ReplayRecord(result["map"], result["players"], result["seed"], result.pop("action_trace"))
+        for result in game_results
+        if "action_trace" in result
+    ]
+    if args.replay_archive:
+        write_replay_archive(traces, args.replay_archive)
 
     active_count = sum(action_range.active_capacity for action_range in ACTION_RANGES)
     reserved_count = sum(action_range.reserved_capacity for action_range in ACTION_RANGES)
@@ -124,9 +140,7 @@ def main():
         "fresh_state_results": sorted(
             fresh_results, key=lambda item: (item["map"], item["players"], item["seed"])
         ),
-        "complete_game_results": sorted(
-            game_results, key=lambda item: (item["map"], item["players"], item["seed"])
-        ),
+        "complete_game_results": game_results,
         "observed_complete_game_indices": observed,
         "unobserved_complete_game_indices": sorted(assigned - set(observed)),
         "proven_unreachable_indices": [],
@@ -145,6 +159,8 @@ def main():
         f"/{len(game_results)} passed"
     )
     print(f"Wrote {args.out}")
+    if args.replay_archive:
+        print(f"Wrote {len(traces)} replays to {args.replay_archive}")
     return 1 if failures else 0
 
 
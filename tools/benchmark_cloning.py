@@ -0,0 +1,116 @@
+"""Compare pickle round trips with GameSnapshot recording and Game.clone on played positions.
+
+A second table times building a fresh game against restoring a pristine snapshot of one, the
+cost a cached per-configuration template would pay before redrawing its seeded setup.
+"""
+
+import argparse
+import contextlib
+import io
+from pathlib import Path
+import pickle
+import random
+import sys
+import timeit
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from game.action_validation import state_fingerprint
+from game.cloning import GameSnapshot
+from game.game_info import Game
+from game.game_runner import create_headless_game
+
+
+def played_game(map_num, num_players, seed, steps):
+    game = create_headless_game(map_num, num_players, seed=seed)
+    policy_rng = random.Random(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(steps):
+            legal = game.legal_action_indices()
+            if not legal:
+                break
+            game.apply_ai_action(policy_rng.choice(legal))
+    return game
+
+
+def best_milliseconds(function, number, repeat):
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1000
+
+
+def benchmark(map_num, num_players, seed, steps, number, repeat):
+    game = played_game(map_num, num_players, seed, steps)
+    game.get_legal_actions()
+    payload = pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL)
+    snapshot = GameSnapshot(game)
+    if state_fingerprint(snapshot.restore()) != state_fingerprint(game):
+        raise AssertionError("restored snapshot differs from the original game")
+    return {
+        "map": map_num,
+        "players": num_players,
+        "pickle_dumps_ms": best_milliseconds(
+            lambda: pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL), number, repeat
+        ),
+        "pickle_loads_ms": best_milliseconds(lambda: pickle.loads(payload), number, repeat),
+        "clone_ms": best_milliseconds(game.clone, number, repeat),
+        "snapshot_ms": best_milliseconds(lambda: GameSnapshot(game), number, repeat),
+        "restore_ms": best_milliseconds(snapshot.restore, number, repeat),
+    }
+
+
+def benchmark_setup(map_num, num_players, seed, number, repeat):
+    def new_game():
+        return Game(map_num, num_players, seed=seed, interactive_errors=False)
+
+    template = GameSnapshot(new_game())
+    if pickle.dumps(template.restore()) != pickle.dumps(new_game()):
+        raise AssertionError("restored template differs from a new game")
+    return {
+        "map": map_num,
+        "players": num_players,
+        "constructor_ms": best_milliseconds(new_game, number, repeat),
+        "headless_ms": best_milliseconds(
+            lambda: create_headless_game(map_num, num_players, seed=seed), number, repeat
+        ),
+        "template_ms": best_milliseconds(template.restore, number, repeat),
+    }
+
+
+def print_rows(columns, rows):
+    print("map players " + " ".join(f"{column:>16}" for column in columns))
+    for row in rows:
+        print(
+            f"{row['map']:>3} {row['players']:>7} "
+            + " ".join(f"{row[column]:>16.3f}" for column in columns)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--number", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    configurations = ((1, 5), (2, 3), (3, 4))
+    print_rows(
+        ("pickle_dumps_ms", "pickle_loads_ms", "clone_ms", "snapshot_ms", "restore_ms"),
+        [
+            benchmark(map_num, num_players, args.seed, args.steps, args.number, args.repeat)
+            for map_num, num_players in configurations
+        ],
+    )
+    print()
+    print_rows(
+        ("constructor_ms", "headless_ms", "template_ms"),
+        [
+            benchmark_setup(map_num, num_players, args.seed, args.number, args.repeat)
+            for map_num, num_players in configurations
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Time one learner update with the per-row and the packed equivalent-action loss."""
+
+import argparse
+from pathlib import Path
+import random
+import sys
+import timeit
+
+import torch
+import torch.nn.functional as functional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from ai.ai_model import HansaNN, device  # noqa: E402
+from ai.observation_schema import OBSERVATION_SIZE  # noqa: E402
+from game.action_schema import ACTION_SPACE_SIZE  # noqa: E402
+from training.self_play import TrainingDecision, action_set_loss, pack_action_sets  # noqa: E402
+
+
+def synthetic_decisions(count, max_equivalent_actions, seed):
+    rng = random.Random(seed)
+    decisions = []
+    for _ in range(count):
+        action_count = rng.randint(1, max_equivalent_actions)
+        actions = tuple(sorted(rng.sample(range(ACTION_SPACE_SIZE), action_count)))
+        decisions.append(
+            TrainingDecision(
+                torch.randint(-5, 50, (OBSERVATION_SIZE,), dtype=torch.int16),
+                torch.ones(ACTION_SPACE_SIZE, dtype=torch.uint8),
+                actions[0],
+                0,
+                (0.0,),
+                0.0,
+                1,
+                0.0,
+                None,
+                False,
+                1,
+                ACTION_SPACE_SIZE,
+                reward_to_go=rng.uniform(-500, 500),
+                equivalent_action_indices=actions if action_count > 1 else (),
+            )
+        )
+    return decisions
+
+
+def per_row_loss(model_outputs, targets, decisions):
+    """The loss as ``update_model`` computed it before packing: one call per row."""
+    return torch.stack(
+        [
+            functional.smooth_l1_loss(
+                model_outputs[
+                    row,
+                    torch.as_tensor(
+                        decision.equivalent_action_indices or (decision.action_index,),
+                        dtype=torch.long,
+                        device=device,
+                    ),
+                ],
+                targets[row].expand(
+                    len(decision.equivalent_action_indices or (decision.action_index,))
+                ),
+            )
+            for row, decision in enumerate(decisions)
+        ]
+    ).mean()
+
+
+def packed_loss(model_outputs, targets, decisions):
+    action_indices, valid = pack_action_sets(decisions)
+    return action_set_loss(model_outputs, targets, action_indices.to(device), valid.to(device))
+
+
+def best_milliseconds(function, number, repeat):
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1000
+
+
+def benchmark(model, optimizer, decisions, number, repeat):
+    observations = torch.stack([decision.observation for decision in decisions]).float().to(device)
+    targets = torch.tensor(
+        [decision.reward_to_go for decision in decisions], dtype=torch.float32, device=device
+    )
+    outputs = model(observations).detach().requires_grad_()
+    if not torch.allclose(
+        per_row_loss(outputs, targets, decisions), packed_loss(outputs, targets, decisions)
+    ):
+        raise AssertionError("packed loss differs from the per-row loss")
+
+    def update(loss_function):
+        def step():
+            optimizer.zero_grad()
+            loss_function(model(observations), targets, decisions).backward()
+            optimizer.step()
+
+        return step
+
+    return {
+        "per_row_loss_ms": best_milliseconds(
+            lambda: per_row_loss(outputs, targets, decisions).backward(), number, repeat
+        ),
+        "packed_loss_ms": best_milliseconds(
+            lambda: packed_loss(outputs, targets, decisions).backward(), number, repeat
+        ),
+        "per_row_update_ms": best_milliseconds(update(per_row_loss), number, repeat),
+        "packed_update_ms": best_milliseconds(update(packed_loss), number, repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[32, 256])
+    parser.add_argument("--max-equivalent-actions", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    torch.manual_seed(args.seed)
+    model = HansaNN()
+    model.train()
+    optimizer = torch.optim.Adam(model.parameters(), lr=0.0001)
+    columns = ("per_row_loss_ms", "packed_loss_ms", "per_row_update_ms", "packed_update_ms")
+    print("batch " + " ".join(f"{column:>18}" for column in columns))
+    for batch_size in args.batch_sizes:
+        decisions = synthetic_decisions(batch_size, args.max_equivalent_actions, args.seed)
+        row = benchmark(model, optimizer, decisions, args.number, args.repeat)
+        print(f"{batch_size:>5} " + " ".join(f"{row[column]:>18.3f}" for column in columns))
+
+
+if __name__ == "__main__":
+    main()
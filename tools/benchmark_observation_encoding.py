@@ -0,0 +1,66 @@
+"""Time fresh observation encodes against ObservationBuffer refreshes on played positions."""
+
+import argparse
+import contextlib
+import io
+from pathlib import Path
+import random
+import sys
+from time import perf_counter
+
+import torch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from ai.observation_encoder import ObservationBuffer, ObservationEncoder  # noqa: E402
+from game.game_runner import create_headless_game  # noqa: E402
+
+
+def played_positions(map_num, num_players, seed, steps):
+    """Yield the same game after each random legal action."""
+    game = create_headless_game(map_num, num_players, seed=seed)
+    policy_rng = random.Random(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(steps):
+            legal = game.legal_action_indices()
+            if not legal:
+                return
+            yield game
+            game.apply_ai_action(policy_rng.choice(legal))
+
+
+def benchmark(encoder, map_num, num_players, seed, steps):
+    rates = {}
+    for mode in ("fresh", "buffer"):
+        buffer = ObservationBuffer(encoder)
+        encode = encoder.get_game_state if mode == "fresh" else buffer.encode
+        elapsed = 0.0
+        count = 0
+        for game in played_positions(map_num, num_players, seed, steps):
+            started = perf_counter()
+            features = encode(game)
+            elapsed += perf_counter() - started
+            count += 1
+            if mode == "buffer" and not torch.equal(features, encoder.get_game_state(game)):
+                raise AssertionError("buffered observation differs from a fresh encode")
+        rates[mode] = count / elapsed if elapsed else float("nan")
+    return {"map": map_num, "players": num_players, **rates}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--steps", type=int, default=200)
+    args = parser.parse_args()
+
+    encoder = ObservationEncoder()
+    print("map players  fresh encodes/s  buffer encodes/s")
+    for map_num, num_players in ((1, 5), (2, 3), (3, 4)):
+        row = benchmark(encoder, map_num, num_players, args.seed, args.steps)
+        print(f"{row['map']:>3} {row['players']:>7} {row['fresh']:>16.0f} {row['buffer']:>17.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Report how often reduced-precision inference picks the same actions as float32.
+
+Every evaluation-suite position is played forward with the float32 model's
+best legal action, and at each decision the legal actions are ranked by the
+float32 model and by each reduced-precision copy. The report gives top-1
+agreement, the mean overlap of the top-k sets and the time per observation,
+so a deployment can choose its precision from measured fidelity and speed.
+"""
+
+import argparse
+import contextlib
+from dataclasses import dataclass
+import io
+import json
+from pathlib import Path
+import sys
+from time import perf_counter
+
+import torch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from ai.ai_model import SHARED_MODEL_FILE, HansaNN, inference_model  # noqa: E402
+from ai.observation_encoder import ObservationEncoder  # noqa: E402
+from game.game_config import AI_INFERENCE_PRECISIONS  # noqa: E402
+from game.persistence import load_game  # noqa: E402
+
+DEFAULT_SUITE = ROOT / "training_data/generated/evaluation"
+
+
+@dataclass
+class PrecisionAgreement:
+    precision: str
+    top_k: int
+    positions: int = 0
+    top_one_matches: int = 0
+    top_k_overlap: float = 0.0
+    seconds: float = 0.0
+
+    @property
+    def top_one_rate(self):
+        return self.top_one_matches / self.positions if self.positions else None
+
+    @property
+    def top_k_rate(self):
+        return self.top_k_overlap / self.positions if self.positions else None
+
+    @property
+    def milliseconds_per_observation(self):
+        return self.seconds / self.positions * 1000 if self.positions else None
+
+    def record(self, reference_scores, scores, legal_indices, seconds):
+        legal = torch.as_tensor(legal_indices, dtype=torch.long)
+        count = min(self.top_k, len(legal_indices))
+        expected = legal[reference_scores[legal].topk(count).indices]
+        actual = legal[scores[legal].topk(count).indices]
+        self.positions += 1
+        self.top_one_matches += int(expected[0] == actual[0])
+        self.top_k_overlap += len(set(expected.tolist()) & set(actual.tolist())) / count
+        self.seconds += seconds
+
+
+def _timed_scores(model, observation):
+    started = perf_counter()
+    with torch.no_grad():
+        scores = model(observation.unsqueeze(0)).squeeze(0)
+    return scores, perf_counter() - started
+
+
+def compare_precisions(model, games, precisions, *, top_k=5, steps=20):
+    """Play ``games`` forward with ``model`` and compare each precision's rankings."""
+    encoder = ObservationEncoder()
+    candidates = {precision: inference_model(model, precision) for precision in precisions}
+    results = {precision: PrecisionAgreement(precision, top_k) for precision in precisions}
+    reference = PrecisionAgreement("float32", top_k)
+    for game in games:
+        for _ in range(steps):
+            legal_indices = game.legal_action_indices()
+            if game.game_end or not legal_indices:
+                break
+            observation = encoder.get_game_state(game).float()
+            reference_scores, seconds = _timed_scores(model, observation)
+            reference.record(reference_scores, reference_scores, legal_indices, seconds)
+            for precision, candidate in candidates.items():
+                scores, seconds = _timed_scores(candidate, observation)
+                results[precision].record(reference_scores, scores, legal_indices, seconds)
+            best = max(legal_indices, key=lambda index: reference_scores[index])
+            with contextlib.redirect_stdout(io.StringIO()):
+                game.apply_ai_action(best)
+    return reference, results
+
+
+def suite_games(suite_directory):
+    manifest = json.loads((Path(suite_directory) / "manifest.json").read_text(encoding="utf-8"))
+    for item in manifest:
+        yield load_game(Path(suite_directory) / item["save_file"], trusted=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", type=Path, default=ROOT / SHARED_MODEL_FILE)
+    parser.add_argument("--suite", type=Path, default=DEFAULT_SUITE)
+    parser.add_argument(
+        "--precisions",
+        nargs="+",
+        choices=[precision for precision in AI_INFERENCE_PRECISIONS if precision != "float32"],
+        default=["int8", "bfloat16"],
+    )
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--steps", type=int, default=20, help="decisions compared per position")
+    args = parser.parse_args()
+
+    torch.set_num_threads(1)
+    model = HansaNN(model_file=args.model)
+    reference, results = compare_precisions(
+        model, suite_games(args.suite), args.precisions, top_k=args.top_k, steps=args.steps
+    )
+    print(f"{reference.positions} decisions; top-{args.top_k} overlap of legal actions")
+    print("precision  top-1 agree  top-k overlap  ms/observation  speedup")
+    for result in (reference, *results.values()):
+        speedup = reference.seconds / result.seconds if result.seconds else float("nan")
+        print(
+            f"{result.precision:<9} {result.top_one_rate:>12.3f} {result.top_k_rate:>14.3f} "
+            f"{result.milliseconds_per_observation:>15.3f} {speedup:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ from training.curriculum import (  # noqa: E402
     CurriculumConfig,
     PromotionCriteria,
 )
+from training.replay_buffer import ReplayBuffer  # noqa: E402
 from training.self_play import SelfPlayTrainer, TrainingConfig  # noqa: E402
 
 
@@ -58,6 +59,41 @@ def parse_args(argv=None):
     parser.add_argument("--loss-tolerance", type=float, default=0.10)
     parser.add_argument("--rolling-loss-window", type=int, default=5)
     parser.add_argument("--skip-tier-one-promotion-check", action="store_true")
+    parser.add_argument(
+        "--rollout-workers",
+        type=int,
+        default=0,
+        help="Worker processes that generate and play learning games (0 plays them in-process)",
+    )
+    parser.add_argument(
+        "--weight-sync-interval",
+        type=int,
+        default=1,
+        help="Learning games between saving the latest weights for rollout workers",
+    )
+    parser.add_argument(
+        "--evaluation-workers",
+        type=int,
+        default=0,
+        help="Worker processes that play the evaluation suite (0 plays it in-process)",
+    )
+    parser.add_argument(
+        "--prefetch-states",
+        type=int,
+        default=0,
+        help="Worker processes that generate upcoming in-process learning states ahead of play",
+    )
+    parser.add_argument(
+        "--replay-buffer",
+        type=Path,
+        help="Directory of a persistent replay buffer the learner samples its batches from",
+    )
+    parser.add_argument(
+        "--replay-buffer-capacity",
+        type=int,
+        help="Decisions a new replay buffer holds before evicting the oldest "
+        "(an existing buffer keeps its own capacity)",
+    )
     return parser.parse_args(argv)
 
 
@@ -73,6 +109,8 @@ def main(argv=None):
             model=HansaNN(model_file=args.playable_model),
             config=TrainingConfig(seed=args.seed),
         )
+    if args.replay_buffer is not None:
+        trainer.replay_buffer = ReplayBuffer(args.replay_buffer, args.replay_buffer_capacity)
 
     config = CurriculumConfig(
         iterations=args.batch,
@@ -81,6 +119,10 @@ def main(argv=None):
         update_batch_size=args.batch_size,
         retry_limit=args.retry_limit,
         seed=args.seed,
+        rollout_workers=args.rollout_workers,
+        weight_sync_interval=args.weight_sync_interval,
+        evaluation_workers=args.evaluation_workers,
+        prefetch_states=args.prefetch_states,
         promotion=PromotionCriteria(
             maximum_unfinished_rate=args.maximum_unfinished_rate,
             minimum_evaluation_completion_rate=args.minimum_evaluation_completion,
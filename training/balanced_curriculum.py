@@ -122,6 +122,20 @@ class BalancedCurriculumRunner(CurriculumRunner):
         state["training_generation_number"] = self.training_generation_number
         return state
 
+    def _generation_offset(self):
+        return self.training_generation_number - self.game_number
+
+    def _begin_training_game(self, game_number, generation_offset):
+        # Rollout workers cannot share the generation counter, so each game
+        # number starts at its own position in the configuration rotation and
+        # only its retries advance from there.
+        self.training_generation_number = game_number + generation_offset
+
+    def _generation_state(self):
+        state = super()._generation_state()
+        state["training_generation_number"] = self.training_generation_number
+        return state
+
     def _configuration_for_game(self):
         block, index = divmod(self.training_generation_number, len(CONFIGURATIONS))
         configurations = list(CONFIGURATIONS)
@@ -174,7 +188,9 @@ class BalancedCurriculumRunner(CurriculumRunner):
                 use_promo_markers=use_promos,
                 seed=seed,
             )
-            path = save_game(configuration.create_game(), directory / f"full-{seed}.hansa")
+            path = save_game(
+                configuration.create_game(), directory / f"full-{seed}.hansa", compact=True
+            )
             descriptor = StateDescriptor(path, None, map_num, player_count, seed, "fresh", "fresh")
             self._latest_descriptor = descriptor
             if is_training_generation:
@@ -213,7 +229,7 @@ class BalancedCurriculumRunner(CurriculumRunner):
                 development_range=maturity.development_range,
             )
         )
-        path, metadata_path = save_balanced_state(generated, directory)
+        path, metadata_path = save_balanced_state(generated, directory, compact=True)
         scenario = "+".join(
             (
                 maturity.name,
@@ -447,6 +447,7 @@ def _is_valid_generated_state(game, request):
         validate_loaded_game(game)
     except GameInvariantError:
         return False
+    game.mark_state_changed()
     if game.game_end or not game.get_legal_actions():
         return False
     if (
@@ -550,7 +551,7 @@ def generate_balanced_state(request, *, max_attempts=2_000):
     )
 
 
-def save_balanced_state(generated, output_directory):
+def save_balanced_state(generated, output_directory, *, compact=False):
     request = generated.request
     identity = {
         "generator_version": GENERATOR_VERSION,
@@ -582,7 +583,7 @@ def save_balanced_state(generated, output_directory):
         / f"map_{request.map_num}"
         / f"{request.player_count}_players"
     )
-    save_path = save_game(generated.game, directory / f"state-{state_id}.hansa")
+    save_path = save_game(generated.game, directory / f"state-{state_id}.hansa", compact=compact)
     validate_loaded_game(load_game(save_path))
     metadata = {
         **identity,
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from contextlib import nullcontext
+from copy import copy, deepcopy
 import csv
-from copy import deepcopy
 from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime, timezone
 import hashlib
@@ -14,11 +15,14 @@ import tempfile
 from time import perf_counter
 import traceback
 
+from ai.ai_model import HansaNN
 from game.persistence import save_game
+from training.rollout_workers import EvaluationPool, RolloutPool, StatePrefetcher
 from training.self_play import (
     ActionLimitExceeded,
     IncompleteGameError,
     SelfPlayTrainer,
+    TrainingProgress,
 )
 from training.targeted_state_generator import StateGenerationError
 
@@ -122,6 +126,10 @@ class CurriculumConfig:
     evaluation_seed: int = 10_000
     stages: tuple[CurriculumStage, ...] = DEFAULT_STAGES
     promotion: PromotionCriteria = field(default_factory=PromotionCriteria)
+    rollout_workers: int = 0
+    weight_sync_interval: int = 1
+    evaluation_workers: int = 0
+    prefetch_states: int = 0
 
     def __post_init__(self):
         for name, value in (
@@ -134,6 +142,14 @@ class CurriculumConfig:
                 raise ValueError(f"{name} must be positive")
         if self.retry_limit < 0:
             raise ValueError("retry limit cannot be negative")
+        if self.rollout_workers < 0:
+            raise ValueError("rollout workers cannot be negative")
+        if self.evaluation_workers < 0:
+            raise ValueError("evaluation workers cannot be negative")
+        if self.prefetch_states < 0:
+            raise ValueError("prefetched states cannot be negative")
+        if self.weight_sync_interval < 1:
+            raise ValueError("weight sync interval must be positive")
         if not self.stages:
             raise ValueError("at least one curriculum stage is required")
 
@@ -153,6 +169,42 @@ class StateDescriptor:
         return self.seed + ACTION_SEED_OFFSET
 
 
+@dataclass(frozen=True)
+class TrainingAttempt:
+    """One generated and played training position for a curriculum game number.
+
+    ``failure`` names why no trajectory was produced: ``"generation"`` when the
+    generator rejected the seed, otherwise the incomplete-game reason. Attempts
+    played by a rollout worker carry the ``progress`` the worker's trainer
+    recorded while playing them, which the learner adds to its own.
+    """
+
+    retry_count: int
+    descriptor: StateDescriptor | None = None
+    generation_seconds: float = 0.0
+    trajectory: object = None
+    failure: str | None = None
+    progress: TrainingProgress | None = None
+
+    @property
+    def ends_game(self):
+        """Whether the runner stops retrying this game number after the attempt."""
+        return (
+            self.trajectory is not None
+            and getattr(self.trajectory, "completion_reason", "normal") != "no_replacement_route"
+        )
+
+
+@dataclass(frozen=True)
+class EvaluationAttempt:
+    """One play of a fixed evaluation state; ``failure`` is set when it must be retried."""
+
+    retry_count: int
+    action_seed: int
+    trajectory: object = None
+    failure: str | None = None
+
+
 class CurriculumRunError(RuntimeError):
     """Raised when the standalone curriculum cannot safely continue."""
 
@@ -227,6 +279,8 @@ class CurriculumRunner:
         self.progress_callback = progress_callback
         self._captured_errors = set()
         self._latest_descriptor = None
+        self._state_prefetcher = None
+        self._evaluation_pool = None
         saved = trainer.curriculum_state or {}
         signature = self._configuration_signature()
         compatible_signatures = {
@@ -341,6 +395,18 @@ class CurriculumRunner:
     def _generate_state(self, stage, seed, directory, *, map_num=None, player_count=None):
         raise NotImplementedError
 
+    def _training_seed(self, game_number, retry_count):
+        return self.config.seed + game_number * 10_007 + retry_count
+
+    def _generation_state(self):
+        """Return the runner attributes that ``_generate_state`` updates."""
+        return {"_latest_descriptor": self._latest_descriptor}
+
+    def _adopt_generation_state(self, state):
+        """Apply the generation side effects of a state generated by another runner copy."""
+        for name, value in state.items():
+            setattr(self, name, value)
+
     @staticmethod
     def _stage_label(stage):
         return "full_game" if stage.full_game else "mixed_end_game"
@@ -349,6 +415,100 @@ class CurriculumRunner:
     def _stage_action_limit(stage):
         return stage.action_limit
 
+    def _training_attempts(self, stage, directory, game_number, label, remaining_games=1):
+        """Yield each retry of one training game number until the caller stops asking.
+
+        With a state prefetcher attached, the first attempt's state comes from
+        it and ``generation_seconds`` is the time spent waiting for that state.
+        """
+        retry_reason = None
+        prefetcher = self._state_prefetcher
+        for retry_count in range(self.config.retry_limit + 1):
+            retry = (
+                "" if retry_count == 0 else f" (retry {retry_count}: {retry_reason or 'unknown'})"
+            )
+            self._report(f"{label}{retry}...")
+            seed = self._training_seed(game_number, retry_count)
+            generation_started = perf_counter()
+            try:
+                if retry_count == 0 and prefetcher is not None:
+                    descriptor = prefetcher.take(game_number, remaining_games)
+                else:
+                    descriptor = self._generate_state(stage, seed, directory)
+            except StateGenerationError as error:
+                retry_reason = f"generation constraints: {error}"
+                yield TrainingAttempt(retry_count, failure="generation")
+                continue
+            generation_seconds = perf_counter() - generation_started
+            self.trainer.rng.seed(descriptor.action_seed)
+            try:
+                trajectory = self.trainer.collect_game(
+                    descriptor.path,
+                    failure_callback=self._failure_callback(
+                        stage, descriptor, retry_count, "training"
+                    ),
+                )
+            except IncompleteGameError as error:
+                reason = (
+                    "action_limit"
+                    if isinstance(error, ActionLimitExceeded)
+                    else "no_legal_interaction"
+                )
+                retry_reason = f"{reason}: {error}" if reason == "no_legal_interaction" else reason
+                yield TrainingAttempt(retry_count, descriptor, generation_seconds, failure=reason)
+                continue
+            yield TrainingAttempt(retry_count, descriptor, generation_seconds, trajectory)
+            retry_reason = "no_replacement_route"
+
+    def _evaluation_attempts(self, stage, descriptor, index, total_games, tier_rotation):
+        """Yield each retry of one evaluation state until the caller stops asking."""
+        evaluation_retry_limit = min(self.config.retry_limit, EVALUATION_RETRY_LIMIT)
+        for retry_count in range(evaluation_retry_limit + 1):
+            retry = "" if retry_count == 0 else f" (retry {retry_count})"
+            self._report(f"Evaluation game {index + 1}/{total_games}{retry}...")
+            action_seed = descriptor.action_seed + retry_count
+            self.trainer.rng.seed(action_seed)
+            try:
+                candidate = self.trainer.collect_game(
+                    descriptor.path,
+                    failure_callback=self._failure_callback(
+                        stage, descriptor, retry_count, "evaluation"
+                    ),
+                    evaluation=True,
+                    evaluation_tier_rotation=tier_rotation,
+                )
+            except ActionLimitExceeded:
+                yield EvaluationAttempt(retry_count, action_seed, failure="action_limit")
+                continue
+            except IncompleteGameError:
+                yield EvaluationAttempt(retry_count, action_seed, failure="engine_dead_end")
+                continue
+            if getattr(candidate, "completion_reason", "normal") == "no_replacement_route":
+                yield EvaluationAttempt(retry_count, action_seed, failure="no_replacement_route")
+                continue
+            yield EvaluationAttempt(retry_count, action_seed, candidate)
+
+    def _generation_offset(self):
+        """Return the offset from game numbers to generation positions for a batch."""
+        return 0
+
+    def _begin_training_game(self, game_number, generation_offset):
+        """Position the runner, or a worker's copy of it, to generate ``game_number``."""
+
+    def _rollout_worker_copy(self):
+        """Return a picklable copy of the runner without its trainer or progress callback."""
+        worker = copy(self)
+        worker.trainer = None
+        worker.progress_callback = None
+        worker._captured_errors = set()
+        worker._state_prefetcher = None
+        worker._evaluation_pool = None
+        return worker
+
+    def _rollout_trainer(self, model_path, training_config):
+        """Return the trainer a rollout worker plays with after each weight sync."""
+        return SelfPlayTrainer(model=HansaNN(model_file=model_path), config=training_config)
+
     def _failure_callback(self, stage, descriptor, retry_count, run_type):
         def capture(game, action_trace, seat_tiers, error):
             directory = self._save_failure(
@@ -548,143 +708,139 @@ class CurriculumRunner:
 
         total_games = self.config.training_games_per_batch
         game_index = 0
-        while game_index < total_games:
-            completed_game = False
-            retry_reason = None
-            for retry_count in range(self.config.retry_limit + 1):
-                retry = (
-                    ""
-                    if retry_count == 0
-                    else f" (retry {retry_count}: {retry_reason or 'unknown'})"
+        # Workers generate ahead of the learner, so every game number gets a
+        # fixed generation position rather than one that depends on earlier retries.
+        generation_offset = self._generation_offset()
+        rollout = (
+            RolloutPool(self, stage, directory, generation_offset)
+            if self.config.rollout_workers
+            else nullcontext()
+        )
+        prefetch = (
+            StatePrefetcher(self, stage, directory, generation_offset)
+            if self.config.prefetch_states and not self.config.rollout_workers
+            else nullcontext()
+        )
+        with rollout as pool, prefetch:
+            while game_index < total_games:
+                label = f"Training game {game_index + 1}/{total_games}"
+                self._begin_training_game(self.game_number, generation_offset)
+                attempts = (
+                    self._training_attempts(
+                        stage, directory, self.game_number, label, total_games - game_index
+                    )
+                    if pool is None
+                    else pool.next_game(self.game_number, total_games - game_index)
                 )
-                self._report(f"Training game {game_index + 1}/{total_games}{retry}...")
-                seed = self.config.seed + self.game_number * 10_007 + retry_count
-                generation_started = perf_counter()
-                try:
-                    descriptor = self._generate_state(stage, seed, directory)
-                except StateGenerationError as error:
-                    unfinished += 1
-                    if retry_count == self.config.retry_limit:
+                completed_game = False
+                for attempt in attempts:
+                    if attempt.progress is not None:
+                        self.trainer.progress.merge(attempt.progress)
+                    retry_count = attempt.retry_count
+                    if attempt.failure is not None:
+                        unfinished += 1
+                        if retry_count < self.config.retry_limit:
+                            continue
                         self.game_number += 1
-                        self._report(
-                            f"Discarded generator seed after {retry_count} retries; "
-                            f"continuing training game {game_index + 1}/{total_games}"
-                        )
+                        if attempt.failure == "generation":
+                            self._report(
+                                f"Discarded generator seed after {retry_count} retries; "
+                                f"continuing training game {game_index + 1}/{total_games}"
+                            )
+                        else:
+                            self._report(
+                                f"Discarded starting position after {retry_count} retries "
+                                f"({attempt.failure}); "
+                                f"continuing training game {game_index + 1}/{total_games}"
+                            )
                         break
-                    retry_reason = f"generation constraints: {error}"
-                    continue
-                generation_seconds = perf_counter() - generation_started
-                self.trainer.rng.seed(descriptor.action_seed)
-                try:
-                    trajectory = self.trainer.collect_game(
-                        descriptor.path,
-                        failure_callback=self._failure_callback(
-                            stage, descriptor, retry_count, "training"
-                        ),
+                    descriptor = attempt.descriptor
+                    trajectory = attempt.trajectory
+                    generation_seconds = attempt.generation_seconds
+                    game_loss = self.trainer.trajectory_loss(trajectory)
+                    result = getattr(trajectory, "completion_reason", "normal")
+                    descriptors.append(descriptor)
+                    learning_started = perf_counter()
+                    self.trainer.update_model((trajectory,))
+                    learning_seconds = perf_counter() - learning_started
+                    loss = f"; loss {game_loss:.2f}" if game_loss is not None else ""
+                    slow_timings = _play_timing_breakdown(trajectory)
+                    timing = f" ({slow_timings})" if slow_timings else ""
+                    generation = (
+                        f"; generate {generation_seconds:.2f}s" if generation_seconds >= 1 else ""
                     )
-                except IncompleteGameError as error:
-                    unfinished += 1
-                    reason = (
-                        "action_limit"
-                        if isinstance(error, ActionLimitExceeded)
-                        else "no_legal_interaction"
+                    learning = f"; learn {learning_seconds:.2f}s" if learning_seconds >= 1 else ""
+                    self._report(
+                        f"Training game {game_index + 1}/{total_games}: {result}; "
+                        f"{len(trajectory.action_trace)} actions; "
+                        f"play {trajectory.play_seconds:.2f}s{loss}{timing}{generation}{learning}"
                     )
-                    if retry_count == self.config.retry_limit:
+                    pending_update.append(trajectory)
+                    pending_game_numbers.append(game_index + 1)
+                    completed = result not in {"no_replacement_route", "action_limit"}
+                    if not completed:
+                        unfinished += 1
+                        if result == "action_limit":
+                            self.game_number += 1
+                            self.report_game_number += 1
+                            pending_rows.append(
+                                self._trajectory_row(
+                                    trajectory,
+                                    descriptor,
+                                    stage,
+                                    "training_timeout",
+                                    retry_count,
+                                    game_loss,
+                                    None,
+                                    self.report_game_number,
+                                    generation_seconds=generation_seconds,
+                                    learning_seconds=learning_seconds,
+                                )
+                            )
+                            if len(pending_update) == self.config.update_batch_size:
+                                save_completed_group()
+                            completed_game = True
+                            break
+                        if len(pending_update) == self.config.update_batch_size:
+                            save_completed_group()
+                        if retry_count < self.config.retry_limit:
+                            continue
+                        save_completed_group()
                         self.game_number += 1
                         self._report(
-                            f"Discarded starting position after {retry_count} retries "
-                            f"({reason}); "
+                            f"Discarded starting position after {retry_count} retries; "
                             f"continuing training game {game_index + 1}/{total_games}"
                         )
                         break
-                    retry_reason = (
-                        f"{reason}: {error}" if reason == "no_legal_interaction" else reason
+
+                    self.game_number += 1
+                    self.report_game_number += 1
+                    completed_game = True
+                    if game_loss is not None:
+                        recent_losses.append(game_loss)
+                    rolling_mean = (
+                        sum(recent_losses[-5:]) / len(recent_losses[-5:]) if recent_losses else None
                     )
-                    continue
-                game_loss = self.trainer.trajectory_loss(trajectory)
-                result = getattr(trajectory, "completion_reason", "normal")
-                descriptors.append(descriptor)
-                learning_started = perf_counter()
-                self.trainer.update_model((trajectory,))
-                learning_seconds = perf_counter() - learning_started
-                loss = f"; loss {game_loss:.2f}" if game_loss is not None else ""
-                slow_timings = _play_timing_breakdown(trajectory)
-                timing = f" ({slow_timings})" if slow_timings else ""
-                generation = (
-                    f"; generate {generation_seconds:.2f}s" if generation_seconds >= 1 else ""
-                )
-                learning = f"; learn {learning_seconds:.2f}s" if learning_seconds >= 1 else ""
-                self._report(
-                    f"Training game {game_index + 1}/{total_games}: {result}; "
-                    f"{len(trajectory.action_trace)} actions; "
-                    f"play {trajectory.play_seconds:.2f}s{loss}{timing}{generation}{learning}"
-                )
-                pending_update.append(trajectory)
-                pending_game_numbers.append(game_index + 1)
-                completed = result not in {"no_replacement_route", "action_limit"}
-                if not completed:
-                    unfinished += 1
-                    if result == "action_limit":
-                        self.game_number += 1
-                        self.report_game_number += 1
-                        pending_rows.append(
-                            self._trajectory_row(
-                                trajectory,
-                                descriptor,
-                                stage,
-                                "training_timeout",
-                                retry_count,
-                                game_loss,
-                                None,
-                                self.report_game_number,
-                                generation_seconds=generation_seconds,
-                                learning_seconds=learning_seconds,
-                            )
-                        )
-                        if len(pending_update) == self.config.update_batch_size:
-                            save_completed_group()
-                        completed_game = True
-                        break
+                    row = self._trajectory_row(
+                        trajectory,
+                        descriptor,
+                        stage,
+                        "training",
+                        retry_count,
+                        game_loss,
+                        rolling_mean,
+                        self.report_game_number,
+                        generation_seconds=generation_seconds,
+                        learning_seconds=learning_seconds,
+                    )
+                    rows.append(row)
+                    pending_rows.append(row)
                     if len(pending_update) == self.config.update_batch_size:
                         save_completed_group()
-                    if retry_count < self.config.retry_limit:
-                        retry_reason = "no_replacement_route"
-                        continue
-                    save_completed_group()
-                    self.game_number += 1
-                    self._report(
-                        f"Discarded starting position after {retry_count} retries; "
-                        f"continuing training game {game_index + 1}/{total_games}"
-                    )
                     break
-
-                self.game_number += 1
-                self.report_game_number += 1
-                completed_game = True
-                if game_loss is not None:
-                    recent_losses.append(game_loss)
-                rolling_mean = (
-                    sum(recent_losses[-5:]) / len(recent_losses[-5:]) if recent_losses else None
-                )
-                row = self._trajectory_row(
-                    trajectory,
-                    descriptor,
-                    stage,
-                    "training",
-                    retry_count,
-                    game_loss,
-                    rolling_mean,
-                    self.report_game_number,
-                    generation_seconds=generation_seconds,
-                    learning_seconds=learning_seconds,
-                )
-                rows.append(row)
-                pending_rows.append(row)
-                if len(pending_update) == self.config.update_batch_size:
-                    save_completed_group()
-                break
-            if completed_game:
-                game_index += 1
+                if completed_game:
+                    game_index += 1
+        self._begin_training_game(self.game_number, generation_offset)
         save_completed_group()
         return rows, descriptors, unfinished
 
@@ -737,47 +893,29 @@ class CurriculumRunner:
                     )
 
             total_games = len(evaluation_states)
-            for index, descriptor in enumerate(evaluation_states):
+            tier_rotation = self.batch_number - 1
+            games = (
+                self._evaluation_pool.play(stage, evaluation_states, directory, tier_rotation)
+                if self._evaluation_pool is not None
+                else (
+                    self._evaluation_attempts(stage, descriptor, index, total_games, tier_rotation)
+                    for index, descriptor in enumerate(evaluation_states)
+                )
+            )
+            for index, (descriptor, attempts) in enumerate(zip(evaluation_states, games)):
                 trajectory = None
                 action_seed = descriptor.action_seed
                 failure_reason = None
-                evaluation_retry_limit = min(self.config.retry_limit, EVALUATION_RETRY_LIMIT)
-                for retry_count in range(evaluation_retry_limit + 1):
-                    retry = "" if retry_count == 0 else f" (retry {retry_count})"
-                    self._report(f"Evaluation game {index + 1}/{total_games}{retry}...")
-                    action_seed = descriptor.action_seed + retry_count
-                    self.trainer.rng.seed(action_seed)
-                    try:
-                        candidate = self.trainer.collect_game(
-                            descriptor.path,
-                            failure_callback=self._failure_callback(
-                                stage, descriptor, retry_count, "evaluation"
-                            ),
-                            evaluation=True,
-                            evaluation_tier_rotation=self.batch_number - 1,
-                        )
-                    except ActionLimitExceeded:
-                        failure_reason = "action_limit"
-                        incomplete += 1
-                        self._report(
-                            f"Evaluation game {index + 1}/{total_games}: action_limit; retrying"
-                        )
-                        continue
-                    except IncompleteGameError:
-                        failure_reason = "engine_dead_end"
-                        incomplete += 1
-                        self._report(
-                            f"Evaluation game {index + 1}/{total_games}: engine_dead_end; retrying"
-                        )
-                        continue
-
-                    if getattr(candidate, "completion_reason", "normal") != "no_replacement_route":
-                        trajectory = candidate
+                for attempt in attempts:
+                    retry_count = attempt.retry_count
+                    action_seed = attempt.action_seed
+                    if attempt.failure is None:
+                        trajectory = attempt.trajectory
                         break
-                    failure_reason = "no_replacement_route"
+                    failure_reason = attempt.failure
                     incomplete += 1
                     self._report(
-                        f"Evaluation game {index + 1}/{total_games}: no_replacement_route; retrying"
+                        f"Evaluation game {index + 1}/{total_games}: {failure_reason}; retrying"
                     )
 
                 if trajectory is None:
@@ -859,6 +997,11 @@ class CurriculumRunner:
         return True
 
     def run(self):
+        evaluation_pool = EvaluationPool(self) if self.config.evaluation_workers else nullcontext()
+        with evaluation_pool:
+            return self._run_batches()
+
+    def _run_batches(self):
         for run_batch_index in range(self.config.iterations):
             self.run_batch_number = run_batch_index + 1
             stage = self.config.stages[self.stage_index]
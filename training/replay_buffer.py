@@ -0,0 +1,240 @@
+"""Disk-backed experience buffer of training decisions with prioritized sampling.
+
+Without a buffer the learner trains only on the trajectory it has just
+collected. ``ReplayBuffer`` keeps past decisions in memory-mapped ``.npy``
+arrays inside one directory: observations as ``int16`` rows, the
+equivalent-action set as a packed bitset, and the training target, chosen
+action and sampling priority as scalars. Slots form a ring of fixed capacity,
+so once the buffer is full every new decision evicts the oldest one.
+
+A decision's priority grows with the magnitude of its local target or
+immediate reward, the same signal ``SelfPlayTrainer._training_batches`` uses
+to favour rewarded decisions. Reopening the directory resumes the buffer where
+it stopped, provided its capacity and schemas match.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import tempfile
+
+import numpy as np
+import torch
+
+from ai.observation_schema import (
+    OBSERVATION_SIZE,
+    observation_schema_metadata,
+    validate_observation_schema_metadata,
+)
+from game.action_schema import (
+    ACTION_SPACE_SIZE,
+    action_schema_metadata,
+    validate_action_schema_metadata,
+)
+
+
+REPLAY_BUFFER_FORMAT = "hansa-replay-buffer"
+REPLAY_BUFFER_VERSION = 1
+_METADATA_FILE = "buffer.json"
+_ACTION_BYTES = ACTION_SPACE_SIZE // 8
+_COLUMNS = {
+    "observations": (np.int16, (OBSERVATION_SIZE,)),
+    "action_sets": (np.uint8, (_ACTION_BYTES,)),
+    "action_indices": (np.int16, ()),
+    "targets": (np.float32, ()),
+    "priorities": (np.float32, ()),
+}
+
+
+class ReplayBufferError(ValueError):
+    """Raised when a replay buffer directory is invalid or incompatible."""
+
+
+@dataclass(frozen=True)
+class ReplayBatch:
+    slots: np.ndarray
+    observations: torch.Tensor
+    action_sets: torch.Tensor
+    action_set_valid: torch.Tensor
+    action_indices: torch.Tensor
+    targets: torch.Tensor
+
+
+def decision_priority(decision, *, minimum=1.0, exponent=0.6):
+    """Return the sampling priority of one decision from its reward magnitude."""
+    reward = (
+        decision.local_training_target
+        if decision.local_training_target is not None
+        else decision.immediate_reward
+    )
+    return (abs(reward) + minimum) ** exponent
+
+
+def _pack_actions(indices):
+    bits = np.zeros(ACTION_SPACE_SIZE, dtype=bool)
+    bits[list(indices)] = True
+    return np.packbits(bits)
+
+
+def _padded_actions(packed):
+    bits = np.unpackbits(packed, axis=1).astype(bool)
+    counts = bits.sum(axis=1)
+    indices = np.argsort(~bits, axis=1, kind="stable")[:, : counts.max()]
+    valid = np.arange(indices.shape[1]) < counts[:, None]
+    return torch.from_numpy(np.where(valid, indices, 0)), torch.from_numpy(valid)
+
+
+class ReplayBuffer:
+    """Fixed-capacity ring of training decisions stored in one directory."""
+
+    def __init__(self, directory, capacity=None, *, minimum_priority=1.0, priority_exponent=0.6):
+        if minimum_priority <= 0:
+            raise ValueError("minimum priority must be positive")
+        if priority_exponent < 0:
+            raise ValueError("priority exponent cannot be negative")
+        self.directory = Path(directory)
+        self.minimum_priority = minimum_priority
+        self.priority_exponent = priority_exponent
+        metadata_path = self.directory / _METADATA_FILE
+        if metadata_path.exists():
+            metadata = self._read_metadata(metadata_path)
+            if capacity is not None and capacity != metadata["capacity"]:
+                raise ReplayBufferError(
+                    f"Replay buffer holds {metadata['capacity']} decisions, "
+                    f"not the requested {capacity}"
+                )
+            self.capacity = metadata["capacity"]
+            self.size = metadata["size"]
+            self.cursor = metadata["cursor"]
+            self.added = metadata["added"]
+            mode = "r+"
+        else:
+            if capacity is None or capacity < 1:
+                raise ValueError("a new replay buffer needs a positive capacity")
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.capacity = capacity
+            self.size = self.cursor = self.added = 0
+            mode = "w+"
+        self._columns = {
+            name: np.lib.format.open_memmap(
+                self.directory / f"{name}.npy",
+                mode=mode,
+                dtype=dtype,
+                shape=(self.capacity, *shape),
+            )
+            for name, (dtype, shape) in _COLUMNS.items()
+        }
+        if mode == "r+":
+            for name, (dtype, shape) in _COLUMNS.items():
+                if self._columns[name].shape != (self.capacity, *shape):
+                    raise ReplayBufferError(f"Replay buffer {name} column has the wrong shape")
+        else:
+            self._write_metadata()
+
+    @staticmethod
+    def _read_metadata(path):
+        try:
+            metadata = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeError, json.JSONDecodeError) as error:
+            raise ReplayBufferError(f"Could not read replay buffer: {error}") from error
+        if not isinstance(metadata, dict) or metadata.get("format") != REPLAY_BUFFER_FORMAT:
+            raise ReplayBufferError("This is not a Hansa replay buffer")
+        if metadata.get("version") != REPLAY_BUFFER_VERSION:
+            raise ReplayBufferError(
+                f"Replay buffer uses an incompatible format: {metadata.get('version')!r}; "
+                f"expected {REPLAY_BUFFER_VERSION}"
+            )
+        try:
+            validate_action_schema_metadata(metadata, "Replay buffer")
+            validate_observation_schema_metadata(metadata, "Replay buffer")
+        except ValueError as error:
+            raise ReplayBufferError(str(error)) from error
+        return metadata
+
+    def _write_metadata(self):
+        metadata = {
+            "format": REPLAY_BUFFER_FORMAT,
+            "version": REPLAY_BUFFER_VERSION,
+            "capacity": self.capacity,
+            "size": self.size,
+            "cursor": self.cursor,
+            "added": self.added,
+            **action_schema_metadata(),
+            **observation_schema_metadata(),
+        }
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=self.directory, suffix=".tmp", delete=False
+        ) as temporary:
+            json.dump(metadata, temporary)
+        Path(temporary.name).replace(self.directory / _METADATA_FILE)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, decisions):
+        """Store decisions that already have training targets, evicting the oldest."""
+        decisions = tuple(decisions)
+        if any(decision.reward_to_go is None for decision in decisions):
+            raise ReplayBufferError("Only decisions with training targets can be stored")
+        decisions = decisions[-self.capacity :]
+        if not decisions:
+            return 0
+        slots = (self.cursor + np.arange(len(decisions))) % self.capacity
+        columns = self._columns
+        columns["observations"][slots] = torch.stack(
+            [decision.observation for decision in decisions]
+        ).numpy()
+        columns["action_sets"][slots] = [
+            _pack_actions(decision.equivalent_action_indices or (decision.action_index,))
+            for decision in decisions
+        ]
+        columns["action_indices"][slots] = [decision.action_index for decision in decisions]
+        columns["targets"][slots] = [decision.reward_to_go for decision in decisions]
+        columns["priorities"][slots] = [
+            decision_priority(
+                decision, minimum=self.minimum_priority, exponent=self.priority_exponent
+            )
+            for decision in decisions
+        ]
+        self.cursor = int(slots[-1] + 1) % self.capacity
+        self.size = min(self.capacity, self.size + len(decisions))
+        self.added += len(decisions)
+        self.flush()
+        return len(decisions)
+
+    def flush(self):
+        """Write the arrays and the ring position to disk."""
+        for column in self._columns.values():
+            column.flush()
+        self._write_metadata()
+
+    def sample(self, batch_size, rng):
+        """Draw up to ``batch_size`` distinct decisions in proportion to their priority.
+
+        ``rng`` is a ``random.Random``, so the trainer's seeded policy RNG keeps
+        sampling reproducible.
+        """
+        if not self.size:
+            raise ReplayBufferError("Cannot sample from an empty replay buffer")
+        priorities = self._columns["priorities"][: self.size].astype(np.float64)
+        generator = np.random.default_rng(rng.getrandbits(64))
+        slots = np.sort(
+            generator.choice(
+                self.size,
+                size=min(batch_size, self.size),
+                replace=False,
+                p=priorities / priorities.sum(),
+            )
+        )
+        columns = self._columns
+        action_sets, action_set_valid = _padded_actions(columns["action_sets"][slots])
+        return ReplayBatch(
+            slots=slots,
+            observations=torch.from_numpy(columns["observations"][slots]),
+            action_sets=action_sets,
+            action_set_valid=action_set_valid,
+            action_indices=torch.from_numpy(columns["action_indices"][slots].astype(np.int64)),
+            targets=torch.from_numpy(columns["targets"][slots]),
+        )
@@ -0,0 +1,355 @@
+"""Process-pool rollout workers for curriculum training and evaluation.
+
+Each worker holds a copy of the curriculum runner and its own trainer. It
+generates and plays every retry of one training game number, then returns the
+attempts to the learner process, which trains on them in game-number order
+exactly as the sequential runner would. Each attempt carries the progress
+counters recorded while it was played, so the learner's ``TrainingProgress``
+matches a sequential run. Seeds and generation positions depend only on the
+game number and the generation offset recorded at the start of the batch, and
+games are submitted and weights saved only between learned games, so the
+weights each game is played with depend on the sync interval rather than on
+worker timing. Every retry of a game is played in its worker with the weights
+the game was submitted with, so an unfinished attempt the learner trains on
+reaches later game numbers but not that game's own retries.
+
+Evaluation games never update weights, so every state of the suite is
+dispatched at once against one frozen copy of the model and the results are
+returned in manifest order. ``EvaluationPool`` keeps its workers for the whole
+curriculum run.
+
+When training games are played in-process, ``StatePrefetcher`` can still
+generate the first-attempt starting state of upcoming game numbers on worker
+processes, so slow generation overlaps play and learning.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+import multiprocessing
+from pathlib import Path
+from time import perf_counter
+
+from training.self_play import TrainingProgress
+
+
+@dataclass(frozen=True)
+class RolloutTask:
+    stage: object
+    directory: Path
+    game_number: int
+    generation_offset: int
+    model_path: Path
+    training_config: object
+
+
+@dataclass(frozen=True)
+class EvaluationTask:
+    stage: object
+    descriptor: object
+    index: int
+    total_games: int
+    tier_rotation: int
+    model_path: Path
+    training_config: object
+
+
+@dataclass(frozen=True)
+class GenerationTask:
+    stage: object
+    directory: Path
+    game_number: int
+    generation_offset: int
+
+
+@dataclass(frozen=True)
+class PrefetchedState:
+    """A generated first-attempt state, or the generation error, for one game number."""
+
+    game_number: int
+    descriptor: object
+    error: Exception | None
+    generation_state: dict
+    generation_seconds: float
+
+
+_worker_runner = None
+_worker_model_path = None
+
+
+def _initialize_worker(runner):
+    global _worker_runner, _worker_model_path
+    _worker_runner = runner
+    _worker_model_path = None
+
+
+def _worker_pool(runner, workers):
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_initialize_worker,
+        initargs=(runner._rollout_worker_copy(),),
+    )
+
+
+def _prepare_worker(task):
+    global _worker_model_path
+    runner = _worker_runner
+    if task.model_path != _worker_model_path:
+        runner.trainer = runner._rollout_trainer(task.model_path, task.training_config)
+        _worker_model_path = task.model_path
+    runner.trainer.config = task.training_config
+    return runner
+
+
+def play_training_game(task):
+    """Play every retry of one training game number in a rollout worker."""
+    runner = _prepare_worker(task)
+    runner._begin_training_game(task.game_number, task.generation_offset)
+    attempts = []
+    runner.trainer.progress = TrainingProgress()
+    for attempt in runner._training_attempts(
+        task.stage, task.directory, task.game_number, f"Training game #{task.game_number}"
+    ):
+        attempts.append(replace(attempt, progress=runner.trainer.progress))
+        runner.trainer.progress = TrainingProgress()
+        if attempt.ends_game:
+            break
+    return tuple(attempts)
+
+
+def generate_training_state(task):
+    """Generate the first-attempt state of one training game number in a worker."""
+    runner = _worker_runner
+    runner._begin_training_game(task.game_number, task.generation_offset)
+    started = perf_counter()
+    descriptor = error = None
+    try:
+        descriptor = runner._generate_state(
+            task.stage, runner._training_seed(task.game_number, 0), task.directory
+        )
+    except Exception as generation_error:  # re-raised by the learner process
+        error = generation_error
+    return PrefetchedState(
+        task.game_number,
+        descriptor,
+        error,
+        runner._generation_state(),
+        perf_counter() - started,
+    )
+
+
+def play_evaluation_game(task):
+    """Play one evaluation state in a rollout worker until an attempt completes."""
+    runner = _prepare_worker(task)
+    attempts = []
+    for attempt in runner._evaluation_attempts(
+        task.stage, task.descriptor, task.index, task.total_games, task.tier_rotation
+    ):
+        attempts.append(attempt)
+        if attempt.failure is None:
+            break
+    return tuple(attempts)
+
+
+class EvaluationPool:
+    """Play every evaluation suite of a curriculum run on one set of worker processes.
+
+    Evaluation only reads the runner's configuration and directories, so the
+    workers started with the run serve every batch; each suite is played
+    against the frozen model saved for its batch.
+    """
+
+    def __init__(self, runner):
+        self.runner = runner
+        self.workers = runner.config.evaluation_workers
+        self._executor = None
+
+    def __enter__(self):
+        self._executor = _worker_pool(self.runner, self.workers)
+        self.runner._evaluation_pool = self
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.runner._evaluation_pool = None
+        self._executor.shutdown(cancel_futures=True)
+        return False
+
+    def play(self, stage, descriptors, directory, tier_rotation):
+        """Yield the attempts for every evaluation state in order."""
+        descriptors = tuple(descriptors)
+        runner = self.runner
+        model_path = runner.trainer.model.save_model(Path(directory) / "evaluation_model.pth")
+        futures = [
+            self._executor.submit(
+                play_evaluation_game,
+                EvaluationTask(
+                    stage,
+                    descriptor,
+                    index,
+                    len(descriptors),
+                    tier_rotation,
+                    model_path,
+                    runner.trainer.config,
+                ),
+            )
+            for index, descriptor in enumerate(descriptors)
+        ]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+class RolloutPool:
+    """Keep training games in flight on worker processes and return them in game order.
+
+    At most one game per unfinished training slot is in flight, so a batch never
+    plays games it will discard. The learner's weights are saved for the workers
+    every ``weight_sync_interval`` games it has received, and each saved file is
+    deleted once no pending game still needs it.
+    """
+
+    def __init__(self, runner, stage, directory, generation_offset):
+        self.runner = runner
+        self.stage = stage
+        self.directory = Path(directory)
+        self.generation_offset = generation_offset
+        self.workers = runner.config.rollout_workers
+        self.weight_sync_interval = runner.config.weight_sync_interval
+        self._executor = None
+        self._pending = deque()
+        self._next_game_number = 0
+        self._model_path = None
+        self._model_paths = set()
+        self._model_version = 0
+        self._games_since_sync = 0
+
+    def __enter__(self):
+        self._executor = _worker_pool(self.runner, self.workers)
+        self._publish_model()
+        return self
+
+    def __exit__(self, *_exc_info):
+        self._executor.shutdown(cancel_futures=True)
+        self._pending.clear()
+        self._model_path = None
+        self._remove_unused_models()
+        return False
+
+    def _publish_model(self):
+        self._model_version += 1
+        path = self.directory / "rollout_models" / f"model_{self._model_version}.pth"
+        self._model_path = self.runner.trainer.model.save_model(path)
+        self._model_paths.add(self._model_path)
+        self._games_since_sync = 0
+        self._remove_unused_models()
+
+    def _remove_unused_models(self):
+        in_use = {self._model_path, *(model_path for _game, model_path, _future in self._pending)}
+        for path in self._model_paths - in_use:
+            path.unlink(missing_ok=True)
+        self._model_paths &= in_use
+
+    def _submit(self):
+        task = RolloutTask(
+            self.stage,
+            self.directory,
+            self._next_game_number,
+            self.generation_offset,
+            self._model_path,
+            self.runner.trainer.config,
+        )
+        self._pending.append(
+            (
+                self._next_game_number,
+                self._model_path,
+                self._executor.submit(play_training_game, task),
+            )
+        )
+        self._next_game_number += 1
+
+    def next_game(self, game_number, remaining_games):
+        """Return the attempts for ``game_number``, keeping later games in flight."""
+        if self._games_since_sync >= self.weight_sync_interval:
+            self._publish_model()
+        if not self._pending:
+            self._next_game_number = game_number
+        elif self._pending[0][0] != game_number:
+            raise RuntimeError(
+                f"Rollout game {self._pending[0][0]} is next but game {game_number} was requested"
+            )
+        while not self._pending or len(self._pending) < min(self.workers, remaining_games):
+            self._submit()
+        _game_number, _model_path, future = self._pending.popleft()
+        self._games_since_sync += 1
+        attempts = future.result()
+        self._remove_unused_models()
+        return attempts
+
+
+class StatePrefetcher:
+    """Generate upcoming training states on worker processes ahead of play.
+
+    While a game is played, up to ``prefetch_states`` later game numbers are
+    in flight, one per worker and never more than the batch still needs. Each
+    is generated with the seed of its first attempt; retries are generated by
+    the learner process as before.
+    """
+
+    def __init__(self, runner, stage, directory, generation_offset):
+        self.runner = runner
+        self.stage = stage
+        self.directory = Path(directory)
+        self.generation_offset = generation_offset
+        self.depth = runner.config.prefetch_states
+        self._executor = None
+        self._pending = deque()
+        self._next_game_number = 0
+
+    def __enter__(self):
+        self._executor = _worker_pool(self.runner, self.depth)
+        self.runner._state_prefetcher = self
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.runner._state_prefetcher = None
+        self._executor.shutdown(cancel_futures=True)
+        self._pending.clear()
+        return False
+
+    def _submit(self):
+        task = GenerationTask(
+            self.stage, self.directory, self._next_game_number, self.generation_offset
+        )
+        self._pending.append(
+            (self._next_game_number, self._executor.submit(generate_training_state, task))
+        )
+        self._next_game_number += 1
+
+    def take(self, game_number, remaining_games):
+        """Return the prefetched descriptor for ``game_number`` and keep later states coming.
+
+        The worker's generation side effects are applied to the runner, and a
+        generation error is raised here as if the runner had generated inline.
+        """
+        if not self._pending:
+            self._next_game_number = game_number
+            self._submit()
+        elif self._pending[0][0] != game_number:
+            raise RuntimeError(
+                f"Prefetched state {self._pending[0][0]} is next "
+                f"but game {game_number} was requested"
+            )
+        _game_number, future = self._pending.popleft()
+        while len(self._pending) < min(self.depth, remaining_games - 1):
+            self._submit()
+        prefetched = future.result()
+        self.runner._adopt_generation_state(prefetched.generation_state)
+        if prefetched.error is not None:
+            raise prefetched.error
+        return prefetched.descriptor
@@ -18,7 +18,7 @@ import torch
 import torch.nn.functional as functional
 
 from ai.ai_model import HansaNN, device
-from ai.observation_encoder import ObservationEncoder
+from ai.observation_encoder import ObservationBuffer, ObservationEncoder
 from ai.observation_schema import (
     observation_schema_metadata,
     validate_model_observation_schema_metadata,
@@ -29,7 +29,8 @@ from game.action_schema import (
     action_schema_metadata,
     validate_action_schema_metadata,
 )
-from game.invariants import validate_game
+from game.invariants import should_fully_validate, validate_counters, validate_game
+from game.office_network import OfficeNetwork
 from game.persistence import load_game
 from game.structured_actions import IncomeInteraction, PostInteraction, RouteInteraction
 from game.turn_state import TurnPhase
@@ -107,6 +108,7 @@ class TrainingConfig:
     seed: int = 124
     gamma: float = 0.99
     decision_batch_size: int = 256
+    replay_batches: int = 4
     full_validation_interval: int = 50
     income_penalty_scale: float = 100.0
     tier_top_k: tuple[int | None, ...] = DEFAULT_TIER_TOP_K
@@ -128,6 +130,8 @@ class TrainingConfig:
             raise ValueError("gamma must be between 0 and 1")
         if self.decision_batch_size < 1:
             raise ValueError("decision batch size must be positive")
+        if self.replay_batches < 1:
+            raise ValueError("replay batches must be positive")
         if self.full_validation_interval < 1:
             raise ValueError("full validation interval must be positive")
         if self.income_penalty_scale < 0:
@@ -245,16 +249,6 @@ class MovementBehaviorMetrics:
         return self.move_claim_conversions / self.moves_creating_claimable_route
 
 
-def should_fully_validate(action_count, interval, turn_before, phase_before, game):
-    """Validate periodically and whenever a turn or staged workflow completes."""
-    return (
-        action_count % interval == 0
-        or game.turn_number != turn_before
-        or (phase_before is not TurnPhase.ACTIONS and game.turn_phase is TurnPhase.ACTIONS)
-        or game.game_end
-    )
-
-
 @dataclass
 class TrainingProgress:
     completed_games: int = 0
@@ -275,6 +269,16 @@ class TrainingProgress:
     tier_immediate_reward_total: dict[int, float] = field(default_factory=dict)
     tier_reward_to_go_total: dict[int, float] = field(default_factory=dict)
 
+    def merge(self, other):
+        """Add the counters ``other`` recorded, such as a rollout worker's games, to these."""
+        for name, value in vars(other).items():
+            if isinstance(value, dict):
+                totals = getattr(self, name)
+                for tier, amount in value.items():
+                    totals[tier] = totals.get(tier, 0) + amount
+            elif isinstance(value, int):
+                setattr(self, name, getattr(self, name) + value)
+
 
 def _file_sha256(path: Path) -> str:
     digest = hashlib.sha256()
@@ -391,29 +395,13 @@ def move_workflow_exploration_categories(
     )
 
 
-def _would_complete_east_west(game, player, route):
+def _would_complete_east_west(game, player, route, networks):
     if player in game.players_who_completed_east_west:
         return False
-    occupied = {city for city in game.selected_map.cities if city.has_office_owned_by(player)}
-    start_name, end_name = game.selected_map.east_west_cities
-
-    def connected(cities):
-        start = next((city for city in cities if city.name == start_name), None)
-        end = next((city for city in cities if city.name == end_name), None)
-        if start is None or end is None:
-            return False
-        visited = {start}
-        pending = [start]
-        while pending:
-            city = pending.pop()
-            for candidate_route in city.routes:
-                for neighbor in candidate_route.cities:
-                    if neighbor in cities and neighbor not in visited:
-                        visited.add(neighbor)
-                        pending.append(neighbor)
-        return end in visited
-
-    if connected(occupied):
+    network = networks.get(player)
+    if network is None:
+        network = networks[player] = OfficeNetwork(game, player)
+    if network.topology.east_west is None or network.east_west_connected():
         return False
     for city in route.cities:
         if city.color == DARK_GREEN or not city.has_empty_office():
@@ -423,7 +411,7 @@ def _would_complete_east_west(game, player, route):
             continue
         if not city.has_required_piece_shape(player, route):
             continue
-        if connected(occupied | {city}):
+        if network.would_connect_east_west(network.topology.city_index[city.name]):
             return True
     return False
 
@@ -431,6 +419,7 @@ def _would_complete_east_west(game, player, route):
 def valuable_completed_route_slots(game, player):
     """Return completed routes offering the player an immediate high-value outcome."""
     valuable = set()
+    networks = {}
     for route_index, route in enumerate(game.selected_map.routes):
         if not route.is_controlled_by(player):
             continue
@@ -454,7 +443,7 @@ def valuable_completed_route_slots(game, player):
             or route.permanent_bonus_marker
             or has_upgrade
             or controls_both_cities
-            or _would_complete_east_west(game, player, route)
+            or _would_complete_east_west(game, player, route, networks)
         ):
             valuable.add(route_index)
     return valuable
@@ -498,6 +487,34 @@ def training_action_mask(
     return mask if mask.any() else original_mask
 
 
+def pack_action_sets(decisions):
+    """Return each decision's trained actions as a padded index matrix and validity mask.
+
+    A decision trains its equivalent actions, or only the chosen action when it
+    has none. Padding points at action 0 and is masked out of the loss.
+    """
+    action_sets = [
+        decision.equivalent_action_indices or (decision.action_index,) for decision in decisions
+    ]
+    lengths = torch.tensor([len(actions) for actions in action_sets])
+    valid = torch.arange(int(lengths.max())) < lengths.unsqueeze(1)
+    action_indices = torch.zeros(valid.shape, dtype=torch.long)
+    action_indices[valid] = torch.tensor(
+        [index for actions in action_sets for index in actions], dtype=torch.long
+    )
+    return action_indices, valid
+
+
+def action_set_loss(model_outputs, targets, action_indices, valid):
+    """Average each row's Smooth L1 loss over its valid actions, then over the batch."""
+    values = model_outputs.gather(1, action_indices)
+    errors = functional.smooth_l1_loss(
+        values, targets.unsqueeze(1).expand_as(values), reduction="none"
+    )
+    valid = valid.to(errors.dtype)
+    return ((errors * valid).sum(dim=1) / valid.sum(dim=1)).mean()
+
+
 def assign_reward_to_go(decisions, terminal_rewards, gamma):
     """Discount reward streams once per player turn, not once per interaction."""
     if not decisions:
@@ -851,6 +868,7 @@ class SelfPlayTrainer:
         self.loss_total = 0.0
         self.source_state_sha256 = None
         self.curriculum_state = None
+        self.replay_buffer = None
 
     def _tier(self, number):
         return PolicyTier(
@@ -859,14 +877,14 @@ class SelfPlayTrainer:
             self.config.tier_epsilons[number - 1],
         )
 
-    def _assign_tiers(self, player_count):
+    def _assign_tiers(self, player_count, rng=None):
         try:
             numbers = list(self.config.tier_subsets()[player_count])
         except KeyError as error:
             raise TrainingRunError(
                 f"No tier subset is configured for {player_count} players"
             ) from error
-        self.rng.shuffle(numbers)
+        (self.rng if rng is None else rng).shuffle(numbers)
         return tuple(self._tier(number) for number in numbers)
 
     def _assign_evaluation_tiers(self, player_count, rotation):
@@ -917,7 +935,8 @@ class SelfPlayTrainer:
         if len(grouped_indices) != len(legal_indices) or set(grouped_indices) != set(legal_indices):
             raise ValueError(f"{description} must contain every legal action exactly once")
 
-    def _select_action(self, scores, legal_indices, tier, equivalent_groups=None):
+    def _select_action(self, scores, legal_indices, tier, equivalent_groups=None, rng=None):
+        rng = self.rng if rng is None else rng
         legal_list = _action_index_tuple(legal_indices)
         groups = (
             tuple((index,) for index in legal_list)
@@ -928,17 +947,17 @@ class SelfPlayTrainer:
         group_count = len(groups)
         if group_count == 1:
             group = groups[0]
-            selected = group[0] if len(group) == 1 else group[self.rng.randrange(len(group))]
+            selected = group[0] if len(group) == 1 else group[rng.randrange(len(group))]
             return ActionSelection(selected, False, 1, 1, group)
         group_scores = self._group_mean_scores(scores, groups)
-        if self.rng.random() < tier.epsilon:
-            selected_position = self.rng.randrange(group_count)
+        if rng.random() < tier.epsilon:
+            selected_position = rng.randrange(group_count)
             used_epsilon = True
             model_rank = self._model_rank(group_scores, selected_position)
         else:
             effective_k = min(tier.top_k or group_count, group_count)
             ranked_positions = self._rank_legal_positions(group_scores, effective_k)
-            selected_rank = self.rng.choices(
+            selected_rank = rng.choices(
                 range(effective_k),
                 weights=normalized_rank_weights(effective_k),
                 k=1,
@@ -950,7 +969,7 @@ class SelfPlayTrainer:
         selected = (
             selected_group[0]
             if len(selected_group) == 1
-            else selected_group[self.rng.randrange(len(selected_group))]
+            else selected_group[rng.randrange(len(selected_group))]
         )
         return ActionSelection(
             selected,
@@ -960,8 +979,9 @@ class SelfPlayTrainer:
             selected_group,
         )
 
-    def _select_workflow_action(self, scores, legal_indices, exploration_categories=None):
+    def _select_workflow_action(self, scores, legal_indices, exploration_categories=None, rng=None):
         """Keep multi-click workflows coherent while retaining bounded exploration."""
+        rng = self.rng if rng is None else rng
         legal_list = _action_index_tuple(legal_indices)
         has_exploration_categories = exploration_categories is not None
         categories = (
@@ -978,12 +998,12 @@ class SelfPlayTrainer:
         candidate_count = len(candidate_groups)
         if candidate_count == 1:
             group = candidate_groups[0]
-            selected = group[0] if len(group) == 1 else group[self.rng.randrange(len(group))]
+            selected = group[0] if len(group) == 1 else group[rng.randrange(len(group))]
             return ActionSelection(selected, False, 1, 1, group)
         candidate_scores = self._group_mean_scores(scores, candidate_groups)
 
         ranked_positions = self._rank_legal_positions(candidate_scores, min(3, candidate_count))
-        roll = self.rng.random()
+        roll = rng.random()
         used_epsilon = False
         if candidate_count == 2:
             selected_rank = 0 if roll < 0.60 else 1
@@ -1000,15 +1020,15 @@ class SelfPlayTrainer:
             model_rank = 3
         else:
             if has_exploration_categories:
-                category_position = self.rng.randrange(len(categories))
+                category_position = rng.randrange(len(categories))
                 category = categories[category_position]
-                group_position = self.rng.randrange(len(category))
+                group_position = rng.randrange(len(category))
                 selected_group_position = (
                     sum(len(previous) for previous in categories[:category_position])
                     + group_position
                 )
             else:
-                selected_group_position = self.rng.randrange(candidate_count)
+                selected_group_position = rng.randrange(candidate_count)
             model_rank = self._model_rank(candidate_scores, selected_group_position)
             used_epsilon = True
 
@@ -1016,7 +1036,7 @@ class SelfPlayTrainer:
         selected_index = (
             selected_group[0]
             if len(selected_group) == 1
-            else selected_group[self.rng.randrange(len(selected_group))]
+            else selected_group[rng.randrange(len(selected_group))]
         )
         return ActionSelection(
             selected_index,
@@ -1076,6 +1096,111 @@ class SelfPlayTrainer:
         evaluation_tier_rotation=0,
     ) -> CompletedTrajectory:
         """Play one exact starting state without changing model weights."""
+        play = self._play_game(
+            starting_state,
+            failure_callback=failure_callback,
+            evaluation=evaluation,
+            evaluation_tier_rotation=evaluation_tier_rotation,
+            rng=self.rng,
+        )
+        output = redirect_stdout(io.StringIO()) if quiet else nullcontext()
+        self.model.eval()
+        with output, torch.inference_mode():
+            try:
+                features = next(play)
+                while True:
+                    inference_started = perf_counter()
+                    scores = self.model(features.float().unsqueeze(0).to(device))[0]
+                    features = play.send((scores, perf_counter() - inference_started))
+            except StopIteration as finished:
+                return finished.value
+
+    def collect_games(
+        self,
+        starting_states,
+        *,
+        seeds=None,
+        quiet=True,
+        failure_callbacks=None,
+        evaluation=False,
+        evaluation_tier_rotation=0,
+        return_exceptions=False,
+    ) -> tuple[CompletedTrajectory | Exception, ...]:
+        """Play several starting states in lockstep with one forward pass per step.
+
+        Every game draws its policy choices from ``random.Random(seed)``, so a
+        game matches ``collect_game`` after ``trainer.rng.seed(seed)`` whatever
+        the batch around it. Without ``seeds`` one seed per game is drawn from
+        the trainer RNG. With ``return_exceptions`` a failed game leaves its
+        exception in the result and the other games continue.
+        """
+        starting_states = tuple(starting_states)
+        if seeds is None:
+            seeds = [self.rng.getrandbits(64) for _state in starting_states]
+        seeds = tuple(seeds)
+        if len(seeds) != len(starting_states):
+            raise ValueError("collect_games needs one seed per starting state")
+        if failure_callbacks is None:
+            failure_callbacks = (None,) * len(starting_states)
+        failure_callbacks = tuple(failure_callbacks)
+        if len(failure_callbacks) != len(starting_states):
+            raise ValueError("collect_games needs one failure callback per starting state")
+
+        plays = [
+            self._play_game(
+                state,
+                failure_callback=callback,
+                evaluation=evaluation,
+                evaluation_tier_rotation=evaluation_tier_rotation,
+                rng=random.Random(seed),
+            )
+            for state, callback, seed in zip(starting_states, failure_callbacks, seeds)
+        ]
+        results = [None] * len(plays)
+        waiting = {}
+
+        def advance(game_index, reply):
+            play = plays[game_index]
+            try:
+                waiting[game_index] = next(play) if reply is None else play.send(reply)
+            except StopIteration as finished:
+                results[game_index] = finished.value
+            except Exception as error:
+                if not return_exceptions:
+                    raise
+                results[game_index] = error
+
+        output = redirect_stdout(io.StringIO()) if quiet else nullcontext()
+        self.model.eval()
+        with output, torch.inference_mode():
+            for game_index in range(len(plays)):
+                advance(game_index, None)
+            while waiting:
+                game_indices = sorted(waiting)
+                batch = torch.stack([waiting.pop(game_index) for game_index in game_indices])
+                inference_started = perf_counter()
+                scores = self.model(batch.float().to(device))
+                # Each game is charged an equal share of the shared forward pass.
+                share = (perf_counter() - inference_started) / len(game_indices)
+                for row, game_index in enumerate(game_indices):
+                    advance(game_index, (scores[row], share))
+        return tuple(results)
+
+    def _play_game(
+        self,
+        starting_state,
+        *,
+        failure_callback,
+        evaluation,
+        evaluation_tier_rotation,
+        rng,
+    ):
+        """Play one game, yielding each observation and receiving its model scores.
+
+        The generator yields the acting player's feature tensor and expects
+        ``(scores, inference_seconds)`` back; it returns the trajectory. Callers
+        own stdout redirection, evaluation mode and ``torch.inference_mode``.
+        """
         play_started = perf_counter()
         inference_seconds = 0.0
         scoring_seconds = 0.0
@@ -1101,15 +1226,16 @@ class SelfPlayTrainer:
                 reward_seconds,
             )
 
-        game = load_game(starting_state)
+        game = load_game(starting_state, trusted=True)
         game.set_interactive_errors(False)
         post_contexts = _post_contexts_by_slot(game)
         post_routes = {post: route for _route_index, route, post in post_contexts}
         post_route_indices = {post: route_index for route_index, _route, post in post_contexts}
+        observation_buffer = ObservationBuffer(self.encoder)
         seat_tiers = (
             self._assign_evaluation_tiers(len(game.players), evaluation_tier_rotation)
             if evaluation
-            else self._assign_tiers(len(game.players))
+            else self._assign_tiers(len(game.players), rng)
         )
         decisions = []
         action_trace = []
@@ -1136,616 +1262,607 @@ class SelfPlayTrainer:
         next_movement_workflow_id = 1
         normal_move_workflow_id = None
         permanent_move_workflow_id = None
-        output = redirect_stdout(io.StringIO()) if quiet else nullcontext()
         scoring_started = perf_counter()
         projected_before = game.projected_scores()
         scoring_seconds += perf_counter() - scoring_started
 
-        self.model.eval()
-        with output, torch.inference_mode():
-            for action_number in range(1, self.config.max_actions + 1):
-                if game.game_end:
-                    break
-                if game.turn_number != tracked_turn:
-                    all_move_penalty_applied = apply_all_move_turn_target(
-                        decisions,
-                        turn_move_workflow_ids,
-                        turn_spent_actions,
+        for action_number in range(1, self.config.max_actions + 1):
+            if game.game_end:
+                break
+            if game.turn_number != tracked_turn:
+                all_move_penalty_applied = apply_all_move_turn_target(
+                    decisions,
+                    turn_move_workflow_ids,
+                    turn_spent_actions,
+                )
+                movement_metrics.all_move_turn_penalties += int(all_move_penalty_applied)
+                tracked_turn = game.turn_number
+                pending_move_claim_routes = [frozenset() for _player in game.players]
+                pending_terminal_move_workflows = []
+                pending_terminal_completed_routes = set()
+                consecutive_move_actions = 0
+                turn_spent_actions = 0
+                turn_move_workflow_ids = []
+                move_destination_counts = {}
+                move_blocked_next_player = False
+                move_completed_routes_before = set()
+                move_tracking_active = False
+                move_pieces_picked_up = 0
+                move_origin_posts = []
+                move_origin_pieces = []
+                move_destination_posts = []
+                permanent_move_tracking_active = False
+                normal_move_workflow_id = None
+                permanent_move_workflow_id = None
+            action_attempted = False
+            try:
+                observation_started = perf_counter()
+                observation = self.encoder.build(game, observation_buffer)
+                observation_seconds += perf_counter() - observation_started
+                legality_started = perf_counter()
+                mask = training_action_mask(
+                    game,
+                    disable_move_action=self.config.disable_move_action,
+                    move_general_stock_threshold=self.config.move_general_stock_threshold,
+                    base_mask=observation.legal_action_mask,
+                    post_contexts=post_contexts,
+                )
+                legal_indices = mask.nonzero(as_tuple=False).flatten()
+                legality_seconds += perf_counter() - legality_started
+                if legal_indices.numel() == 0:
+                    self.progress.game_completion_failures += 1
+                    if (
+                        game.turn_phase == TurnPhase.REPLACE_BONUS_MARKERS
+                        and game.replace_bonus_marker > 0
+                    ):
+                        self.progress.replacement_route_deadlocks += 1
+                        error = TrainingRunError(
+                            "No route can receive the pending replacement bonus marker"
+                        )
+                        if failure_callback is not None:
+                            failure_callback(game, tuple(action_trace), seat_tiers, error)
+                        terminal_rewards = [0.0] * len(game.players)
+                        terminal_rewards[observation.observer_index] = NO_REPLACEMENT_ROUTE_PENALTY
+                        return self._complete_trajectory(
+                            decisions,
+                            terminal_rewards,
+                            projected_before,
+                            (),
+                            action_trace,
+                            seat_tiers,
+                            reason="no_replacement_route",
+                            completed=False,
+                            timings=timings(),
+                            movement_metrics=movement_metrics,
+                        )
+                    error = IncompleteGameError(
+                        "The game has no legal interaction at "
+                        f"turn {game.turn_number}, phase {game.turn_phase.value}"
                     )
-                    movement_metrics.all_move_turn_penalties += int(all_move_penalty_applied)
-                    tracked_turn = game.turn_number
-                    pending_move_claim_routes = [frozenset() for _player in game.players]
-                    pending_terminal_move_workflows = []
-                    pending_terminal_completed_routes = set()
-                    consecutive_move_actions = 0
-                    turn_spent_actions = 0
-                    turn_move_workflow_ids = []
-                    move_destination_counts = {}
-                    move_blocked_next_player = False
-                    move_completed_routes_before = set()
-                    move_tracking_active = False
-                    move_pieces_picked_up = 0
-                    move_origin_posts = []
-                    move_origin_pieces = []
-                    move_destination_posts = []
-                    permanent_move_tracking_active = False
-                    normal_move_workflow_id = None
-                    permanent_move_workflow_id = None
-                action_attempted = False
-                try:
-                    observation_started = perf_counter()
-                    observation = self.encoder.build(game)
-                    observation_seconds += perf_counter() - observation_started
-                    legality_started = perf_counter()
-                    mask = training_action_mask(
-                        game,
-                        disable_move_action=self.config.disable_move_action,
-                        move_general_stock_threshold=self.config.move_general_stock_threshold,
-                        base_mask=observation.legal_action_mask,
-                        post_contexts=post_contexts,
+                    raise error
+                legal_action_indices = _action_index_tuple(legal_indices)
+                scores, batch_inference_seconds = yield observation.features
+                inference_seconds += batch_inference_seconds
+                selection_started = perf_counter()
+                tier = seat_tiers[observation.observer_index]
+                if game.turn_phase is TurnPhase.ACTIONS:
+                    selection = self._select_action(
+                        scores,
+                        legal_action_indices,
+                        tier,
+                        action_phase_selection_groups(
+                            game,
+                            legal_action_indices,
+                            post_contexts,
+                        ),
+                        rng=rng,
                     )
-                    legal_indices = mask.nonzero(as_tuple=False).flatten()
-                    legality_seconds += perf_counter() - legality_started
-                    if legal_indices.numel() == 0:
-                        self.progress.game_completion_failures += 1
-                        if (
-                            game.turn_phase == TurnPhase.REPLACE_BONUS_MARKERS
-                            and game.replace_bonus_marker > 0
-                        ):
-                            self.progress.replacement_route_deadlocks += 1
-                            error = TrainingRunError(
-                                "No route can receive the pending replacement bonus marker"
-                            )
-                            if failure_callback is not None:
-                                failure_callback(game, tuple(action_trace), seat_tiers, error)
-                            terminal_rewards = [0.0] * len(game.players)
-                            terminal_rewards[observation.observer_index] = (
-                                NO_REPLACEMENT_ROUTE_PENALTY
-                            )
-                            return self._complete_trajectory(
-                                decisions,
-                                terminal_rewards,
-                                projected_before,
-                                (),
-                                action_trace,
-                                seat_tiers,
-                                reason="no_replacement_route",
-                                completed=False,
-                                timings=timings(),
-                                movement_metrics=movement_metrics,
-                            )
-                        error = IncompleteGameError(
-                            "The game has no legal interaction at "
-                            f"turn {game.turn_number}, phase {game.turn_phase.value}"
-                        )
-                        raise error
-                    legal_action_indices = _action_index_tuple(legal_indices)
-                    inference_started = perf_counter()
-                    scores = self.model(observation.features.float().unsqueeze(0).to(device))[0]
-                    inference_seconds += perf_counter() - inference_started
-                    selection_started = perf_counter()
-                    tier = seat_tiers[observation.observer_index]
-                    if game.turn_phase is TurnPhase.ACTIONS:
-                        selection = self._select_action(
-                            scores,
+                else:
+                    if game.turn_phase is TurnPhase.MOVE_PIECES:
+                        exploration_categories = move_workflow_exploration_categories(
+                            game,
                             legal_action_indices,
-                            tier,
-                            action_phase_selection_groups(
-                                game,
-                                legal_action_indices,
-                                post_contexts,
-                            ),
+                            post_contexts=post_contexts,
                         )
-                    else:
-                        if game.turn_phase is TurnPhase.MOVE_PIECES:
-                            exploration_categories = move_workflow_exploration_categories(
-                                game,
-                                legal_action_indices,
-                                post_contexts=post_contexts,
-                            )
-                        elif (
-                            game.turn_phase is TurnPhase.BONUS_MARKER_CHOICE
-                            and game.waiting_for_bm_move3
-                        ):
-                            exploration_categories = move_workflow_exploration_categories(
-                                game,
-                                legal_action_indices,
-                                opponent_pickups=True,
-                                post_contexts=post_contexts,
-                            )
-                        else:
-                            exploration_categories = None
-                        selection = self._select_workflow_action(
-                            scores,
+                    elif (
+                        game.turn_phase is TurnPhase.BONUS_MARKER_CHOICE
+                        and game.waiting_for_bm_move3
+                    ):
+                        exploration_categories = move_workflow_exploration_categories(
+                            game,
                             legal_action_indices,
-                            exploration_categories,
+                            opponent_pickups=True,
+                            post_contexts=post_contexts,
                         )
-                    action_index = selection.action_index
-                    action = _ACTIONS_BY_INDEX[action_index]
-                    selection_seconds += perf_counter() - selection_started
-                    context_started = perf_counter()
-                    action_phase = game.turn_phase
-                    acting_player = game.players[observation.observer_index]
-                    context = (
-                        post_contexts[action.post_slot]
-                        if isinstance(action, PostInteraction)
-                        else None
-                    )
-                    if action_phase is TurnPhase.ACTIONS and context is not None:
-                        route_index, _route, selected_post = context
-                        next_player_index = (observation.observer_index + 1) % len(game.players)
-                        next_player = game.players[next_player_index]
-                        if selected_post.owner is next_player:
-                            valuable_routes = valuable_completed_route_slots(game, next_player)
-                            if route_index in valuable_routes:
-                                pending_disruption = (
-                                    observation.observer_index,
-                                    next_player_index,
-                                    len(valuable_routes),
-                                )
-                    bank_capacity = acting_player.bank
-                    normal_move_in_progress = _is_normal_move_in_progress(
-                        action_phase, acting_player
-                    )
-                    permanent_move_in_progress = bool(
-                        action_phase is TurnPhase.BONUS_MARKER_CHOICE
-                        and game.waiting_for_bm_move_any_2
-                    )
-                    starts_normal_move = bool(
-                        action_phase is TurnPhase.ACTIONS
-                        and not acting_player.holding_pieces
-                        and isinstance(action, PostInteraction)
-                        and context is not None
-                        and context[2].owner is acting_player
-                    )
-                    if starts_normal_move:
-                        normal_move_workflow_id = next_movement_workflow_id
-                        next_movement_workflow_id += 1
-                    if permanent_move_in_progress and permanent_move_workflow_id is None:
-                        permanent_move_workflow_id = next_movement_workflow_id
-                        next_movement_workflow_id += 1
-                    movement_workflow_id = (
-                        normal_move_workflow_id
-                        if starts_normal_move or normal_move_in_progress
-                        else permanent_move_workflow_id
-                        if permanent_move_in_progress
-                        else None
+                    else:
+                        exploration_categories = None
+                    selection = self._select_workflow_action(
+                        scores,
+                        legal_action_indices,
+                        exploration_categories,
+                        rng=rng,
                     )
-                    movement_capacity = acting_player.book
-                    pieces_moved = move_pieces_picked_up
-                    actions_remaining_before = acting_player.actions_remaining
-                    move_placement_route = None
-                    move_placement_post = None
-                    movement_destination_routes = frozenset()
-                    move_blocks_next_player = False
-                    route_building_reward = 0.0
-                    route_building_post = None
-                    if (
-                        action_phase is TurnPhase.ACTIONS
-                        and not acting_player.holding_pieces
-                        and isinstance(action, PostInteraction)
-                        and context is not None
-                    ):
-                        _route_index, route, selected_post = context
-                        if selected_post.owner is not acting_player:
-                            route_building_reward = route_building_post_reward(
-                                route_already_has_piece=any(
-                                    post.owner is acting_player for post in route.posts
-                                ),
-                                is_displacement=selected_post.is_owned(),
-                            )
-                            route_building_post = selected_post
-                    if (
-                        normal_move_in_progress
-                        and isinstance(action, PostInteraction)
-                        and context is not None
-                    ):
-                        route_index, route, selected_post = context
-                        if not selected_post.is_owned():
-                            move_placement_route = route_index
-                            move_placement_post = selected_post
-                            next_player = game.players[
-                                (observation.observer_index + 1) % len(game.players)
-                            ]
-                            move_blocks_next_player = bool(route.posts) and all(
-                                post is selected_post or post.owner is next_player
-                                for post in route.posts
-                            )
-                        elif selected_post.owner is acting_player:
-                            move_origin_posts.append(selected_post)
-                            move_origin_pieces.append(
-                                (
-                                    selected_post,
-                                    selected_post.owner,
-                                    selected_post.owner_piece_shape,
-                                )
+                action_index = selection.action_index
+                action = _ACTIONS_BY_INDEX[action_index]
+                selection_seconds += perf_counter() - selection_started
+                context_started = perf_counter()
+                action_phase = game.turn_phase
+                acting_player = game.players[observation.observer_index]
+                context = (
+                    post_contexts[action.post_slot] if isinstance(action, PostInteraction) else None
+                )
+                if action_phase is TurnPhase.ACTIONS and context is not None:
+                    route_index, _route, selected_post = context
+                    next_player_index = (observation.observer_index + 1) % len(game.players)
+                    next_player = game.players[next_player_index]
+                    if selected_post.owner is next_player:
+                        valuable_routes = valuable_completed_route_slots(game, next_player)
+                        if route_index in valuable_routes:
+                            pending_disruption = (
+                                observation.observer_index,
+                                next_player_index,
+                                len(valuable_routes),
                             )
-                    elif (
-                        permanent_move_in_progress
-                        and isinstance(action, PostInteraction)
-                        and context is not None
-                    ):
-                        _route_index, _route, selected_post = context
-                        if selected_post.is_owned():
-                            if not permanent_move_tracking_active:
-                                move_origin_posts = []
-                                move_origin_pieces = []
-                                move_destination_posts = []
-                                permanent_move_tracking_active = True
-                            move_origin_posts.append(selected_post)
-                            move_origin_pieces.append(
-                                (
-                                    selected_post,
-                                    selected_post.owner,
-                                    selected_post.owner_piece_shape,
-                                )
+                bank_capacity = acting_player.bank
+                normal_move_in_progress = _is_normal_move_in_progress(action_phase, acting_player)
+                permanent_move_in_progress = bool(
+                    action_phase is TurnPhase.BONUS_MARKER_CHOICE and game.waiting_for_bm_move_any_2
+                )
+                starts_normal_move = bool(
+                    action_phase is TurnPhase.ACTIONS
+                    and not acting_player.holding_pieces
+                    and isinstance(action, PostInteraction)
+                    and context is not None
+                    and context[2].owner is acting_player
+                )
+                if starts_normal_move:
+                    normal_move_workflow_id = next_movement_workflow_id
+                    next_movement_workflow_id += 1
+                if permanent_move_in_progress and permanent_move_workflow_id is None:
+                    permanent_move_workflow_id = next_movement_workflow_id
+                    next_movement_workflow_id += 1
+                movement_workflow_id = (
+                    normal_move_workflow_id
+                    if starts_normal_move or normal_move_in_progress
+                    else permanent_move_workflow_id
+                    if permanent_move_in_progress
+                    else None
+                )
+                movement_capacity = acting_player.book
+                pieces_moved = move_pieces_picked_up
+                actions_remaining_before = acting_player.actions_remaining
+                move_placement_route = None
+                move_placement_post = None
+                movement_destination_routes = frozenset()
+                move_blocks_next_player = False
+                route_building_reward = 0.0
+                route_building_post = None
+                if (
+                    action_phase is TurnPhase.ACTIONS
+                    and not acting_player.holding_pieces
+                    and isinstance(action, PostInteraction)
+                    and context is not None
+                ):
+                    _route_index, route, selected_post = context
+                    if selected_post.owner is not acting_player:
+                        route_building_reward = route_building_post_reward(
+                            route_already_has_piece=any(
+                                post.owner is acting_player for post in route.posts
+                            ),
+                            is_displacement=selected_post.is_owned(),
+                        )
+                        route_building_post = selected_post
+                if (
+                    normal_move_in_progress
+                    and isinstance(action, PostInteraction)
+                    and context is not None
+                ):
+                    route_index, route, selected_post = context
+                    if not selected_post.is_owned():
+                        move_placement_route = route_index
+                        move_placement_post = selected_post
+                        next_player = game.players[
+                            (observation.observer_index + 1) % len(game.players)
+                        ]
+                        move_blocks_next_player = bool(route.posts) and all(
+                            post is selected_post or post.owner is next_player
+                            for post in route.posts
+                        )
+                    elif selected_post.owner is acting_player:
+                        move_origin_posts.append(selected_post)
+                        move_origin_pieces.append(
+                            (
+                                selected_post,
+                                selected_post.owner,
+                                selected_post.owner_piece_shape,
                             )
-                        elif acting_player.holding_pieces:
-                            move_placement_post = selected_post
-                    elif (
-                        action_phase is TurnPhase.ACTIONS
-                        and not acting_player.holding_pieces
-                        and isinstance(action, PostInteraction)
-                        and context is not None
-                        and context[2].owner is acting_player
-                    ):
-                        move_destination_counts = {}
-                        move_completed_routes_before = {
-                            route_index
-                            for route_index, route in enumerate(game.selected_map.routes)
-                            if route.is_controlled_by(acting_player)
-                        }
-                        move_tracking_active = True
-                        move_pieces_picked_up = 0
-                        move_origin_posts = [selected_post]
-                        move_origin_pieces = [
+                        )
+                elif (
+                    permanent_move_in_progress
+                    and isinstance(action, PostInteraction)
+                    and context is not None
+                ):
+                    _route_index, _route, selected_post = context
+                    if selected_post.is_owned():
+                        if not permanent_move_tracking_active:
+                            move_origin_posts = []
+                            move_origin_pieces = []
+                            move_destination_posts = []
+                            permanent_move_tracking_active = True
+                        move_origin_posts.append(selected_post)
+                        move_origin_pieces.append(
                             (
                                 selected_post,
                                 selected_post.owner,
                                 selected_post.owner_piece_shape,
                             )
-                        ]
-                        move_destination_posts = []
-                    general_stock_before = (
-                        acting_player.general_stock_squares + acting_player.general_stock_circles
-                    )
-                    score_before = acting_player.score
-                    office_count_before = sum(
-                        office.controller is acting_player
-                        for city in game.selected_map.cities
-                        for office in city.offices
-                    )
-                    bonus_marker_count_before = len(acting_player.bonus_markers) + len(
-                        acting_player.used_bonus_markers
-                    )
-                    route_had_permanent_marker = bool(
-                        action_phase is TurnPhase.ACTIONS
-                        and isinstance(action, RouteInteraction)
-                        and game.selected_map.routes[action.route_slot].permanent_bonus_marker
-                    )
-                    abilities_before = tuple(
-                        acting_player.actions_index
-                        if ability == "actions"
-                        else getattr(acting_player, ability)
-                        for ability in INTERMEDIATE_REWARDED_ABILITIES
-                    )
-                    context_seconds += perf_counter() - context_started
-                    end_was_pending = game.game_end or game.game_end_pending_immediate_resolution
-                    turn_before = game.turn_number
-                    action_trace.append(action_index)
-                    action_attempted = True
-                    execution_started = perf_counter()
-                    game.apply_ai_action(action_index)
-                    if move_tracking_active:
-                        move_pieces_picked_up = max(
-                            move_pieces_picked_up, len(acting_player.holding_pieces)
                         )
-                    if move_placement_post is not None and move_placement_post.is_owned():
-                        move_destination_posts.append(move_placement_post)
-                    execution_seconds += perf_counter() - execution_started
-                    if should_fully_validate(
-                        action_number,
-                        self.config.full_validation_interval,
-                        turn_before,
-                        action_phase,
-                        game,
-                    ):
-                        validation_started = perf_counter()
-                        validate_game(game)
-                        validation_seconds += perf_counter() - validation_started
-                except Exception as error:
-                    if action_attempted:
-                        self.progress.invalid_action_attempts += 1
-                    if failure_callback is not None:
-                        failure_callback(game, tuple(action_trace), seat_tiers, error)
-                    raise
-                scoring_started = perf_counter()
-                projected_after = game.projected_scores()
-                scoring_seconds += perf_counter() - scoring_started
-                reward_started = perf_counter()
-                score_reward_deltas = tuple(
-                    float(PRESTIGE_REWARD_MULTIPLIER * (after - before))
-                    for before, after in zip(projected_before, projected_after)
-                )
-                projected_before = projected_after
-                general_stock_after = (
+                    elif acting_player.holding_pieces:
+                        move_placement_post = selected_post
+                elif (
+                    action_phase is TurnPhase.ACTIONS
+                    and not acting_player.holding_pieces
+                    and isinstance(action, PostInteraction)
+                    and context is not None
+                    and context[2].owner is acting_player
+                ):
+                    move_destination_counts = {}
+                    move_completed_routes_before = {
+                        route_index
+                        for route_index, route in enumerate(game.selected_map.routes)
+                        if route.is_controlled_by(acting_player)
+                    }
+                    move_tracking_active = True
+                    move_pieces_picked_up = 0
+                    move_origin_posts = [selected_post]
+                    move_origin_pieces = [
+                        (
+                            selected_post,
+                            selected_post.owner,
+                            selected_post.owner_piece_shape,
+                        )
+                    ]
+                    move_destination_posts = []
+                general_stock_before = (
                     acting_player.general_stock_squares + acting_player.general_stock_circles
                 )
-                player_reward_deltas = apply_income_efficiency_penalty(
-                    score_reward_deltas,
-                    action=action,
-                    turn_phase=action_phase,
-                    acting_player_index=observation.observer_index,
-                    bank_capacity=bank_capacity,
-                    pieces_received=general_stock_before - general_stock_after,
-                    scale=self.config.income_penalty_scale,
+                score_before = acting_player.score
+                office_count_before = sum(
+                    office.controller is acting_player
+                    for city in game.selected_map.cities
+                    for office in city.offices
+                )
+                bonus_marker_count_before = len(acting_player.bonus_markers) + len(
+                    acting_player.used_bonus_markers
+                )
+                route_had_permanent_marker = bool(
+                    action_phase is TurnPhase.ACTIONS
+                    and isinstance(action, RouteInteraction)
+                    and game.selected_map.routes[action.route_slot].permanent_bonus_marker
                 )
-                abilities_after = tuple(
+                abilities_before = tuple(
                     acting_player.actions_index
                     if ability == "actions"
                     else getattr(acting_player, ability)
                     for ability in INTERMEDIATE_REWARDED_ABILITIES
                 )
-                intermediate_upgrade_reward = intermediate_ability_upgrade_reward(
-                    abilities_before, abilities_after
-                )
-                if intermediate_upgrade_reward:
-                    adjusted = list(player_reward_deltas)
-                    adjusted[observation.observer_index] += intermediate_upgrade_reward
-                    player_reward_deltas = tuple(adjusted)
-                office_count_after = sum(
-                    office.controller is acting_player
-                    for city in game.selected_map.cities
-                    for office in city.offices
+                context_seconds += perf_counter() - context_started
+                end_was_pending = game.game_end or game.game_end_pending_immediate_resolution
+                turn_before = game.turn_number
+                action_trace.append(action_index)
+                action_attempted = True
+                execution_started = perf_counter()
+                game.apply_ai_action(action_index)
+                if move_tracking_active:
+                    move_pieces_picked_up = max(
+                        move_pieces_picked_up, len(acting_player.holding_pieces)
+                    )
+                if move_placement_post is not None and move_placement_post.is_owned():
+                    move_destination_posts.append(move_placement_post)
+                execution_seconds += perf_counter() - execution_started
+                validation_started = perf_counter()
+                if should_fully_validate(
+                    action_number,
+                    self.config.full_validation_interval,
+                    turn_before,
+                    action_phase,
+                    game,
+                ):
+                    validate_game(game)
+                else:
+                    validate_counters(game)
+                validation_seconds += perf_counter() - validation_started
+            except Exception as error:
+                if action_attempted:
+                    self.progress.invalid_action_attempts += 1
+                if failure_callback is not None:
+                    failure_callback(game, tuple(action_trace), seat_tiers, error)
+                raise
+            scoring_started = perf_counter()
+            projected_after = game.projected_scores()
+            scoring_seconds += perf_counter() - scoring_started
+            reward_started = perf_counter()
+            score_reward_deltas = tuple(
+                float(PRESTIGE_REWARD_MULTIPLIER * (after - before))
+                for before, after in zip(projected_before, projected_after)
+            )
+            projected_before = projected_after
+            general_stock_after = (
+                acting_player.general_stock_squares + acting_player.general_stock_circles
+            )
+            player_reward_deltas = apply_income_efficiency_penalty(
+                score_reward_deltas,
+                action=action,
+                turn_phase=action_phase,
+                acting_player_index=observation.observer_index,
+                bank_capacity=bank_capacity,
+                pieces_received=general_stock_before - general_stock_after,
+                scale=self.config.income_penalty_scale,
+            )
+            abilities_after = tuple(
+                acting_player.actions_index
+                if ability == "actions"
+                else getattr(acting_player, ability)
+                for ability in INTERMEDIATE_REWARDED_ABILITIES
+            )
+            intermediate_upgrade_reward = intermediate_ability_upgrade_reward(
+                abilities_before, abilities_after
+            )
+            if intermediate_upgrade_reward:
+                adjusted = list(player_reward_deltas)
+                adjusted[observation.observer_index] += intermediate_upgrade_reward
+                player_reward_deltas = tuple(adjusted)
+            office_count_after = sum(
+                office.controller is acting_player
+                for city in game.selected_map.cities
+                for office in city.offices
+            )
+            bonus_marker_count_after = len(acting_player.bonus_markers) + len(
+                acting_player.used_bonus_markers
+            )
+            route_claim_penalty = pointless_route_claim_penalty(
+                action=action,
+                turn_phase=action_phase,
+                action_was_spent=acting_player.actions_remaining < actions_remaining_before,
+                gained_office=office_count_after > office_count_before,
+                gained_upgrade=abilities_after != abilities_before,
+                gained_marker=bonus_marker_count_after > bonus_marker_count_before,
+                gained_points=(
+                    acting_player.score > score_before
+                    or score_reward_deltas[observation.observer_index] > 0
+                ),
+                route_had_permanent_marker=route_had_permanent_marker,
+            )
+            if route_claim_penalty:
+                adjusted = list(player_reward_deltas)
+                adjusted[observation.observer_index] += route_claim_penalty
+                player_reward_deltas = tuple(adjusted)
+            if route_building_reward and route_building_post.owner is acting_player:
+                adjusted = list(player_reward_deltas)
+                adjusted[observation.observer_index] += route_building_reward
+                player_reward_deltas = tuple(adjusted)
+            normal_move_completed = normal_move_in_progress and not acting_player.holding_pieces
+            permanent_move_completed = bool(
+                permanent_move_in_progress
+                and not game.waiting_for_bm_move_any_2
+                and not acting_player.holding_pieces
+            )
+            action_was_spent = acting_player.actions_remaining < actions_remaining_before
+            repeated_move_penalty = 0.0
+            no_change_penalty = 0.0
+            movement_local_target = None
+            if normal_move_completed and action_was_spent:
+                next_consecutive_move = consecutive_move_actions + 1
+                repeated_move_penalty = consecutive_move_penalty(
+                    movement_capacity, next_consecutive_move
                 )
-                bonus_marker_count_after = len(acting_player.bonus_markers) + len(
-                    acting_player.used_bonus_markers
+                no_change_penalty = pointless_movement_penalty(
+                    move_origin_pieces,
+                    move_destination_posts,
+                    post_routes,
                 )
-                route_claim_penalty = pointless_route_claim_penalty(
-                    action=action,
-                    turn_phase=action_phase,
-                    action_was_spent=acting_player.actions_remaining < actions_remaining_before,
-                    gained_office=office_count_after > office_count_before,
-                    gained_upgrade=abilities_after != abilities_before,
-                    gained_marker=bonus_marker_count_after > bonus_marker_count_before,
-                    gained_points=(
-                        acting_player.score > score_before
-                        or score_reward_deltas[observation.observer_index] > 0
-                    ),
-                    route_had_permanent_marker=route_had_permanent_marker,
+                if next_consecutive_move >= 3 or no_change_penalty:
+                    movement_local_target = repeated_move_penalty + no_change_penalty
+            elif permanent_move_completed:
+                no_change_penalty = pointless_movement_penalty(
+                    move_origin_pieces,
+                    move_destination_posts,
+                    post_routes,
                 )
-                if route_claim_penalty:
-                    adjusted = list(player_reward_deltas)
-                    adjusted[observation.observer_index] += route_claim_penalty
-                    player_reward_deltas = tuple(adjusted)
-                if route_building_reward and route_building_post.owner is acting_player:
-                    adjusted = list(player_reward_deltas)
-                    adjusted[observation.observer_index] += route_building_reward
-                    player_reward_deltas = tuple(adjusted)
-                normal_move_completed = normal_move_in_progress and not acting_player.holding_pieces
-                permanent_move_completed = bool(
-                    permanent_move_in_progress
-                    and not game.waiting_for_bm_move_any_2
-                    and not acting_player.holding_pieces
+                movement_local_target = no_change_penalty or None
+            movement_metrics.pointless_move_workflows += int(bool(no_change_penalty))
+            movement_metrics.repeated_move_penalties += int(bool(repeated_move_penalty))
+            player_reward_deltas = apply_movement_efficiency_penalty(
+                player_reward_deltas,
+                acting_player_index=observation.observer_index,
+                movement_capacity=movement_capacity,
+                pieces_moved=pieces_moved,
+                normal_move_completed=normal_move_completed and movement_local_target is None,
+            )
+            if move_placement_route is not None:
+                move_destination_counts[move_placement_route] = (
+                    move_destination_counts.get(move_placement_route, 0) + 1
                 )
-                action_was_spent = acting_player.actions_remaining < actions_remaining_before
-                repeated_move_penalty = 0.0
-                no_change_penalty = 0.0
-                movement_local_target = None
-                if normal_move_completed and action_was_spent:
-                    next_consecutive_move = consecutive_move_actions + 1
-                    repeated_move_penalty = consecutive_move_penalty(
-                        movement_capacity, next_consecutive_move
+                if move_blocks_next_player:
+                    move_blocked_next_player = True
+            if action_was_spent:
+                movement_metrics.spent_action_count += 1
+                turn_spent_actions += 1
+                newly_completed_routes = frozenset()
+                if normal_move_completed:
+                    movement_metrics.move_action_count += 1
+                    turn_move_workflow_ids.append(movement_workflow_id)
+                    consecutive_move_actions += 1
+                    movement_destination_routes = frozenset(
+                        post_route_indices[post] for post in move_destination_posts
                     )
-                    no_change_penalty = pointless_movement_penalty(
-                        move_origin_pieces,
-                        move_destination_posts,
-                        post_routes,
+                    completed_routes_after = (
+                        {
+                            route_index
+                            for route_index, route in enumerate(game.selected_map.routes)
+                            if route.is_controlled_by(acting_player)
+                        }
+                        if move_tracking_active
+                        else set()
                     )
-                    if next_consecutive_move >= 3 or no_change_penalty:
-                        movement_local_target = repeated_move_penalty + no_change_penalty
-                elif permanent_move_completed:
-                    no_change_penalty = pointless_movement_penalty(
-                        move_origin_pieces,
-                        move_destination_posts,
-                        post_routes,
+                    newly_completed_routes = frozenset(
+                        completed_routes_after - move_completed_routes_before
                     )
-                    movement_local_target = no_change_penalty or None
-                movement_metrics.pointless_move_workflows += int(bool(no_change_penalty))
-                movement_metrics.repeated_move_penalties += int(bool(repeated_move_penalty))
-                player_reward_deltas = apply_movement_efficiency_penalty(
-                    player_reward_deltas,
-                    acting_player_index=observation.observer_index,
-                    movement_capacity=movement_capacity,
-                    pieces_moved=pieces_moved,
-                    normal_move_completed=normal_move_completed and movement_local_target is None,
-                )
-                if move_placement_route is not None:
-                    move_destination_counts[move_placement_route] = (
-                        move_destination_counts.get(move_placement_route, 0) + 1
+                    movement_metrics.moves_creating_claimable_route += int(
+                        bool(newly_completed_routes)
                     )
-                    if move_blocks_next_player:
-                        move_blocked_next_player = True
-                if action_was_spent:
-                    movement_metrics.spent_action_count += 1
-                    turn_spent_actions += 1
-                    newly_completed_routes = frozenset()
-                    if normal_move_completed:
-                        movement_metrics.move_action_count += 1
-                        turn_move_workflow_ids.append(movement_workflow_id)
-                        consecutive_move_actions += 1
-                        movement_destination_routes = frozenset(
-                            post_route_indices[post] for post in move_destination_posts
-                        )
-                        completed_routes_after = (
-                            {
-                                route_index
-                                for route_index, route in enumerate(game.selected_map.routes)
-                                if route.is_controlled_by(acting_player)
-                            }
-                            if move_tracking_active
-                            else set()
-                        )
-                        newly_completed_routes = frozenset(
-                            completed_routes_after - move_completed_routes_before
-                        )
-                        movement_metrics.moves_creating_claimable_route += int(
-                            bool(newly_completed_routes)
+                    adjusted = list(player_reward_deltas)
+                    if movement_local_target is None:
+                        adjusted[observation.observer_index] += repeated_move_penalty
+                        if move_blocked_next_player:
+                            adjusted[observation.observer_index] += MOVE_BLOCK_REWARD
+                        (
+                            rewarded_move_focus_routes[observation.observer_index],
+                            route_focus_reward,
+                        ) = move_route_focus_reward(
+                            rewarded_move_focus_routes[observation.observer_index],
+                            move_destination_counts,
                         )
-                        adjusted = list(player_reward_deltas)
-                        if movement_local_target is None:
-                            adjusted[observation.observer_index] += repeated_move_penalty
-                            if move_blocked_next_player:
-                                adjusted[observation.observer_index] += MOVE_BLOCK_REWARD
-                            (
-                                rewarded_move_focus_routes[observation.observer_index],
-                                route_focus_reward,
-                            ) = move_route_focus_reward(
-                                rewarded_move_focus_routes[observation.observer_index],
-                                move_destination_counts,
+                        adjusted[observation.observer_index] += route_focus_reward
+                        if move_tracking_active:
+                            adjusted[observation.observer_index] += completed_route_move_reward(
+                                move_completed_routes_before,
+                                completed_routes_after,
                             )
-                            adjusted[observation.observer_index] += route_focus_reward
-                            if move_tracking_active:
-                                adjusted[observation.observer_index] += completed_route_move_reward(
-                                    move_completed_routes_before,
-                                    completed_routes_after,
-                                )
-                        player_reward_deltas = tuple(adjusted)
-                        move_destination_counts = {}
-                        move_blocked_next_player = False
-                        move_completed_routes_before = set()
-                        move_tracking_active = False
-                        move_pieces_picked_up = 0
-                        move_origin_posts = []
-                        move_origin_pieces = []
-                        move_destination_posts = []
-                    else:
-                        consecutive_move_actions = 0
-                    if action_phase is TurnPhase.ACTIONS and isinstance(action, RouteInteraction):
-                        rewarded = set(rewarded_move_focus_routes[observation.observer_index])
-                        rewarded.discard(action.route_slot)
-                        rewarded_move_focus_routes[observation.observer_index] = frozenset(rewarded)
-                    pending_routes, combo_reward = update_move_claim_combo(
-                        pending_move_claim_routes[observation.observer_index],
-                        action=action,
-                        turn_phase=action_phase,
-                        action_was_spent=True,
-                        newly_completed_routes=newly_completed_routes,
-                    )
-                    pending_move_claim_routes[observation.observer_index] = pending_routes
-                    if combo_reward:
-                        movement_metrics.move_claim_conversions += 1
-                        adjusted = list(player_reward_deltas)
-                        adjusted[observation.observer_index] += combo_reward
-                        player_reward_deltas = tuple(adjusted)
-                    if normal_move_completed:
-                        pending_terminal_move_workflows.append(
-                            (movement_workflow_id, movement_destination_routes)
-                        )
-                        pending_terminal_completed_routes.update(newly_completed_routes)
-                    else:
-                        claimed_route = (
-                            action.route_slot
-                            if action_phase is TurnPhase.ACTIONS
-                            and isinstance(action, RouteInteraction)
-                            else None
-                        )
-                        for workflow_id in credited_movement_workflows(
-                            pending_terminal_move_workflows,
-                            pending_terminal_completed_routes,
-                            claimed_route,
-                        ):
-                            grant_movement_workflow_terminal_credit(decisions, workflow_id)
-                        pending_terminal_move_workflows.clear()
-                        pending_terminal_completed_routes.clear()
-                if permanent_move_completed:
+                    player_reward_deltas = tuple(adjusted)
+                    move_destination_counts = {}
+                    move_blocked_next_player = False
+                    move_completed_routes_before = set()
+                    move_tracking_active = False
+                    move_pieces_picked_up = 0
                     move_origin_posts = []
                     move_origin_pieces = []
                     move_destination_posts = []
-                    permanent_move_tracking_active = False
-                player_reward_deltas = apply_route_completion_reward(
-                    player_reward_deltas,
-                    action=action,
-                    turn_phase=action_phase,
-                    acting_player_index=observation.observer_index,
-                )
-                player_reward_deltas = apply_opponent_route_score_penalty(
-                    player_reward_deltas,
+                else:
+                    consecutive_move_actions = 0
+                if action_phase is TurnPhase.ACTIONS and isinstance(action, RouteInteraction):
+                    rewarded = set(rewarded_move_focus_routes[observation.observer_index])
+                    rewarded.discard(action.route_slot)
+                    rewarded_move_focus_routes[observation.observer_index] = frozenset(rewarded)
+                pending_routes, combo_reward = update_move_claim_combo(
+                    pending_move_claim_routes[observation.observer_index],
                     action=action,
                     turn_phase=action_phase,
-                    acting_player_index=observation.observer_index,
-                    projected_reward_deltas=score_reward_deltas,
+                    action_was_spent=True,
+                    newly_completed_routes=newly_completed_routes,
                 )
-                if pending_disruption is not None and game.turn_phase is TurnPhase.ACTIONS:
-                    disrupting_player, threatened_player, threats_before = pending_disruption
-                    threats_after = len(
-                        valuable_completed_route_slots(game, game.players[threatened_player])
+                pending_move_claim_routes[observation.observer_index] = pending_routes
+                if combo_reward:
+                    movement_metrics.move_claim_conversions += 1
+                    adjusted = list(player_reward_deltas)
+                    adjusted[observation.observer_index] += combo_reward
+                    player_reward_deltas = tuple(adjusted)
+                if normal_move_completed:
+                    pending_terminal_move_workflows.append(
+                        (movement_workflow_id, movement_destination_routes)
                     )
-                    disrupted_routes = max(threats_before - threats_after, 0)
-                    if disrupted_routes:
-                        adjusted = list(player_reward_deltas)
-                        adjusted[disrupting_player] += 25.0 * disrupted_routes
-                        player_reward_deltas = tuple(adjusted)
-                    pending_disruption = None
-                decisions.append(
-                    TrainingDecision(
-                        observation.features.clone(),
-                        mask.to(torch.uint8),
-                        action_index,
-                        observation.observer_index,
-                        player_reward_deltas,
-                        player_reward_deltas[observation.observer_index],
-                        tier.number,
-                        tier.epsilon,
-                        tier.top_k,
-                        selection.used_epsilon,
-                        selection.model_rank,
-                        selection.legal_action_count,
-                        turn_before,
-                        movement_workflow_id,
-                        equivalent_action_indices=selection.equivalent_action_indices,
-                        receives_terminal_credit=not (
-                            starts_normal_move or normal_move_in_progress
-                        ),
+                    pending_terminal_completed_routes.update(newly_completed_routes)
+                else:
+                    claimed_route = (
+                        action.route_slot
+                        if action_phase is TurnPhase.ACTIONS
+                        and isinstance(action, RouteInteraction)
+                        else None
                     )
+                    for workflow_id in credited_movement_workflows(
+                        pending_terminal_move_workflows,
+                        pending_terminal_completed_routes,
+                        claimed_route,
+                    ):
+                        grant_movement_workflow_terminal_credit(decisions, workflow_id)
+                    pending_terminal_move_workflows.clear()
+                    pending_terminal_completed_routes.clear()
+            if permanent_move_completed:
+                move_origin_posts = []
+                move_origin_pieces = []
+                move_destination_posts = []
+                permanent_move_tracking_active = False
+            player_reward_deltas = apply_route_completion_reward(
+                player_reward_deltas,
+                action=action,
+                turn_phase=action_phase,
+                acting_player_index=observation.observer_index,
+            )
+            player_reward_deltas = apply_opponent_route_score_penalty(
+                player_reward_deltas,
+                action=action,
+                turn_phase=action_phase,
+                acting_player_index=observation.observer_index,
+                projected_reward_deltas=score_reward_deltas,
+            )
+            if pending_disruption is not None and game.turn_phase is TurnPhase.ACTIONS:
+                disrupting_player, threatened_player, threats_before = pending_disruption
+                threats_after = len(
+                    valuable_completed_route_slots(game, game.players[threatened_player])
                 )
-                if movement_local_target is not None:
-                    mark_movement_workflow_target(
-                        decisions,
-                        movement_workflow_id,
-                        movement_local_target,
-                    )
-                if normal_move_completed:
-                    normal_move_workflow_id = None
-                if permanent_move_completed:
-                    permanent_move_workflow_id = None
-                reward_seconds += perf_counter() - reward_started
-                end_is_pending = game.game_end or game.game_end_pending_immediate_resolution
-                if game_end_trigger_player is None and end_is_pending and not end_was_pending:
-                    game_end_trigger_player = observation.observer_index
-            else:
-                self.progress.game_completion_failures += 1
-                error = ActionLimitExceeded(
-                    f"Game did not finish within {self.config.max_actions} actions"
+                disrupted_routes = max(threats_before - threats_after, 0)
+                if disrupted_routes:
+                    adjusted = list(player_reward_deltas)
+                    adjusted[disrupting_player] += 25.0 * disrupted_routes
+                    player_reward_deltas = tuple(adjusted)
+                pending_disruption = None
+            decisions.append(
+                TrainingDecision(
+                    observation.features.clone(),
+                    mask.to(torch.uint8),
+                    action_index,
+                    observation.observer_index,
+                    player_reward_deltas,
+                    player_reward_deltas[observation.observer_index],
+                    tier.number,
+                    tier.epsilon,
+                    tier.top_k,
+                    selection.used_epsilon,
+                    selection.model_rank,
+                    selection.legal_action_count,
+                    turn_before,
+                    movement_workflow_id,
+                    equivalent_action_indices=selection.equivalent_action_indices,
+                    receives_terminal_credit=not (starts_normal_move or normal_move_in_progress),
                 )
-                if failure_callback is not None:
-                    failure_callback(game, tuple(action_trace), seat_tiers, error)
-                if evaluation:
-                    raise error
-                # A timeout is not a game loss. Keep every authoritative reward
-                # and penalty already earned, but add no invented terminal value.
-                return self._complete_trajectory(
+            )
+            if movement_local_target is not None:
+                mark_movement_workflow_target(
                     decisions,
-                    (0.0,) * len(game.players),
-                    projected_before,
-                    (),
-                    action_trace,
-                    seat_tiers,
-                    reason="action_limit",
-                    completed=False,
-                    timings=timings(),
-                    movement_metrics=movement_metrics,
+                    movement_workflow_id,
+                    movement_local_target,
                 )
+            if normal_move_completed:
+                normal_move_workflow_id = None
+            if permanent_move_completed:
+                permanent_move_workflow_id = None
+            reward_seconds += perf_counter() - reward_started
+            end_is_pending = game.game_end or game.game_end_pending_immediate_resolution
+            if game_end_trigger_player is None and end_is_pending and not end_was_pending:
+                game_end_trigger_player = observation.observer_index
+        else:
+            self.progress.game_completion_failures += 1
+            error = ActionLimitExceeded(
+                f"Game did not finish within {self.config.max_actions} actions"
+            )
+            if failure_callback is not None:
+                failure_callback(game, tuple(action_trace), seat_tiers, error)
+            if evaluation:
+                raise error
+            # A timeout is not a game loss. Keep every authoritative reward
+            # and penalty already earned, but add no invented terminal value.
+            return self._complete_trajectory(
+                decisions,
+                (0.0,) * len(game.players),
+                projected_before,
+                (),
+                action_trace,
+                seat_tiers,
+                reason="action_limit",
+                completed=False,
+                timings=timings(),
+                movement_metrics=movement_metrics,
+            )
 
         validation_started = perf_counter()
         validate_game(game)
@@ -1887,49 +2004,59 @@ class SelfPlayTrainer:
             self.rng.shuffle(batch)
         return tuple(batch for batch in batches if batch)
 
+    def _apply_loss(self, loss):
+        self.optimizer.zero_grad()
+        loss.backward()
+        torch.nn.utils.clip_grad_norm_(self.model.parameters(), self.config.max_gradient_norm)
+        self.optimizer.step()
+        self.progress.training_updates += 1
+        return float(loss.detach().cpu())
+
+    def _decision_loss(self, decisions):
+        observations = torch.stack([sample.observation for sample in decisions]).float().to(device)
+        targets = torch.tensor(
+            [sample.reward_to_go for sample in decisions], dtype=torch.float32, device=device
+        )
+        action_indices, valid = pack_action_sets(decisions)
+        return action_set_loss(
+            self.model(observations), targets, action_indices.to(device), valid.to(device)
+        )
+
+    def _trajectory_losses(self, trajectories):
+        for trajectory in trajectories:
+            for batch in self._training_batches(trajectory.decisions):
+                yield self._apply_loss(self._decision_loss(batch))
+
+    def _replay_losses(self, trajectories):
+        for trajectory in trajectories:
+            self.replay_buffer.add(trajectory.decisions)
+        for _ in range(self.config.replay_batches):
+            batch = self.replay_buffer.sample(self.config.decision_batch_size, self.rng)
+            model_outputs = self.model(batch.observations.float().to(device))
+            yield self._apply_loss(
+                action_set_loss(
+                    model_outputs,
+                    batch.targets.to(device),
+                    batch.action_sets.to(device),
+                    batch.action_set_valid.to(device),
+                )
+            )
+
     def update_model(self, trajectories) -> float:
-        """Update from one to four representative batches per trajectory."""
+        """Update from one to four representative batches per trajectory.
+
+        With a ``replay_buffer`` attached, the trajectories are stored in it and
+        the model instead trains on ``config.replay_batches`` prioritized
+        batches drawn from every decision the buffer holds.
+        """
         trajectories = tuple(trajectories)
         if not trajectories or any(not trajectory.decisions for trajectory in trajectories):
             raise TrainingRunError("Cannot train from an empty trajectory batch")
         self.model.train()
-        losses = []
-        for trajectory in trajectories:
-            for batch in self._training_batches(trajectory.decisions):
-                observations = (
-                    torch.stack([sample.observation for sample in batch]).float().to(device)
-                )
-                targets = torch.tensor(
-                    [sample.reward_to_go for sample in batch], dtype=torch.float32, device=device
-                )
-                model_outputs = self.model(observations)
-                decision_losses = torch.stack(
-                    [
-                        functional.smooth_l1_loss(
-                            model_outputs[
-                                row,
-                                torch.as_tensor(
-                                    sample.equivalent_action_indices or (sample.action_index,),
-                                    dtype=torch.long,
-                                    device=device,
-                                ),
-                            ],
-                            targets[row].expand(
-                                len(sample.equivalent_action_indices or (sample.action_index,))
-                            ),
-                        )
-                        for row, sample in enumerate(batch)
-                    ]
-                )
-                loss = decision_losses.mean()
-                self.optimizer.zero_grad()
-                loss.backward()
-                torch.nn.utils.clip_grad_norm_(
-                    self.model.parameters(), self.config.max_gradient_norm
-                )
-                self.optimizer.step()
-                losses.append(float(loss.detach().cpu()))
-                self.progress.training_updates += 1
+        if self.replay_buffer is not None:
+            losses = list(self._replay_losses(trajectories))
+        else:
+            losses = list(self._trajectory_losses(trajectories))
         self.model.eval()
 
         value = sum(losses) / len(losses)
@@ -1943,32 +2070,9 @@ class SelfPlayTrainer:
         samples = list(trajectory.decisions)
         if not samples:
             return None
-        observations = torch.stack([sample.observation for sample in samples]).float().to(device)
-        targets = torch.tensor(
-            [sample.reward_to_go for sample in samples], dtype=torch.float32, device=device
-        )
         self.model.eval()
         with torch.no_grad():
-            model_outputs = self.model(observations)
-            decision_losses = torch.stack(
-                [
-                    functional.smooth_l1_loss(
-                        model_outputs[
-                            row,
-                            torch.as_tensor(
-                                sample.equivalent_action_indices or (sample.action_index,),
-                                dtype=torch.long,
-                                device=device,
-                            ),
-                        ],
-                        targets[row].expand(
-                            len(sample.equivalent_action_indices or (sample.action_index,))
-                        ),
-                    )
-                    for row, sample in enumerate(samples)
-                ]
-            )
-            return decision_losses.mean().item()
+            return self._decision_loss(samples).item()
 
     def train(self, starting_states, episodes, *, batch_size=8, quiet=True):
         if episodes < 1:
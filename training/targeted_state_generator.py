@@ -15,6 +15,7 @@ from game.action_validation import ActionValidationError, validate_action_state
 from game.game_config import GameConfiguration, human_players
 from game.invariants import validate_game
 from game.loaded_state_validation import validate_loaded_game
+from game.map_topology import map_topology
 from game.persistence import load_game, save_game
 from map_data.constants import (
     ACTIONS_MAX_VALUES,
@@ -317,21 +318,16 @@ def _place_city_office(city, player, pools, rng):
 
 
 def _bounded_east_west_paths(game):
-    cities = {city.name: city for city in game.selected_map.cities}
-    start_name, end_name = game.selected_map.east_west_cities
-    start, end = cities[start_name], cities[end_name]
-    adjacency = {city: [] for city in game.selected_map.cities}
-    for route in game.selected_map.routes:
-        first, second = route.cities
-        adjacency[first].append(second)
-        adjacency[second].append(first)
+    topology = map_topology(game.selected_map)
+    start, end = topology.east_west
+    adjacency = topology.neighbours
 
     frontier = [(start, 0)]
     visited = {start}
     shortest = None
     while frontier:
         city, distance = frontier.pop(0)
-        if city is end:
+        if city == end:
             shortest = distance
             break
         for adjacent in adjacency[city]:
@@ -346,8 +342,8 @@ def _bounded_east_west_paths(game):
     def visit(city, path):
         if len(path) - 1 > shortest + 3:
             return
-        if city is end:
-            paths.append(tuple(path))
+        if city == end:
+            paths.append(tuple(game.selected_map.cities[index] for index in path))
             return
         for adjacent in adjacency[city]:
             if adjacent not in path:
@@ -366,10 +362,11 @@ def _bounded_east_west_paths(game):
 
 
 def _route_between(game, first, second):
-    return next(
-        (route for route in game.selected_map.routes if set(route.cities) == {first, second}),
-        None,
+    topology = map_topology(game.selected_map)
+    route_index = topology.route_between.get(
+        frozenset((topology.city_index[first.name], topology.city_index[second.name]))
     )
+    return None if route_index is None else game.selected_map.routes[route_index]
 
 
 def _prepare_east_west(game, pools, rng, requested_length, prepared_route_full):
@@ -647,13 +644,11 @@ def _prepare_network_keys(game, pools, rng, leave_one_open=True):
 
 
 def _region_cities(game, region):
-    names = {
-        city.name
-        for route in game.selected_map.routes
-        if route.region == region
-        for city in route.cities
-    } | {"IsleOfMan"}
-    return [city for city in game.selected_map.cities if city.name in names]
+    topology = map_topology(game.selected_map)
+    return [
+        game.selected_map.cities[index]
+        for index in topology.region_city_indices(region, shared=("IsleOfMan",))
+    ]
 
 
 def _fill_city_for_player(city, player, pools, rng):
@@ -1137,6 +1132,7 @@ def _build_once(request, attempt_seed):
         return None
     validate_game(game)
     validate_loaded_game(game)
+    game.mark_state_changed()
     if game.game_end or not game.get_legal_actions():
         return None
     if scenario is EndGameScenario.NEAR_COMPLETED_CITIES: